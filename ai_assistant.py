@@ -1,7 +1,64 @@
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
 import random
 import re
-import difflib
+import time
+
+from cache import LRUCache
+from llm_backend import LLMBackend, LLMError
+import metrics
+from phrase_index import PhraseIndex, normalize
+from session_store import MemorySessionStore, SessionStore
+from skill_taxonomy import SKILL_TAXONOMY
+
+if TYPE_CHECKING:
+    from career_index import CareerIndex
+
+
+class IntentMatcher:
+    """Classify a message by its highest-priority intent in one compiled regex scan.
+    
+    `intents` is an ordered list of (name, keywords, entity_pattern, entity_hint);
+    earlier intents win when several match. Keywords match at the start of a
+    word, so "job" matches "jobs" but not "snobjob". The winning intent's
+    entity pattern, if any, captures named entities from the message; the
+    optional hint is a cheap pattern that must occur for the entity pattern
+    to match, which saves the full search on most messages.
+    """
+    
+    def __init__(self, intents: List[Tuple[str, List[str], Optional[str], Optional[str]]], default: str = 'general'):
+        self.default = default
+        self.names = [intent[0] for intent in intents]
+        # Every keyword maps to the priority of its intent
+        self._priority = {}
+        for priority, (_, keywords, _, _) in enumerate(intents):
+            for keyword in keywords:
+                self._priority.setdefault(keyword.lower(), priority)
+        self._pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for k in sorted(self._priority, key=len, reverse=True)) + ')'
+        )
+        self._entity_patterns = {
+            name: (re.compile(pattern, re.IGNORECASE), re.compile(hint, re.IGNORECASE) if hint else None)
+            for name, _, pattern, hint in intents if pattern
+        }
+    
+    def classify(self, message: str) -> Tuple[str, Dict[str, str]]:
+        """Return the intent name and its captured entities"""
+        keywords = self._pattern.findall(message.lower())
+        if not keywords:
+            return self.default, {}
+        name = self.names[min(self._priority[k] for k in keywords)]
+        return name, self.entities(name, message)
+    
+    def entities(self, name: str, message: str) -> Dict[str, str]:
+        """Entities captured from a message by an intent's pattern"""
+        pattern, hint = self._entity_patterns.get(name, (None, None))
+        if pattern is None or (hint is not None and not hint.search(message)):
+            return {}
+        match = pattern.search(message.strip())
+        if not match:
+            return {}
+        return {key: value.strip() for key, value in match.groupdict().items() if value}
+
 
 class CareerAIAssistant:
     """AI Assistant for career guidance and resume mentoring"""
@@ -95,136 +152,283 @@ class CareerAIAssistant:
         }
     }
     
-    def __init__(self):
-        self.conversation_context = {}
-
-    def get_job_requirements(self, job_title: str, company: str = '', resume_data: Optional[Dict] = None, provided_skills: Optional[list] = None) -> Dict:
-        """Return suggested skills and improvement areas for a target job (simple heuristic)."""
-        job_title_norm = job_title.strip()
-        # Find best matching career path with simple keyword heuristics
-        best_match = None
-        role_lower = job_title_norm.lower()
-
-        # Keyword-based mapping for common roles
-        if 'full stack' in role_lower or 'full-stack' in role_lower or 'fullstack' in role_lower or 'full stack developer' in role_lower:
-            best_match = 'Software Engineer'
-        elif 'software' in role_lower or 'engineer' in role_lower or 'developer' in role_lower:
-            best_match = 'Software Engineer'
-        elif 'intern' in role_lower or 'internship' in role_lower:
-            # Heuristic: internships at tech/finance firms often map to software or data roles
-            if 'data' in role_lower:
-                best_match = 'Data Scientist'
-            else:
-                best_match = 'Software Engineer'
-        elif 'data' in role_lower or 'data scientist' in role_lower or 'machine learning' in role_lower:
-            best_match = 'Data Scientist'
-        elif 'product' in role_lower:
-            best_match = 'Product Manager'
-        elif 'ux' in role_lower or 'ui' in role_lower or 'designer' in role_lower:
-            best_match = 'UX/UI Designer'
-        elif 'marketing' in role_lower:
-            best_match = 'Marketing Manager'
-        else:
-            for career in self.CAREER_PATHS:
-                if career.lower() in role_lower or role_lower in career.lower():
-                    best_match = career
-                    break
+    # Chat intents in priority order: (name, keywords, entity pattern, entity hint)
+    INTENTS = [
+        ('career_guidance', ['career path', 'career', 'job', 'profession'], None, None),
+        ('resume_advice', ['resume', 'cv', 'application'], None, None),
+        ('interview_prep', ['interview', 'preparation', 'prepare'], None, None),
+        # Queries about a specific job and company, e.g. "skills for full stack developer at Amazon"
+        ('skill_development', ['skill', 'learn', 'education'],
+         r"(?P<role>[\w\s\-+]+?)\s+(?:in|at|for)\s+(?P<company>[A-Za-z0-9 &.\-]+)", r"\s(?:in|at|for)\s")
+    ]
+    
+    # Job title keywords -> career path, checked in order (earlier rules win).
+    # Keywords match whole words or word prefixes ("intern" -> "internship");
+    # a rule with `requires` only applies when those words occur as well.
+    TITLE_RULES = [
+        (['full stack', 'fullstack'], 'Software Engineer'),
+        (['software', 'engineer', 'developer'], 'Software Engineer'),
+        # Heuristic: internships at tech/finance firms often map to software or data roles
+        (['intern'], 'Data Scientist', ['data']),
+        (['intern'], 'Software Engineer'),
+        (['data', 'machine learning'], 'Data Scientist'),
+        (['product'], 'Product Manager'),
+        (['ux', 'ui', 'designer'], 'UX/UI Designer'),
+        (['marketing'], 'Marketing Manager')
+    ]
+    
+    # Company names -> skills worth highlighting for roles there
+    COMPANY_SKILLS = [
+        (['amazon'], ['AWS', 'Distributed Systems', 'Microservices', 'Scalability', 'React', 'Node.js']),
+        (['jpm', 'jp morgan', 'jpmorgan'], ['SQL', 'Java', 'Low-latency Systems', 'Data Structures', 'Finance Domain Knowledge']),
+        (['google', 'meta', 'facebook'], ['System Design', 'Distributed Systems', 'Algorithms', 'Large-scale Systems'])
+    ]
+    
+    # Job requirement results kept for repeated (title, company, skills) lookups
+    REQUIREMENTS_CACHE_SIZE = 1024
+    
+    # Per-user conversation context: users kept, idle seconds before a session expires,
+    # and the resume fields remembered for later answers. The resume text is
+    # remembered by content hash only, which keeps every session small
+    SESSION_MAX_USERS = 10000
+    SESSION_TTL = 3600
+    SESSION_RESUME_FIELDS = ('filename', 'extracted_data', 'provided_skills', 'content_hash', 'text_skills')
+    
+    # Instructions sent with every message when a model backend is configured
+    LLM_SYSTEM_PROMPT = ("You are VidyaGuide, a friendly career assistant for students and early-career professionals. "
+                         "Give concise, practical advice on career paths, resumes, interviews and skill development.")
+    
+    # Abbreviations / short forms expanded before career-path scoring
+    SKILL_ALIASES = {
+        'ml': 'Machine Learning',
+        'ai': 'Machine Learning',
+        'ds': 'Data Science',
+        'js': 'JavaScript',
+        'py': 'Python',
+        'sql': 'SQL',
+        'reactjs': 'React',
+        'react.js': 'React',
+        'node': 'Node.js',
+        'nodejs': 'Node.js'
+    }
+    
+    def __init__(self, career_paths: Optional[Dict] = None, llm_backend: Optional[LLMBackend] = None,
+                 sessions: Optional[SessionStore] = None, resume_texts: Optional[Callable[[str], Optional[str]]] = None):
+        # Per-user conversation context, such as the resume the last answer used
+        self.sessions = sessions if sessions is not None else MemorySessionStore(self.SESSION_MAX_USERS, self.SESSION_TTL)
+        # Extracted resume text by content hash, for a session resume that is no longer the user's current one
+        self.resume_texts = resume_texts
+        # Optional model server for generated replies; the rule-based handlers stay the fallback
+        self.llm_backend = llm_backend
+        # A larger catalog can replace the built-in career paths
+        if career_paths is not None:
+            self.CAREER_PATHS = career_paths
+        # Built on the first career-path scoring, so importing the app never loads NumPy
+        self._career_index = None
+        # Canonical skill -> learning path whose name or beginner level covers it
+        self.skill_path_index = SKILL_TAXONOMY.index(
+            {name: [name, *levels.get('beginner', [])] for name, levels in self.SKILL_PATHS.items()}
+        )
+        self.intent_matcher = IntentMatcher(self.INTENTS)
+        self.title_index = PhraseIndex(self.TITLE_RULES, prefix=True)
+        # Career names resolve titles that no keyword rule covers
+        self.career_names = PhraseIndex([([career], career) for career in self.CAREER_PATHS])
+        self.company_index = PhraseIndex(self.COMPANY_SKILLS)
+        self.requirements_cache = LRUCache(self.REQUIREMENTS_CACHE_SIZE)
 
-        requirements = {
-            'job_title': job_title,
-            'company': company,
-            'required_skills': [],
-            'missing_skills': [],
-            'advice': []
-        }
+    @property
+    def career_index(self) -> 'CareerIndex':
+        """Vectorized index of CAREER_PATHS, built with NumPy on first use"""
+        # Two threads racing here each build an identical index; either one is kept
+        if self._career_index is None:
+            from career_index import CareerIndex
+            self._career_index = CareerIndex(self.CAREER_PATHS)
+        return self._career_index
 
-        # Base required skills from CAREER_PATHS when available
-        if best_match:
-            base_skills = self.CAREER_PATHS[best_match].get('skills', [])
-            requirements['required_skills'] = base_skills
-        else:
-            # fallback generic skills
-            requirements['required_skills'] = ['Communication', 'Problem Solving', 'Teamwork']
+    def resolve_career(self, job_title: str) -> Optional[str]:
+        """Map a free-text job title to a career path, or None when nothing matches"""
+        return (self.title_index.resolve(job_title)
+                or self.career_names.resolve(job_title)
+                or self.career_names.resolve_containing(job_title))
 
+    def get_job_requirements(self, job_title: str, company: str = '', resume_data: Optional[Dict] = None, provided_skills: Optional[list] = None, resume_text: Optional[str] = None,
+                             text_skills: Optional[List[str]] = None) -> Dict:
+        """Return suggested skills and improvement areas for a target job (simple heuristic)."""
         # Merge provided_skills and resume_data skills to assess gaps
         current_skills = set()
         if provided_skills:
             current_skills.update([s.strip().lower() for s in provided_skills if s])
         if resume_data and resume_data.get('skills'):
             current_skills.update([s.strip().lower() for s in resume_data.get('skills')])
+        # Known skills (and their aliases) mentioned in the skills or anywhere in the resume;
+        # the resume's are found once at upload, records saved before that are scanned here
+        if text_skills is None:
+            text_skills = SKILL_TAXONOMY.find(resume_text) if resume_text else []
+        known_skills = frozenset([*text_skills, *SKILL_TAXONOMY.find_all(current_skills)])
+        current_skills = frozenset(current_skills)
 
-        # Determine missing skills
-        missing = []
-        for req in requirements['required_skills']:
-            if req.lower() not in current_skills:
-                missing.append(req)
+        # Popular titles repeat constantly; only the wording below depends on
+        # the exact title/company text
+        key = (normalize(job_title), normalize(company), current_skills, known_skills)
+        gaps = self.requirements_cache.get_or_compute(
+            key, lambda: self._requirement_gaps(job_title, company, current_skills, known_skills)
+        )
 
-        requirements['missing_skills'] = missing
+        requirements = {
+            'job_title': job_title,
+            'company': company,
+            'required_skills': list(gaps['required_skills']),
+            'missing_skills': [*gaps['missing_skills'], *gaps['missing_company_skills']],
+            'advice': []
+        }
 
         # Provide actionable advice
-        if missing:
-            requirements['advice'].append(f"To be competitive for {job_title}, consider learning: {', '.join(missing)}.")
-            # Suggest learning paths when known
-            for skill in missing:
-                # find skill path
-                for path_name, levels in self.SKILL_PATHS.items():
-                    if skill.lower() in ' '.join(levels.get('beginner', [])).lower() or skill.lower() in path_name.lower():
-                        requirements['advice'].append(f"Learning path for {skill}: Beginner -> {', '.join(levels.get('beginner', [])[:3])}; Intermediate -> {', '.join(levels.get('intermediate', [])[:3])}.")
-                        break
+        if gaps['missing_skills']:
+            requirements['advice'].append(f"To be competitive for {job_title}, consider learning: {', '.join(gaps['missing_skills'])}.")
+            requirements['advice'].extend(gaps['learning_paths'])
         else:
             requirements['advice'].append(f"Your current skills look well-aligned for {job_title}! Focus on demonstrating them with projects and achievements.")
 
         # Company-specific hints (very lightweight)
         if company:
             requirements['advice'].append(f"For roles at {company}, research their tech stack and tailor your resume to include relevant technologies and keywords used by the company.")
-            # Add company-specific suggested skills when known
-            comp_lower = company.lower()
-            company_skills = []
-            if 'amazon' in comp_lower:
-                company_skills = ['AWS', 'Distributed Systems', 'Microservices', 'Scalability', 'React', 'Node.js']
-            elif 'jpm' in comp_lower or 'jp morgan' in comp_lower or 'jpmorgan' in comp_lower:
-                company_skills = ['SQL', 'Java', 'Low-latency Systems', 'Data Structures', 'Finance Domain Knowledge']
-            elif 'google' in comp_lower or 'meta' in comp_lower or 'facebook' in comp_lower:
-                company_skills = ['System Design', 'Distributed Systems', 'Algorithms', 'Large-scale Systems']
-
-            if company_skills:
-                requirements['advice'].append(f"Company-specific skills to focus on: {', '.join(company_skills)}.")
-                # Also suggest adding missing company skills to missing_skills if not present
-                for cs in company_skills:
-                    if cs.lower() not in current_skills and cs not in requirements['missing_skills']:
-                        requirements['missing_skills'].append(cs)
+            if gaps['company_skills']:
+                requirements['advice'].append(f"Company-specific skills to focus on: {', '.join(gaps['company_skills'])}.")
 
         # Add interview and resume tips
         requirements['advice'].append("Highlight measurable achievements and use concise bullet points on your resume.")
 
         return requirements
+
+    def _requirement_gaps(self, job_title: str, company: str, current_skills: frozenset, known_skills: frozenset) -> Dict:
+        """Required, missing and company skills for a title; cached by get_job_requirements"""
+        def has_skill(skill: str) -> bool:
+            return skill.lower() in current_skills or (SKILL_TAXONOMY.canonical(skill) or skill) in known_skills
+
+        # Base required skills from CAREER_PATHS when available
+        best_match = self.resolve_career(job_title)
+        if best_match:
+            required = list(self.CAREER_PATHS[best_match].get('skills', []))
+        else:
+            # fallback generic skills
+            required = ['Communication', 'Problem Solving', 'Teamwork']
+
+        # Determine missing skills and suggest learning paths when known
+        missing = [req for req in required if not has_skill(req)]
+        learning_paths = []
+        for skill in missing:
+            path_name = self.skill_path_index.get(SKILL_TAXONOMY.canonical(skill) or skill)
+            if path_name:
+                levels = self.SKILL_PATHS[path_name]
+                learning_paths.append(f"Learning path for {skill}: Beginner -> {', '.join(levels.get('beginner', [])[:3])}; Intermediate -> {', '.join(levels.get('intermediate', [])[:3])}.")
+
+        # Also suggest missing company skills when the company is known
+        company_skills = (self.company_index.resolve(company) or []) if company else []
+        missing_company = [cs for cs in company_skills if not has_skill(cs) and cs not in missing]
+
+        return {
+            'required_skills': tuple(required),
+            'missing_skills': tuple(missing),
+            'learning_paths': tuple(learning_paths),
+            'company_skills': tuple(company_skills),
+            'missing_company_skills': tuple(missing_company)
+        }
+    
+    def stream_response(self, user_message: str, user_email: str, resume_context: Optional[Dict] = None) -> Iterator[str]:
+        """Yield the AI response to a user message fragment by fragment"""
+        
+        start = time.perf_counter()
+        session = self._update_session(user_email, resume_context)
+        
+        # Detect user intent
+        intent, entities = self.intent_matcher.classify(user_message)
+        
+        if self.llm_backend is not None:
+            fragments = self.llm_backend.stream(self._llm_messages(user_message, intent, resume_context))
+            try:
+                first = next(fragments)
+            except LLMError:
+                # Model server unavailable or too slow: answer with the rules instead
+                first = None
+            if first is not None:
+                yield first
+                yield from fragments
+                metrics.INTENT_SECONDS.observe(time.perf_counter() - start, intent, 'llm')
+                return
+        
+        yield from self._rule_response(user_message, intent, entities, resume_context, session)
+        metrics.INTENT_SECONDS.observe(time.perf_counter() - start, intent, 'rules')
     
     def get_response(self, user_message: str, user_email: str, resume_context: Optional[Dict] = None) -> Dict:
         """Generate AI response to user message"""
         
-        user_message_lower = user_message.lower()
-        # update conversation context with recent resume if provided
-        if resume_context:
-            # resume_context may be a resume record from the DB (with extracted_data, provided_skills)
-            self.conversation_context['last_resume'] = resume_context
+        start = time.perf_counter()
+        session = self._update_session(user_email, resume_context)
         
-        # Detect user intent
-        if any(keyword in user_message_lower for keyword in ['career path', 'career', 'job', 'profession']):
-            response = self._handle_career_guidance(user_message)
-        elif any(keyword in user_message_lower for keyword in ['resume', 'cv', 'application']):
-            response = self._handle_resume_advice(user_message, resume_context)
-        elif any(keyword in user_message_lower for keyword in ['interview', 'preparation', 'prepare']):
-            response = self._handle_interview_prep(user_message)
-        elif any(keyword in user_message_lower for keyword in ['skill', 'learn', 'education']):
-            response = self._handle_skill_development(user_message)
-        else:
-            response = self._handle_general_career_question(user_message)
+        intent, entities = self.intent_matcher.classify(user_message)
+        
+        content = None
+        source = 'llm'
+        if self.llm_backend is not None:
+            try:
+                content = self.llm_backend.complete(self._llm_messages(user_message, intent, resume_context))
+            except LLMError:
+                content = None
+        if content is None:
+            content = ''.join(self._rule_response(user_message, intent, entities, resume_context, session))
+            source = 'rules'
+        metrics.INTENT_SECONDS.observe(time.perf_counter() - start, intent, source)
         
         return {
             'role': 'assistant',
-            'content': response,
+            'content': content,
             'type': 'text'
         }
+    
+    def _update_session(self, user_email: str, resume_context: Optional[Dict] = None) -> Dict:
+        """The user's conversation context, remembering the resume sent with this message"""
+        if resume_context:
+            # resume_context may be a resume record from the DB (with extracted_data, provided_skills)
+            last_resume = {field: resume_context.get(field) for field in self.SESSION_RESUME_FIELDS}
+            return self.sessions.update(user_email, {'last_resume': last_resume})
+        return self.sessions.get(user_email)
+    
+    def _session_resume_text(self, last_resume: Dict, resume_context: Optional[Dict] = None) -> Optional[str]:
+        """Text of the session's resume, from this message's resume or else looked up by content hash"""
+        content_hash = last_resume.get('content_hash')
+        if resume_context and resume_context.get('content_hash') == content_hash:
+            return resume_context.get('resume_text')
+        if content_hash and self.resume_texts is not None:
+            return self.resume_texts(content_hash)
+        return None
+    
+    def _rule_response(self, user_message: str, intent: str, entities: Dict[str, str], resume_context: Optional[Dict] = None,
+                       session: Optional[Dict] = None) -> Iterator[str]:
+        """Rule-based reply for a classified message, the default without a model backend"""
+        if intent == 'career_guidance':
+            yield from self._handle_career_guidance(user_message)
+        elif intent == 'resume_advice':
+            yield from self._handle_resume_advice(user_message, resume_context)
+        elif intent == 'interview_prep':
+            yield from self._handle_interview_prep(user_message)
+        elif intent == 'skill_development':
+            yield from self._handle_skill_development(user_message, entities, session, resume_context)
+        else:
+            yield from self._handle_general_career_question(user_message)
+    
+    def _llm_messages(self, user_message: str, intent: str, resume_context: Optional[Dict] = None) -> List[Dict[str, str]]:
+        """Chat completion prompt: instructions, detected topic and resume highlights"""
+        system = f"{self.LLM_SYSTEM_PROMPT}\nTopic: {intent.replace('_', ' ')}"
+        extracted = (resume_context or {}).get('extracted_data') or {}
+        skills = list(extracted.get('skills') or []) + list((resume_context or {}).get('provided_skills') or [])
+        if skills:
+            system += f"\nUser skills: {', '.join(skills[:20])}"
+        if extracted.get('experience'):
+            system += f"\nWork experiences on resume: {len(extracted['experience'])}"
+        return [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': user_message}
+        ]
 
     def generate_career_path(self, skills: Optional[list] = None, interests: Optional[str] = '') -> Dict:
         """Given user skills and interests, suggest matching career paths and next steps."""
@@ -234,18 +438,7 @@ class CareerAIAssistant:
             if not s0:
                 return s0
             s_low = s0.lower()
-            aliases = {
-                'ml': 'Machine Learning',
-                'ai': 'Machine Learning',
-                'ds': 'Data Science',
-                'js': 'JavaScript',
-                'py': 'Python',
-                'sql': 'SQL',
-                'reactjs': 'React',
-                'react.js': 'React',
-                'node': 'Node.js',
-                'nodejs': 'Node.js'
-            }
+            aliases = self.SKILL_ALIASES
             if s_low in aliases:
                 return aliases[s_low]
             # common tokens mapping
@@ -258,43 +451,17 @@ class CareerAIAssistant:
         skills = [normalize_skill(s) for s in (skills or []) if s]
         interest_text = (interests or '').lower()
 
-        # Score career paths by matching skills and interests
-        matches = []
-        for career, details in self.CAREER_PATHS.items():
-            score = 0
-            # skills match (fuzzy/inclusion)
-            for req in details.get('skills', []):
-                req_low = req.lower()
-                for user_skill in skills:
-                    user_low = user_skill.lower()
-                    # direct inclusion
-                    if user_low and (user_low in req_low or req_low in user_low):
-                        score += 2
-                        break
-                    # fuzzy match by close words
-                    req_words = req_low.split()
-                    match = difflib.get_close_matches(user_low, req_words, n=1, cutoff=0.8)
-                    if match:
-                        score += 1
-                        break
-            # interest keyword match
-            if any(word in interest_text for word in career.lower().split()):
-                score += 1
-            # partial interest match on description
-            if any(word in interest_text for word in details.get('description', '').lower().split()):
-                score += 1
-
-            matches.append((career, score, details))
-
-        # Sort by score desc
-        matches.sort(key=lambda x: x[1], reverse=True)
-
-        # Build suggestions
+        # Score career paths by matching skills (inclusion/fuzzy) and interests
+        index = self.career_index
+        scores = index.score(skills, interest_text)
+
+        # Build suggestions from the best scores
         suggestions = []
-        for career, score, details in matches[:4]:
+        for i in index.top(scores, 4):
+            career, details = index.careers[i], index.details[i]
             suggestions.append({
                 'career': career,
-                'score': score,
+                'score': int(scores[i]),
                 'description': details.get('description'),
                 'key_skills': details.get('skills', []),
                 'education': details.get('education', [])
@@ -312,167 +479,159 @@ class CareerAIAssistant:
             'next_steps': next_steps
         }
     
-    def _handle_career_guidance(self, message: str) -> str:
+    def _handle_career_guidance(self, message: str) -> Iterator[str]:
         """Handle career guidance questions"""
-        response = "I'd be happy to help you explore career options! Here are some exciting paths you might consider:\n\n"
+        yield "I'd be happy to help you explore career options! Here are some exciting paths you might consider:\n\n"
         
         for career, details in list(self.CAREER_PATHS.items())[:3]:
-            response += f"**{career}**\n"
-            response += f"• Description: {details['description']}\n"
-            response += f"• Key Skills: {', '.join(details['skills'][:2])}\n"
-            response += f"• Educational Background: {', '.join(details['education'][:1])}\n\n"
-        
-        response += "Which of these interests you? I can provide more detailed information about any career path, including:\n"
-        response += "• Required skills and qualifications\n"
-        response += "• Steps to get started\n"
-        response += "• Job market outlook and salary ranges\n"
-        response += "• Companies hiring for these roles\n\n"
-        response += "Feel free to ask follow-up questions!"
+            yield f"**{career}**\n"
+            yield f"• Description: {details['description']}\n"
+            yield f"• Key Skills: {', '.join(details['skills'][:2])}\n"
+            yield f"• Educational Background: {', '.join(details['education'][:1])}\n\n"
         
-        return response
+        yield "Which of these interests you? I can provide more detailed information about any career path, including:\n"
+        yield "• Required skills and qualifications\n"
+        yield "• Steps to get started\n"
+        yield "• Job market outlook and salary ranges\n"
+        yield "• Companies hiring for these roles\n\n"
+        yield "Feel free to ask follow-up questions!"
     
-    def _handle_resume_advice(self, message: str, resume_context: Optional[Dict] = None) -> str:
+    def _handle_resume_advice(self, message: str, resume_context: Optional[Dict] = None) -> Iterator[str]:
         """Handle resume-related questions"""
-        response = "Great! I'm here to help improve your resume. "
+        yield "Great! I'm here to help improve your resume. "
         
         if resume_context:
-            response += "Based on your uploaded resume, here are some personalized suggestions:\n\n"
-            response += self._get_resume_feedback(resume_context)
+            yield "Based on your uploaded resume, here are some personalized suggestions:\n\n"
+            yield from self._get_resume_feedback(resume_context)
         else:
-            response += "Here are some essential resume tips:\n\n"
-            response += "**Formatting Tips:**\n"
+            yield "Here are some essential resume tips:\n\n"
+            yield "**Formatting Tips:**\n"
             for tip in self.RESUME_TIPS['formatting'][:3]:
-                response += f"• {tip}\n"
+                yield f"• {tip}\n"
             
-            response += "\n**Content Tips:**\n"
+            yield "\n**Content Tips:**\n"
             for tip in self.RESUME_TIPS['content'][:3]:
-                response += f"• {tip}\n"
+                yield f"• {tip}\n"
             
-            response += "\n**Resume Structure:**\n"
+            yield "\n**Resume Structure:**\n"
             for tip in self.RESUME_TIPS['structure'][:3]:
-                response += f"• {tip}\n"
+                yield f"• {tip}\n"
         
-        response += "\n\nWould you like more specific advice on any section? You can also upload your resume for personalized feedback!"
-        
-        return response
+        yield "\n\nWould you like more specific advice on any section? You can also upload your resume for personalized feedback!"
     
-    def _handle_interview_prep(self, message: str) -> str:
+    def _handle_interview_prep(self, message: str) -> Iterator[str]:
         """Handle interview preparation questions"""
-        response = "Preparing for an interview? Here are some essential tips:\n\n"
+        yield "Preparing for an interview? Here are some essential tips:\n\n"
         
         for tip in self.INTERVIEW_TIPS[:4]:
-            response += f"• {tip}\n"
-        
-        response += "\n**Common Interview Questions to Practice:**\n"
-        response += "1. 'Tell me about yourself' - Focus on your professional journey\n"
-        response += "2. 'Why are you interested in this position?' - Show you've researched the company\n"
-        response += "3. 'What are your strengths and weaknesses?' - Be honest and constructive\n"
-        response += "4. 'Tell me about a challenge you overcame' - Use the STAR method\n"
-        response += "5. 'Why should we hire you?' - Highlight unique value you bring\n\n"
-        response += "Remember: Most interviews test both your technical knowledge and your communication skills. "
-        response += "Practice speaking clearly and confidently about your experience!"
+            yield f"• {tip}\n"
         
-        return response
+        yield "\n**Common Interview Questions to Practice:**\n"
+        yield "1. 'Tell me about yourself' - Focus on your professional journey\n"
+        yield "2. 'Why are you interested in this position?' - Show you've researched the company\n"
+        yield "3. 'What are your strengths and weaknesses?' - Be honest and constructive\n"
+        yield "4. 'Tell me about a challenge you overcame' - Use the STAR method\n"
+        yield "5. 'Why should we hire you?' - Highlight unique value you bring\n\n"
+        yield "Remember: Most interviews test both your technical knowledge and your communication skills. "
+        yield "Practice speaking clearly and confidently about your experience!"
     
-    def _handle_skill_development(self, message: str) -> str:
+    def _handle_skill_development(self, message: str, entities: Optional[Dict[str, str]] = None,
+                                  session: Optional[Dict] = None, resume_context: Optional[Dict] = None) -> Iterator[str]:
         """Handle skill development questions"""
-        # Detect queries asking about a specific job and company, e.g. "skills for full stack developer at Amazon"
-        msg = message.strip()
-        pattern = re.compile(r"(?P<role>[\w\s\-+]+?)\s+(?:in|at|for)\s+(?P<company>[A-Za-z0-9 &.\-]+)", re.IGNORECASE)
-        m = pattern.search(msg)
+        # Role and company of a query about a specific job, captured by the intent matcher
+        if entities is None:
+            entities = self.intent_matcher.entities('skill_development', message)
 
-        if m:
-            role = m.group('role').strip()
-            company = m.group('company').strip()
+        if entities.get('role') and entities.get('company'):
+            role = entities['role']
+            company = entities['company']
 
             # Try to obtain resume context from conversation context if previously stored
             resume_data = None
             provided_skills = None
-            last_resume = self.conversation_context.get('last_resume')
+            resume_text = None
+            text_skills = None
+            last_resume = (session or {}).get('last_resume')
             if last_resume:
                 resume_data = last_resume.get('extracted_data')
                 provided_skills = last_resume.get('provided_skills')
+                text_skills = last_resume.get('text_skills')
+                if text_skills is None:
+                    resume_text = self._session_resume_text(last_resume, resume_context)
 
-            req = self.get_job_requirements(role, company, resume_data=resume_data, provided_skills=provided_skills)
+            req = self.get_job_requirements(role, company, resume_data=resume_data, provided_skills=provided_skills, resume_text=resume_text,
+                                            text_skills=text_skills)
 
-            response = f"Targeted guidance for {role}{' at ' + company if company else ''}:\n\n"
+            yield f"Targeted guidance for {role}{' at ' + company if company else ''}:\n\n"
             if req.get('required_skills'):
-                response += f"• Required Skills: {', '.join(req.get('required_skills'))}\n"
+                yield f"• Required Skills: {', '.join(req.get('required_skills'))}\n"
             if req.get('missing_skills'):
-                response += f"• Missing Skills: {', '.join(req.get('missing_skills'))}\n"
+                yield f"• Missing Skills: {', '.join(req.get('missing_skills'))}\n"
             if req.get('advice'):
-                response += "\nRecommendations:\n"
+                yield "\nRecommendations:\n"
                 for a in req.get('advice'):
-                    response += f"• {a}\n"
+                    yield f"• {a}\n"
 
-            return response
+            return
 
         # Fallback generic paths if no role/company detected
-        response = "Developing new skills is key to career growth! Here's a learning path for popular skills:\n\n"
+        yield "Developing new skills is key to career growth! Here's a learning path for popular skills:\n\n"
         for skill, levels in list(self.SKILL_PATHS.items())[:2]:
-            response += f"**{skill} Learning Path:**\n"
-            response += f"• Beginner: {', '.join(levels['beginner'])}\n"
-            response += f"• Intermediate: {', '.join(levels['intermediate'])}\n"
-            response += f"• Advanced: {', '.join(levels['advanced'])}\n\n"
-
-        response += "**Tips for Skill Development:**\n"
-        response += "• Start with fundamentals and practice consistently\n"
-        response += "• Build real projects to apply what you've learned\n"
-        response += "• Learn from others through blogs, courses, and communities\n"
-        response += "• Don't be afraid to fail - it's part of the learning process\n\n"
-        response += "What skill would you like to develop? I can provide specific learning resources and career paths!"
-
-        return response
+            yield f"**{skill} Learning Path:**\n"
+            yield f"• Beginner: {', '.join(levels['beginner'])}\n"
+            yield f"• Intermediate: {', '.join(levels['intermediate'])}\n"
+            yield f"• Advanced: {', '.join(levels['advanced'])}\n\n"
+
+        yield "**Tips for Skill Development:**\n"
+        yield "• Start with fundamentals and practice consistently\n"
+        yield "• Build real projects to apply what you've learned\n"
+        yield "• Learn from others through blogs, courses, and communities\n"
+        yield "• Don't be afraid to fail - it's part of the learning process\n\n"
+        yield "What skill would you like to develop? I can provide specific learning resources and career paths!"
     
-    def _handle_general_career_question(self, message: str) -> str:
+    def _handle_general_career_question(self, message: str) -> Iterator[str]:
         """Handle general career questions"""
-        response = "That's a great question about your career! I can help you with:\n\n"
-        response += "💼 **Career Guidance** - Explore different career paths and choose the right one for you\n"
-        response += "📄 **Resume Help** - Improve your resume with formatting and content tips\n"
-        response += "🎤 **Interview Prep** - Prepare for interviews with tips and practice questions\n"
-        response += "🎓 **Skill Development** - Learn what skills you need and how to develop them\n"
-        response += "📊 **Career Analytics** - Understand job market trends and salary insights\n\n"
-        response += "Feel free to ask me anything career-related, and I'll do my best to provide helpful, friendly advice. "
-        response += "What would you like to focus on today?"
-        
-        return response
+        yield "That's a great question about your career! I can help you with:\n\n"
+        yield "💼 **Career Guidance** - Explore different career paths and choose the right one for you\n"
+        yield "📄 **Resume Help** - Improve your resume with formatting and content tips\n"
+        yield "🎤 **Interview Prep** - Prepare for interviews with tips and practice questions\n"
+        yield "🎓 **Skill Development** - Learn what skills you need and how to develop them\n"
+        yield "📊 **Career Analytics** - Understand job market trends and salary insights\n\n"
+        yield "Feel free to ask me anything career-related, and I'll do my best to provide helpful, friendly advice. "
+        yield "What would you like to focus on today?"
     
-    def _get_resume_feedback(self, resume_context: Dict) -> str:
+    def _get_resume_feedback(self, resume_context: Dict) -> Iterator[str]:
         """Generate personalized resume feedback based on extracted data"""
-        feedback = ""
-        
         extracted = resume_context.get('extracted_data', {})
         
         # Skills feedback
         if extracted.get('skills'):
-            feedback += f"**Your Skills:**\n"
-            feedback += f"Great! You've listed {len(extracted['skills'])} skills. Make sure they're:\n"
-            feedback += f"• Relevant to the jobs you're applying for\n"
-            feedback += f"• Organized by category (Technical, Professional, Languages)\n"
-            feedback += f"Current skills: {', '.join(extracted['skills'][:5])}\n\n"
+            yield f"**Your Skills:**\n"
+            yield f"Great! You've listed {len(extracted['skills'])} skills. Make sure they're:\n"
+            yield f"• Relevant to the jobs you're applying for\n"
+            yield f"• Organized by category (Technical, Professional, Languages)\n"
+            yield f"Current skills: {', '.join(extracted['skills'][:5])}\n\n"
         else:
-            feedback += "**Add a Skills Section:** Create a dedicated section highlighting your technical and professional abilities.\n\n"
+            yield "**Add a Skills Section:** Create a dedicated section highlighting your technical and professional abilities.\n\n"
         
         # Education feedback
         if extracted.get('education'):
-            feedback += f"**Education:**\n"
-            feedback += f"Good! You have {len(extracted['education'])} educational qualification(s).\n\n"
+            yield f"**Education:**\n"
+            yield f"Good! You have {len(extracted['education'])} educational qualification(s).\n\n"
         
         # Experience feedback
         if extracted.get('experience'):
-            feedback += f"**Experience:**\n"
-            feedback += f"You've documented {len(extracted['experience'])} work experience(s). "
-            feedback += f"Make sure each includes:\n"
-            feedback += f"• Job title, Company, and Duration\n"
-            feedback += f"• 3-4 achievement bullets with quantifiable results\n"
-            feedback += f"• Action verbs like 'developed', 'managed', 'improved'\n\n"
+            yield f"**Experience:**\n"
+            yield f"You've documented {len(extracted['experience'])} work experience(s). "
+            yield f"Make sure each includes:\n"
+            yield f"• Job title, Company, and Duration\n"
+            yield f"• 3-4 achievement bullets with quantifiable results\n"
+            yield f"• Action verbs like 'developed', 'managed', 'improved'\n\n"
         else:
-            feedback += "**Add Work Experience:** Highlight your previous roles and key achievements with measurable results.\n\n"
-        
-        feedback += "**Next Steps:**\n"
-        feedback += "1. Tailor your resume for each job application\n"
-        feedback += "2. Ask colleagues or mentors for feedback\n"
-        feedback += "3. Keep it to 1-2 pages\n"
-        feedback += "4. Proofread carefully for any errors\n"
+            yield "**Add Work Experience:** Highlight your previous roles and key achievements with measurable results.\n\n"
         
-        return feedback
+        yield "**Next Steps:**\n"
+        yield "1. Tailor your resume for each job application\n"
+        yield "2. Ask colleagues or mentors for feedback\n"
+        yield "3. Keep it to 1-2 pages\n"
+        yield "4. Proofread carefully for any errors\n"
@@ -1,42 +1,394 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, g, has_app_context, request, jsonify, make_response, stream_with_context
+import functools
+import hashlib
+import hmac
+import multiprocessing
+import tempfile
+import threading
+import time
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import is_resource_modified, parse_accept_header
+from werkzeug.local import LocalProxy
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 
-from config import DevelopmentConfig
+from config import get_config
 from database import Database
+from sqlite_database import SQLiteDatabase
 from resume_processor import ResumeProcessor
+from resume_jobs import ResumeJobQueue, QueueFullError
 from ai_assistant import CareerAIAssistant
+import metrics
+from profiler import RequestProfiler, list_captures
+from llm_backend import HTTPBackend
+from session_store import MemorySessionStore, SQLiteSessionStore
 
-# Initialize Flask app
-app = Flask(__name__)
-app.config.from_object(DevelopmentConfig)
+api = Blueprint('api', __name__)
+jwt = JWTManager()
 
-# Enable CORS
-CORS(app, resources={r"/api/*": {"origins": "*"}})
-
-# Initialize JWT
-jwt = JWTManager(app)
-
-# Initialize database
-db = Database(app.config['DATABASE_PATH'])
-
-# Initialize AI Assistant
-ai_assistant = CareerAIAssistant()
-
-# Create upload folder
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+class AppServices:
+    """Storage, assistant and background workers of one app, built by create_app"""
+    
+    def __init__(self, app: Flask):
+        config = app.config
+        
+        # Initialize database
+        if config['DATABASE_ENGINE'] == 'sqlite':
+            self.db = SQLiteDatabase(config['DATABASE_PATH'])
+        else:
+            self.db = Database(config['DATABASE_PATH'], group_commit_ms=config['DATABASE_GROUP_COMMIT_MS'])
+        
+        # Initialize AI Assistant, with a model server when one is configured
+        self.llm_backend = None
+        if config['LLM_BASE_URL']:
+            self.llm_backend = HTTPBackend(
+                config['LLM_BASE_URL'],
+                config['LLM_MODEL'],
+                api_key=config['LLM_API_KEY'] or None,
+                timeout=config['LLM_TIMEOUT_SECONDS'],
+                connect_timeout=config['LLM_CONNECT_TIMEOUT_SECONDS'],
+                max_concurrency=config['LLM_MAX_CONCURRENCY'],
+                cache_size=config['LLM_CACHE_SIZE'],
+                cache_ttl=config['LLM_CACHE_TTL_SECONDS']
+            )
+        if config['SESSION_STORE'] == 'sqlite':
+            sessions_file = ':memory:' if config['DATABASE_PATH'] == ':memory:' else os.path.join(config['DATABASE_PATH'], 'sessions.db')
+            sessions = SQLiteSessionStore(sessions_file, max_users=config['SESSION_MAX_USERS'], ttl=config['SESSION_TTL_SECONDS'])
+        else:
+            sessions = MemorySessionStore(max_users=config['SESSION_MAX_USERS'], ttl=config['SESSION_TTL_SECONDS'])
+        self.ai_assistant = CareerAIAssistant(llm_backend=self.llm_backend, sessions=sessions,
+                                              resume_texts=self.resume_text)
+        
+        # Create upload folder
+        os.makedirs(config['UPLOAD_FOLDER'], exist_ok=True)
+        
+        # Resume extraction within this app's page and character budgets;
+        # partials of a module-level function, so process pools can pickle them
+        limits = {'max_pages': config['RESUME_MAX_PDF_PAGES'], 'max_chars': config['RESUME_MAX_TEXT_CHARS']}
+        self.extract_file = functools.partial(ResumeProcessor.extract_file, **limits)
+        self.extract_text = functools.partial(ResumeProcessor.extract_text, **limits)
+        
+        # Initialize background resume processing
+        self.resume_jobs = None
+        if config['RESUME_ASYNC_UPLOADS']:
+            self.resume_jobs = ResumeJobQueue(
+                os.path.join(config['UPLOAD_FOLDER'], '.jobs'),
+                functools.partial(save_processed_resume, app),
+                max_workers=config['RESUME_JOB_WORKERS'],
+                max_pending=config['RESUME_JOB_QUEUE_SIZE'],
+                extract=self.extract_file
+            )
+            # Only the server recovers jobs, not a pool worker that happens to build an app
+            if multiprocessing.parent_process() is None:
+                self.resume_jobs.recover()
+        
+        # Opt-in profiling of sampled and slow requests
+        self.profiler = RequestProfiler(
+            config['PROFILE_DIR'],
+            sample_rate=config['PROFILE_SAMPLE_RATE'],
+            slow_ms=config['PROFILE_SLOW_MS'],
+            max_captures=config['PROFILE_MAX_CAPTURES'],
+            interval_ms=config['PROFILE_INTERVAL_MS'],
+            salt=config['SECRET_KEY']
+        )
+        
+        # Prerendered bodies of the static career endpoints: name -> (JSON bytes, ETag)
+        self.static_bodies = {}
+    
+    def resume_text(self, content_hash: str):
+        """Extracted text of an uploaded file, from the extraction cache"""
+        return (self.db.get_extraction(content_hash) or {}).get('resume_text')
+
+def create_app(config=None) -> Flask:
+    """Build the API app.
+    
+    `config` is a config class or its name ('development', 'production',
+    'testing'); by default the APP_CONFIG environment variable picks one.
+    Storage and workers are created here rather than at import, so importing
+    this module stays cheap.
+    """
+    app = Flask(__name__)
+    app.config.from_object(get_config(config) if config is None or isinstance(config, str) else config)
+    
+    # Enable CORS
+    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    
+    # Initialize JWT
+    jwt.init_app(app)
+    
+    app_services = AppServices(app)
+    app.extensions['vidyaguide'] = app_services
+    render_static_bodies(app)
+    
+    if app.config['METRICS_ENABLED']:
+        app.before_request(start_request_timer)
+        app.after_request(record_request_metrics)
+    if app_services.profiler.enabled:
+        app.before_request(start_request_profile)
+        app.after_request(finish_request_profile)
+    
+    app.register_blueprint(api)
+    
+    global _default_app
+    with _default_app_lock:
+        if _default_app is None:
+            _default_app = app
+    return app
+
+# The first app created; serves code running outside a request, such as the
+# ASGI handlers' worker threads
+_default_app = None
+_default_app_lock = threading.RLock()
+
+def get_app() -> Flask:
+    """The app handling the current request, else the default app (built on first use)"""
+    if has_app_context():
+        return current_app._get_current_object()
+    if _default_app is None:
+        with _default_app_lock:
+            if _default_app is None:
+                create_app()
+    return _default_app
+
+def services() -> AppServices:
+    return get_app().extensions['vidyaguide']
+
+# Module-level handles kept for the route code, the ASGI mode and `gunicorn app:app`;
+# they resolve to the current app on each use
+app = LocalProxy(get_app)
+db = LocalProxy(lambda: services().db)
+ai_assistant = LocalProxy(lambda: services().ai_assistant)
+
+# Request counts and latency per route; streamed bodies are timed to their
+# last byte, when the server closes the response
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+def record_request_metrics(response):
+    start = g.get('request_start', time.perf_counter())
+    labels = (request.method, request.url_rule.rule if request.url_rule else 'unmatched', str(response.status_code))
+    
+    def record():
+        metrics.HTTP_REQUESTS.inc(*labels)
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, *labels)
+    
+    if response.is_streamed:
+        response.call_on_close(record)
+    else:
+        record()
+    return response
+
+def start_request_profile():
+    g.profile_capture = services().profiler.start(request.url_rule.rule if request.url_rule else 'unmatched', request.method)
+
+def finish_request_profile(response):
+    capture = g.pop('profile_capture', None)
+    if capture is None:
+        return response
+    try:
+        user = get_jwt_identity()
+    except RuntimeError:
+        # Public route, or the token was rejected
+        user = None
+    profiler = services().profiler
+    
+    def finish():
+        profiler.finish(capture, response.status_code, user)
+    
+    if response.is_streamed:
+        response.call_on_close(finish)
+    else:
+        finish()
+    return response
+
+def store_resume(email, filename, stored_file, content_hash, extraction, provided_qualifications, provided_skills):
+    """Analyse a (possibly shared) extraction for one user and save their resume record"""
+    result = ResumeProcessor.analyze(extraction, provided_skills)
+    analysis = dict(result['analysis'], content_hash=content_hash, stored_file=stored_file)
+    db.save_resume(email, filename, result['extracted_data'], provided_qualifications=provided_qualifications,
+                   provided_skills=provided_skills, analysis=analysis)
+    return result
+
+def save_processed_resume(flask_app, job, extraction):
+    """Cache and persist the output of a background resume job"""
+    # Runs on the job queue's thread, outside any request
+    with flask_app.app_context():
+        db.save_extraction(job['content_hash'], extraction)
+        return store_resume(job['user_email'], job['filename'], os.path.basename(job['filepath']), job['content_hash'],
+                            extraction, job['provided_qualifications'], job['provided_skills'])
+
+def render_static_bodies(flask_app):
+    """Serialise the career knowledge base once; call again after reloading it"""
+    ai_assistant = flask_app.extensions['vidyaguide'].ai_assistant
+    payloads = {
+        'career_paths': {
+            career: {
+                'description': details['description'],
+                'skills': details['skills'],
+                'education': details['education']
+            }
+            for career, details in ai_assistant.CAREER_PATHS.items()
+        },
+        'resume_tips': ai_assistant.RESUME_TIPS,
+        'interview_tips': {'tips': ai_assistant.INTERVIEW_TIPS},
+        'skill_paths': ai_assistant.SKILL_PATHS
+    }
+    rendered = {}
+    for name, payload in payloads.items():
+        # Same bytes jsonify would produce
+        body = flask_app.json.response(payload).get_data()
+        rendered[name] = (body, hashlib.sha256(body).hexdigest()[:32])
+    flask_app.extensions['vidyaguide'].static_bodies.update(rendered)
+
+def static_response(name, environ=None):
+    """Serve a prerendered body, or 304 when the client's ETag still matches"""
+    body, etag = services().static_bodies[name]
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['STATIC_CONTENT_MAX_AGE']
+    return response.make_conditional(request.environ if environ is None else environ)
+
+def user_resource_response(email, resource, build, variant=''):
+    """Respond with a per-user resource, or 304 when the client's copy is current.
+    
+    The version check runs before `build`, so an unchanged resource is never
+    read from storage. `variant` distinguishes representations of the same
+    resource, such as different query parameters.
+    """
+    etag, last_modified = user_resource_version(email, resource, variant)
+    if etag and not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = app.response_class(status=304)
+    else:
+        response = make_response(*build())
+    return private_response(response, etag, last_modified)
+
+def user_resource_version(email, resource, variant=''):
+    """ETag and Last-Modified of a per-user resource, or (None, None) before its first write"""
+    version = db.get_version(email, resource)
+    if version is None:
+        return None, None
+    tag, modified = version
+    # The email is part of the tag, so a browser shared by two accounts
+    # never revalidates one user's copy against the other's version
+    etag = hashlib.sha256(f'{email}\0{resource}\0{variant}\0{tag}\0{modified}'.encode('utf-8')).hexdigest()[:32]
+    return etag, datetime.fromtimestamp(int(modified), tz=timezone.utc)
+
+def private_response(response, etag, last_modified):
+    """Add validators and per-user cache headers to a response"""
+    if etag and response.status_code in (200, 304):
+        response.set_etag(etag)
+        response.last_modified = last_modified
+    # Personal data: browsers may keep it but must revalidate, shared caches must not store it
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Authorization')
+    return response
+
+# Resume record fields kept for the server's own use and not returned to clients
+RESUME_INTERNAL_FIELDS = ('resume_text', 'text_skills', 'suggestions', 'extractor_version', 'rules_version', 'content_hash', 'stored_file', 'version')
+
+def wants_event_stream(stream_arg, accept_header):
+    """Whether a chat request opted into streaming with ?stream=1 or Accept: text/event-stream"""
+    if (stream_arg or '').lower() in ('1', 'true', 'yes'):
+        return True
+    return parse_accept_header(accept_header, MIMEAccept).best == 'text/event-stream'
+
+def sse_event(event, data):
+    """One Server-Sent Events frame with a JSON payload"""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+def chat_event_stream(email, fragments):
+    """Stream an assistant reply as `chunk` events, then persist it and send `done`.
+    
+    The message is saved only once the reply has been generated in full, so a
+    client that disconnects mid-stream leaves no partial reply in the history.
+    """
+    def generate():
+        # Opening event right away so time-to-first-byte does not depend on the reply
+        yield sse_event('start', {'role': 'assistant', 'type': 'text'})
+        content = []
+        try:
+            for fragment in fragments:
+                content.append(fragment)
+                yield sse_event('chunk', {'content': fragment})
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+            return
+        saved = db.save_chat_message(email, 'assistant', ''.join(content))
+        yield sse_event('done', {'id': saved['id'], 'role': 'assistant', 'type': 'text'})
+    
+    response = app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Ask reverse proxies (nginx) not to buffer the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 def allowed_file(filename):
     """Check if file has allowed extension"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def save_upload(stream, file_ext):
+    """Stream an uploaded file object to disk while hashing it.
+    
+    Files are stored content-addressed as <sha256>.<ext>, so identical uploads
+    share one copy on disk. Returns (content_hash, stored_file).
+    """
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(suffix='.part', dir=app.config['UPLOAD_FOLDER'])
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in iter(lambda: stream.read(64 * 1024), b''):
+                digest.update(chunk)
+                out.write(chunk)
+        content_hash = digest.hexdigest()
+        stored_file = f"{content_hash}.{file_ext}"
+        stored_path = os.path.join(app.config['UPLOAD_FOLDER'], stored_file)
+        if os.path.exists(stored_path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, stored_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return content_hash, stored_file
+
+def resume_suggestions(email, resume):
+    """Improvement suggestions for a saved resume, recomputed and stored when they are stale"""
+    # Suggestions computed at upload are served as-is while the extractor and
+    # rules that produced them are current
+    text_current = resume.get('extractor_version') == ResumeProcessor.EXTRACTOR_VERSION and 'resume_text' in resume
+    if text_current and resume.get('rules_version') == ResumeProcessor.RULES_VERSION and 'suggestions' in resume:
+        return resume['suggestions']
+    
+    extracted_data = resume.get('extracted_data', {})
+    
+    if text_current:
+        resume_text = resume['resume_text']
+    else:
+        # Read resume file to get full text for suggestions
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], resume.get('stored_file', resume['filename']))
+        resume_text = services().extract_text(filepath)
+    
+    if resume.get('rules_version') is not None and resume['rules_version'] != ResumeProcessor.RULES_VERSION:
+        extracted_data = ResumeProcessor.merge_skills(ResumeProcessor.extract_resume_data(resume_text), resume.get('provided_skills'))
+    
+    suggestions = ResumeProcessor.get_improvement_suggestions(extracted_data, resume_text)
+    
+    analysis = ResumeProcessor.analysis_record(resume_text, suggestions)
+    analysis['extracted_data'] = extracted_data
+    db.update_resume(email, analysis)
+    
+    return suggestions
+
 # ==================== Authentication Routes ====================
 
-@app.route('/api/auth/signup', methods=['POST'])
+@api.route('/api/auth/signup', methods=['POST'])
 def signup():
     """User signup endpoint"""
     data = request.get_json()
@@ -72,7 +424,7 @@ def signup():
     
     return jsonify({'error': 'Error creating user'}), 500
 
-@app.route('/api/auth/login', methods=['POST'])
+@api.route('/api/auth/login', methods=['POST'])
 def login():
     """User login endpoint - simplified with just email and name"""
     data = request.get_json()
@@ -105,29 +457,33 @@ def login():
         }
     }), 200
 
-@app.route('/api/auth/profile', methods=['GET'])
+@api.route('/api/auth/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
     """Get user profile"""
     email = get_jwt_identity()
-    user = db.get_user(email)
     
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    # Don't expose password hash
-    user_data = {
-        'email': user['email'],
-        'name': user['name'],
-        'has_resume': user.get('resume') is not None,
-        'created_at': user.get('created_at')
-    }
+    def build():
+        user = db.get_user(email)
+        
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Don't expose password hash
+        user_data = {
+            'email': user['email'],
+            'name': user['name'],
+            'has_resume': user.get('resume') is not None,
+            'created_at': user.get('created_at')
+        }
+        
+        return jsonify(user_data), 200
     
-    return jsonify(user_data), 200
+    return user_resource_response(email, 'profile', build)
 
 # ==================== Chat Routes ====================
 
-@app.route('/api/chat/message', methods=['POST'])
+@api.route('/api/chat/message', methods=['POST'])
 @jwt_required()
 def chat_message():
     """Send a chat message and get AI response"""
@@ -145,42 +501,58 @@ def chat_message():
     # Save user message
     db.save_chat_message(email, 'user', user_message, resume_context=resume_context['filename'] if resume_context else None)
     
+    # Opt-in Server-Sent Events: the reply is sent fragment by fragment as it is generated
+    if wants_event_stream(request.args.get('stream'), request.headers.get('Accept')):
+        return chat_event_stream(email, ai_assistant.stream_response(user_message, email, resume_context))
+    
     # Get AI response
     ai_response = ai_assistant.get_response(user_message, email, resume_context)
     
-    # Save AI response
-    db.save_chat_message(email, 'assistant', ai_response['content'])
+    # Save AI response; its id lets the client sync with /api/chat/history?since=
+    saved = db.save_chat_message(email, 'assistant', ai_response['content'])
+    ai_response['id'] = saved['id']
     
     return jsonify(ai_response), 200
 
-@app.route('/api/chat/history', methods=['GET'])
+@api.route('/api/chat/history', methods=['GET'])
 @jwt_required()
 def get_chat_history():
-    """Get chat history for current user"""
+    """Get chat history for current user.
+    
+    `since=<id>` returns messages after that id for incremental sync and
+    `before=<id>` older messages for scrolling back; `has_more` tells whether
+    another page exists in that direction.
+    """
     email = get_jwt_identity()
     limit = request.args.get('limit', default=50, type=int)
+    since = request.args.get('since', type=int)
+    before = request.args.get('before', type=int)
     
-    messages = db.get_chat_history(email, limit=limit)
+    def build():
+        page = db.get_chat_page(email, limit=limit, since=since, before=before)
+        
+        return jsonify({
+            'messages': page['messages'],
+            'count': len(page['messages']),
+            'has_more': page['has_more']
+        }), 200
     
-    return jsonify({
-        'messages': messages,
-        'count': len(messages)
-    }), 200
+    return user_resource_response(email, 'chat', build, variant=f'limit={limit}&since={since}&before={before}')
 
-@app.route('/api/chat/clear', methods=['POST'])
+@api.route('/api/chat/clear', methods=['POST'])
 @jwt_required()
 def clear_chat():
     """Clear chat history for current user"""
     email = get_jwt_identity()
     
-    # Reinitialize chat history by creating new entry
-    db._write_json(db.chats_file, {})
+    db.clear_chat_history(email)
+    ai_assistant.sessions.clear(email)
     
     return jsonify({'message': 'Chat history cleared'}), 200
 
 # ==================== Resume Routes ====================
 
-@app.route('/api/resume/upload', methods=['POST'])
+@api.route('/api/resume/upload', methods=['POST'])
 @jwt_required()
 def upload_resume():
     """Upload and process resume"""
@@ -199,26 +571,11 @@ def upload_resume():
         return jsonify({'error': f'File type not allowed. Allowed: {", ".join(app.config["ALLOWED_EXTENSIONS"])}'}), 400
     
     try:
-        # Save file
+        # Save file (hashing it on the way to disk)
         filename = secure_filename(file.filename)
         filename = f"{email}_{datetime.now().timestamp()}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract text based on file type
-        file_ext = filename.rsplit('.', 1)[1].lower()
-        
-        if file_ext == 'pdf':
-            resume_text = ResumeProcessor.extract_text_from_pdf(filepath)
-        elif file_ext == 'docx':
-            resume_text = ResumeProcessor.extract_text_from_docx(filepath)
-        elif file_ext == 'doc':
-            resume_text = ResumeProcessor.extract_text_from_doc(filepath)
-        else:
-            return jsonify({'error': 'Unsupported file type'}), 400
-        
-        # Extract resume data
-        extracted_data = ResumeProcessor.extract_resume_data(resume_text)
+        content_hash, stored_file = save_upload(file.stream, filename.rsplit('.', 1)[1].lower())
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], stored_file)
 
         # Read optional provided qualifications/skills from the form
         provided_qualifications_raw = request.form.get('provided_qualifications', '')
@@ -227,28 +584,71 @@ def upload_resume():
         provided_qualifications = [q.strip() for q in provided_qualifications_raw.split(',') if q.strip()] if provided_qualifications_raw else []
         provided_skills = [s.strip() for s in provided_skills_raw.split(',') if s.strip()] if provided_skills_raw else []
 
-        # Merge provided skills into extracted_data for richer suggestions
-        merged_skills = list({*(extracted_data.get('skills', [])), *provided_skills})
-        extracted_data['skills'] = merged_skills
-
-        # Get improvement suggestions
-        suggestions = ResumeProcessor.get_improvement_suggestions(extracted_data, resume_text)
-
-        # Save to database (store provided fields too)
-        db.save_resume(email, filename, extracted_data, provided_qualifications=provided_qualifications, provided_skills=provided_skills)
+        # Identical files (re-uploads, shared templates) reuse a cached extraction
+        extraction = db.get_extraction(content_hash)
+        if not ResumeProcessor.is_current(extraction):
+            extraction = None
+        
+        # Opt-in background processing: hand the file to the job queue
+        resume_jobs = services().resume_jobs
+        if extraction is None and resume_jobs is not None and request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+            try:
+                job = resume_jobs.submit(email, filepath, filename, provided_qualifications, provided_skills, content_hash=content_hash)
+            except QueueFullError as e:
+                response = jsonify({'error': str(e)})
+                response.headers['Retry-After'] = '5'
+                return response, 503
+            return jsonify({
+                'message': 'Resume queued for processing',
+                'job_id': job['job_id'],
+                'status': job['status'],
+                'filename': filename
+            }), 202
+        
+        # Extract text and resume data
+        if extraction is None:
+            extraction = services().extract_file(filepath)
+            db.save_extraction(content_hash, extraction)
+        
+        # Merge provided skills, get improvement suggestions and save to database
+        result = store_resume(email, filename, stored_file, content_hash, extraction, provided_qualifications, provided_skills)
         
         return jsonify({
             'message': 'Resume uploaded successfully',
             'filename': filename,
-            'extracted_data': extracted_data,
-            'suggestions': suggestions
+            'extracted_data': result['extracted_data'],
+            'suggestions': result['suggestions']
         }), 200
     
     except Exception as e:
         return jsonify({'error': f'Error processing resume: {str(e)}'}), 500
 
+@api.route('/api/resume/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_resume_job(job_id):
+    """Get the status of a background resume job; ?wait=N long-polls up to N seconds"""
+    email = get_jwt_identity()
+    
+    resume_jobs = services().resume_jobs
+    if resume_jobs is None:
+        return jsonify({'error': 'Background resume processing is disabled'}), 404
+    
+    wait = min(max(request.args.get('wait', default=0, type=float), 0), 30)
+    job = resume_jobs.get(job_id, wait=wait)
+    
+    if not job or job['user_email'] != email:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    body = {'job_id': job['job_id'], 'status': job['status']}
+    if job['status'] == 'done':
+        body.update({'message': 'Resume uploaded successfully', **job['result']})
+    elif job['status'] == 'failed':
+        body['error'] = job['error']
+    
+    return jsonify(body), 200
+
 
-@app.route('/api/career/job-requirements', methods=['POST'])
+@api.route('/api/career/job-requirements', methods=['POST'])
 @jwt_required()
 def job_requirements():
     """Given a target job title and optional company, suggest required skills and gaps"""
@@ -271,24 +671,31 @@ def job_requirements():
     user_entered = [s.strip() for s in user_skills_str.split(',') if s.strip()] if user_skills_str else []
     all_provided = list(set(provided_skills + user_entered))
 
-    requirements = ai_assistant.get_job_requirements(job_title, company=company, resume_data=resume_data, provided_skills=all_provided)
+    requirements = ai_assistant.get_job_requirements(job_title, company=company, resume_data=resume_data, provided_skills=all_provided,
+                                                     resume_text=resume.get('resume_text'), text_skills=resume.get('text_skills'))
 
     return jsonify(requirements), 200
 
-@app.route('/api/resume/get', methods=['GET'])
+@api.route('/api/resume/get', methods=['GET'])
 @jwt_required()
 def get_resume():
     """Get uploaded resume information"""
     email = get_jwt_identity()
     
-    resume = db.get_resume(email)
-    
-    if not resume:
-        return jsonify({'message': 'No resume uploaded yet'}), 404
+    def build():
+        resume = db.get_resume(email)
+        
+        if not resume:
+            return jsonify({'message': 'No resume uploaded yet'}), 404
+        
+        for field in RESUME_INTERNAL_FIELDS:
+            resume.pop(field, None)
+        
+        return jsonify(resume), 200
     
-    return jsonify(resume), 200
+    return user_resource_response(email, 'resume', build)
 
-@app.route('/api/resume/suggestions', methods=['GET'])
+@api.route('/api/resume/suggestions', methods=['GET'])
 @jwt_required()
 def get_resume_suggestions():
     """Get resume improvement suggestions"""
@@ -299,64 +706,37 @@ def get_resume_suggestions():
     if not resume:
         return jsonify({'error': 'No resume uploaded yet'}), 404
     
-    extracted_data = resume.get('extracted_data', {})
-    
-    # Read resume file to get full text for suggestions
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], resume['filename'])
-    
     try:
-        file_ext = resume['filename'].rsplit('.', 1)[1].lower()
-        
-        if file_ext == 'pdf':
-            resume_text = ResumeProcessor.extract_text_from_pdf(filepath)
-        elif file_ext == 'docx':
-            resume_text = ResumeProcessor.extract_text_from_docx(filepath)
-        else:
-            resume_text = ResumeProcessor.extract_text_from_doc(filepath)
-        
-        suggestions = ResumeProcessor.get_improvement_suggestions(extracted_data, resume_text)
-        
-        return jsonify(suggestions), 200
-    
+        suggestions = resume_suggestions(email, resume)
     except Exception as e:
         return jsonify({'error': f'Error generating suggestions: {str(e)}'}), 500
+    
+    return jsonify(suggestions), 200
 
 # ==================== Career Guidance Routes ====================
 
-@app.route('/api/career/paths', methods=['GET'])
+@api.route('/api/career/paths', methods=['GET'])
 def get_career_paths():
     """Get available career paths"""
-    career_paths = {}
-    
-    for career, details in CareerAIAssistant.CAREER_PATHS.items():
-        career_paths[career] = {
-            'description': details['description'],
-            'skills': details['skills'],
-            'education': details['education']
-        }
-    
-    return jsonify(career_paths), 200
+    return static_response('career_paths')
 
-@app.route('/api/career/resume-tips', methods=['GET'])
+@api.route('/api/career/resume-tips', methods=['GET'])
 def get_resume_tips():
     """Get resume tips"""
-    tips = CareerAIAssistant.RESUME_TIPS
-    return jsonify(tips), 200
+    return static_response('resume_tips')
 
-@app.route('/api/career/interview-tips', methods=['GET'])
+@api.route('/api/career/interview-tips', methods=['GET'])
 def get_interview_tips():
     """Get interview preparation tips"""
-    tips = CareerAIAssistant.INTERVIEW_TIPS
-    return jsonify({'tips': tips}), 200
+    return static_response('interview_tips')
 
-@app.route('/api/career/skill-paths', methods=['GET'])
+@api.route('/api/career/skill-paths', methods=['GET'])
 def get_skill_paths():
     """Get skill development paths"""
-    paths = CareerAIAssistant.SKILL_PATHS
-    return jsonify(paths), 200
+    return static_response('skill_paths')
 
 
-@app.route('/api/career/generate-path', methods=['POST'])
+@api.route('/api/career/generate-path', methods=['POST'])
 @jwt_required()
 def generate_career_path():
     """Generate career suggestions from user skills and interests"""
@@ -370,12 +750,17 @@ def generate_career_path():
     if isinstance(skills, str):
         skills = [s.strip() for s in skills.split(',') if s.strip()]
 
+    max_skills, max_length = app.config['CAREER_MAX_SKILLS'], app.config['CAREER_MAX_SKILL_LENGTH']
+    if (not isinstance(skills, list) or len(skills) > max_skills
+            or any(not isinstance(s, str) or len(s) > max_length for s in skills)):
+        return jsonify({'error': f'Provide at most {max_skills} skills of up to {max_length} characters each'}), 400
+
     result = ai_assistant.generate_career_path(skills=skills, interests=interests)
     return jsonify(result), 200
 
 # ==================== Health Check ====================
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
@@ -383,17 +768,46 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     }), 200
 
+@api.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request, storage, extraction and assistant metrics in the Prometheus text format"""
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({'error': 'Endpoint not found'}), 404
+    response = make_response(metrics.render())
+    response.headers['Content-Type'] = metrics.CONTENT_TYPE
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+def profile_listing_allowed(token):
+    """Whether profiling is on and `token` matches the configured PROFILE_ACCESS_TOKEN"""
+    expected = app.config['PROFILE_ACCESS_TOKEN']
+    if not services().profiler.enabled or not expected:
+        return False
+    return hmac.compare_digest((token or '').encode('utf-8'), expected.encode('utf-8'))
+
+@api.route('/api/profiles', methods=['GET'])
+@jwt_required()
+def get_profiles():
+    """Slowest captured request profiles, for holders of the profile access token"""
+    profiler = services().profiler
+    # Captures describe other users' requests, so a login alone is not enough
+    if not profile_listing_allowed(request.headers.get('X-Profile-Token')):
+        return jsonify({'error': 'Endpoint not found'}), 404
+    limit = request.args.get('limit', 20, type=int)
+    return jsonify({'profiles': list_captures(profiler.directory, max(1, min(limit, 200)))}), 200
+
 # ==================== Error Handlers ====================
 
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
     return jsonify({'error': 'Endpoint not found'}), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Builds the app from APP_CONFIG (development by default)
+    app.run(debug=app.config.get('DEBUG', False), host='0.0.0.0', port=5000)
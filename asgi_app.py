@@ -0,0 +1,621 @@
+"""ASGI serving mode for the VidyaGuide API.
+
+Serves the routes of app.py, with the same JWT tokens and response bodies, as
+async handlers. Storage calls run on a bounded thread pool, resume extraction
+runs in a process pool, and streamed chat replies and job long-polls wait
+without holding a thread, so one process can keep thousands of slow or idle
+connections open. Run it with
+
+    uvicorn asgi_app:application --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import anyio
+from flask_jwt_extended import create_access_token, get_jwt_identity, verify_jwt_in_request
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.datastructures import Headers
+from werkzeug.http import is_resource_modified, remove_entity_headers
+from werkzeug.security import generate_password_hash
+from werkzeug.utils import secure_filename
+
+from app import (db, ai_assistant, allowed_file, get_app, private_response, profile_listing_allowed, resume_suggestions,
+                 save_upload, services, sse_event, static_response, store_resume, user_resource_version, wants_event_stream,
+                 RESUME_INTERNAL_FIELDS)
+import metrics
+from profiler import list_captures
+from resume_jobs import QueueFullError, TERMINAL_STATUSES
+from resume_processor import ResumeProcessor
+
+# The Flask app whose storage, config and JWT settings these handlers share;
+# `db` and `ai_assistant` resolve to it from the worker threads too
+flask_app = get_app()
+resume_jobs = services().resume_jobs
+profiler = services().profiler
+
+# Process pool for resume extraction, started with the first synchronous upload
+extraction_executor = None
+
+
+def extraction_pool() -> ProcessPoolExecutor:
+    global extraction_executor
+    if extraction_executor is None:
+        extraction_executor = ProcessPoolExecutor(max_workers=flask_app.config['ASYNC_EXTRACTION_WORKERS'])
+    return extraction_executor
+
+
+def to_asgi(response) -> Response:
+    """Starlette response with a Werkzeug response's status, headers and body"""
+    headers = Headers(response.headers)
+    body = response.get_data()
+    # Werkzeug drops these only when serving the response over WSGI
+    if response.status_code in (204, 304):
+        body = b''
+    if response.status_code == 304:
+        remove_entity_headers(headers)
+    asgi_response = Response(body, status_code=response.status_code)
+    asgi_response.raw_headers = [(key.lower().encode('latin-1'), value.encode('latin-1')) for key, value in headers.items()]
+    return asgi_response
+
+
+def limit_body(receive, max_bytes: int):
+    """ASGI receive callable that raises RequestEntityTooLarge once the body passes `max_bytes`"""
+    received = 0
+
+    async def receive_limited():
+        nonlocal received
+        message = await receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > max_bytes:
+                raise RequestEntityTooLarge()
+        return message
+
+    return receive_limited
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Same body and headers as jsonify"""
+    response = flask_app.json.response(payload)
+    response.status_code = status
+    return to_asgi(response)
+
+
+def wsgi_environ(request: Request) -> dict:
+    """The parts of a WSGI environ Werkzeug's conditional request helpers read"""
+    environ = {'REQUEST_METHOD': request.method}
+    for key, value in request.headers.items():
+        environ['HTTP_' + key.upper().replace('-', '_')] = value
+    return environ
+
+
+def query_number(request: Request, name: str, default=None, type=int):
+    """Query parameter converted like Flask's request.args.get(name, default, type)"""
+    try:
+        return type(request.query_params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+async def json_body(request: Request):
+    """Parsed JSON body, or None when it is missing or malformed"""
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+def access_token(email: str) -> str:
+    with flask_app.app_context():
+        return create_access_token(identity=email)
+
+
+def jwt_identity(request: Request):
+    """(email, None) for a valid access token, else (None, the error response @jwt_required() gives)"""
+    headers = {'Authorization': request.headers['authorization']} if 'authorization' in request.headers else {}
+    with flask_app.test_request_context(headers=headers):
+        try:
+            verify_jwt_in_request()
+        except Exception as e:
+            return None, to_asgi(flask_app.make_response(flask_app.handle_user_exception(e)))
+        return get_jwt_identity(), None
+
+
+def jwt_required(handler):
+    """Pass the token's identity to an async handler, or answer with the JWT error"""
+    @functools.wraps(handler)
+    async def wrapper(request: Request):
+        email, error = jwt_identity(request)
+        if error is not None:
+            return error
+        return await handler(request, email)
+    return wrapper
+
+
+async def user_resource_response(request: Request, email: str, resource: str, build, variant: str = '') -> Response:
+    """Async counterpart of app.user_resource_response; `build` is a coroutine returning (payload, status)"""
+    etag, last_modified = await run_in_threadpool(user_resource_version, email, resource, variant)
+    if etag and not is_resource_modified(wsgi_environ(request), etag=etag, last_modified=last_modified):
+        response = flask_app.response_class(status=304)
+    else:
+        payload, status = await build()
+        response = flask_app.json.response(payload)
+        response.status_code = status
+    return to_asgi(private_response(response, etag, last_modified))
+
+
+def chat_event_stream(email: str, fragments) -> StreamingResponse:
+    """Async counterpart of app.chat_event_stream.
+
+    Each fragment is produced on the thread pool, so a client waiting on a
+    slow reply holds a connection but no thread.
+    """
+    async def generate():
+        yield sse_event('start', {'role': 'assistant', 'type': 'text'})
+        content = []
+        try:
+            while True:
+                fragment = await run_in_threadpool(next, fragments, None)
+                if fragment is None:
+                    break
+                content.append(fragment)
+                yield sse_event('chunk', {'content': fragment})
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+            return
+        finally:
+            fragments.close()
+        saved = await run_in_threadpool(db.save_chat_message, email, 'assistant', ''.join(content))
+        yield sse_event('done', {'id': saved['id'], 'role': 'assistant', 'type': 'text'})
+
+    return StreamingResponse(generate(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# ==================== Authentication Routes ====================
+
+async def signup(request: Request):
+    data = await json_body(request)
+
+    if not data or not data.get('email') or not data.get('name') or not data.get('password'):
+        return json_response({'error': 'Missing required fields: email, name, password'}, 400)
+
+    email = data['email'].strip().lower()
+    name = data['name'].strip()
+    password = data['password']
+
+    if '@' not in email or '.' not in email:
+        return json_response({'error': 'Invalid email format'}, 400)
+
+    if await run_in_threadpool(db.get_user, email):
+        return json_response({'error': 'Email already registered'}, 400)
+
+    # Password hashing is deliberately slow; keep it off the event loop
+    password_hash = await run_in_threadpool(generate_password_hash, password)
+    if await run_in_threadpool(db.create_user, email, name, password_hash):
+        return json_response({
+            'message': 'Signup successful',
+            'access_token': access_token(email),
+            'user': {
+                'email': email,
+                'name': name
+            }
+        }, 201)
+
+    return json_response({'error': 'Error creating user'}, 500)
+
+
+async def login(request: Request):
+    data = await json_body(request)
+
+    if not data or not data.get('email') or not data.get('name'):
+        return json_response({'error': 'Missing email or name'}, 400)
+
+    email = data['email'].strip().lower()
+    name = data['name'].strip()
+
+    if '@' not in email or '.' not in email:
+        return json_response({'error': 'Invalid email format'}, 400)
+
+    user = await run_in_threadpool(db.get_user, email)
+    if not user:
+        await run_in_threadpool(db.create_user, email, name, '')
+        user = await run_in_threadpool(db.get_user, email)
+
+    return json_response({
+        'message': 'Login successful',
+        'access_token': access_token(email),
+        'user': {
+            'email': user['email'],
+            'name': user['name']
+        }
+    }, 200)
+
+
+@jwt_required
+async def get_profile(request: Request, email: str):
+    async def build():
+        user = await run_in_threadpool(db.get_user, email)
+
+        if not user:
+            return {'error': 'User not found'}, 404
+
+        return {
+            'email': user['email'],
+            'name': user['name'],
+            'has_resume': user.get('resume') is not None,
+            'created_at': user.get('created_at')
+        }, 200
+
+    return await user_resource_response(request, email, 'profile', build)
+
+
+# ==================== Chat Routes ====================
+
+@jwt_required
+async def chat_message(request: Request, email: str):
+    data = await json_body(request)
+
+    if not data or not data.get('message'):
+        return json_response({'error': 'Message is required'}, 400)
+
+    user_message = data['message'].strip()
+
+    resume_context = await run_in_threadpool(db.get_resume, email)
+    await run_in_threadpool(db.save_chat_message, email, 'user', user_message,
+                            resume_context=resume_context['filename'] if resume_context else None)
+
+    if wants_event_stream(request.query_params.get('stream'), request.headers.get('accept')):
+        return chat_event_stream(email, ai_assistant.stream_response(user_message, email, resume_context))
+
+    # A model backend may block on the network, so the reply is generated on the thread pool
+    ai_response = await run_in_threadpool(ai_assistant.get_response, user_message, email, resume_context)
+
+    saved = await run_in_threadpool(db.save_chat_message, email, 'assistant', ai_response['content'])
+    ai_response['id'] = saved['id']
+
+    return json_response(ai_response, 200)
+
+
+@jwt_required
+async def get_chat_history(request: Request, email: str):
+    limit = query_number(request, 'limit', 50)
+    since = query_number(request, 'since')
+    before = query_number(request, 'before')
+
+    async def build():
+        page = await run_in_threadpool(db.get_chat_page, email, limit=limit, since=since, before=before)
+
+        return {
+            'messages': page['messages'],
+            'count': len(page['messages']),
+            'has_more': page['has_more']
+        }, 200
+
+    return await user_resource_response(request, email, 'chat', build, variant=f'limit={limit}&since={since}&before={before}')
+
+
+@jwt_required
+async def clear_chat(request: Request, email: str):
+    await run_in_threadpool(db.clear_chat_history, email)
+    await run_in_threadpool(ai_assistant.sessions.clear, email)
+
+    return json_response({'message': 'Chat history cleared'}, 200)
+
+
+# ==================== Resume Routes ====================
+
+@jwt_required
+async def upload_resume(request: Request, email: str):
+    if int(request.headers.get('content-length') or 0) > flask_app.config['MAX_CONTENT_LENGTH']:
+        return to_asgi(RequestEntityTooLarge().get_response())
+
+    # Without a Content-Length (chunked uploads) the limit is enforced while
+    # the multipart body is read
+    request = Request(request.scope, limit_body(request.receive, flask_app.config['MAX_CONTENT_LENGTH']))
+    try:
+        async with request.form() as form:
+            file = form.get('file')
+
+            if file is None or isinstance(file, str):
+                return json_response({'error': 'No file provided'}, 400)
+
+            if not file.filename:
+                return json_response({'error': 'No file selected'}, 400)
+
+            if not allowed_file(file.filename):
+                return json_response({'error': f'File type not allowed. Allowed: {", ".join(flask_app.config["ALLOWED_EXTENSIONS"])}'}, 400)
+
+            try:
+                filename = secure_filename(file.filename)
+                filename = f"{email}_{datetime.now().timestamp()}_{filename}"
+                content_hash, stored_file = await run_in_threadpool(save_upload, file.file, filename.rsplit('.', 1)[1].lower())
+                filepath = os.path.join(flask_app.config['UPLOAD_FOLDER'], stored_file)
+
+                provided_qualifications_raw = form.get('provided_qualifications', '')
+                provided_skills_raw = form.get('provided_skills', '')
+
+                provided_qualifications = [q.strip() for q in provided_qualifications_raw.split(',') if q.strip()] if provided_qualifications_raw else []
+                provided_skills = [s.strip() for s in provided_skills_raw.split(',') if s.strip()] if provided_skills_raw else []
+
+                extraction = await run_in_threadpool(db.get_extraction, content_hash)
+                if not ResumeProcessor.is_current(extraction):
+                    extraction = None
+
+                if extraction is None and resume_jobs is not None and request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+                    try:
+                        job = await run_in_threadpool(resume_jobs.submit, email, filepath, filename, provided_qualifications,
+                                                      provided_skills, content_hash=content_hash)
+                    except QueueFullError as e:
+                        response = json_response({'error': str(e)}, 503)
+                        response.headers['Retry-After'] = '5'
+                        return response
+                    return json_response({
+                        'message': 'Resume queued for processing',
+                        'job_id': job['job_id'],
+                        'status': job['status'],
+                        'filename': filename
+                    }, 202)
+
+                # Parsing is CPU-bound: run it in the process pool, not on the event loop
+                if extraction is None:
+                    extraction, recorded = await asyncio.get_running_loop().run_in_executor(
+                        extraction_pool(), metrics.run_collecting, services().extract_file, filepath)
+                    metrics.merge(recorded)
+                    await run_in_threadpool(db.save_extraction, content_hash, extraction)
+
+                result = await run_in_threadpool(store_resume, email, filename, stored_file, content_hash, extraction,
+                                                 provided_qualifications, provided_skills)
+
+                return json_response({
+                    'message': 'Resume uploaded successfully',
+                    'filename': filename,
+                    'extracted_data': result['extracted_data'],
+                    'suggestions': result['suggestions']
+                }, 200)
+
+            except Exception as e:
+                return json_response({'error': f'Error processing resume: {str(e)}'}, 500)
+    except RequestEntityTooLarge as e:
+        return to_asgi(e.get_response())
+
+
+@jwt_required
+async def get_resume_job(request: Request, email: str):
+    if resume_jobs is None:
+        return json_response({'error': 'Background resume processing is disabled'}, 404)
+
+    job_id = request.path_params['job_id']
+    wait = min(max(query_number(request, 'wait', 0, type=float), 0), 30)
+
+    # Long-poll by sleeping on the event loop instead of blocking a thread in resume_jobs.get
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    delay = 0.05
+    job = await run_in_threadpool(resume_jobs.get, job_id)
+    while job and job['status'] not in TERMINAL_STATUSES and loop.time() < deadline:
+        await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+        delay = min(delay * 2, 0.5)
+        job = await run_in_threadpool(resume_jobs.get, job_id)
+
+    if not job or job['user_email'] != email:
+        return json_response({'error': 'Job not found'}, 404)
+
+    body = {'job_id': job['job_id'], 'status': job['status']}
+    if job['status'] == 'done':
+        body.update({'message': 'Resume uploaded successfully', **job['result']})
+    elif job['status'] == 'failed':
+        body['error'] = job['error']
+
+    return json_response(body, 200)
+
+
+@jwt_required
+async def job_requirements(request: Request, email: str):
+    data = await json_body(request) or {}
+
+    job_title = data.get('job_title')
+    company = data.get('company', '')
+    user_skills_str = data.get('user_skills', '')
+
+    if not job_title:
+        return json_response({'error': 'job_title is required'}, 400)
+
+    resume = await run_in_threadpool(db.get_resume, email) or {}
+    resume_data = resume.get('extracted_data', {})
+    provided_skills = resume.get('provided_skills', [])
+
+    user_entered = [s.strip() for s in user_skills_str.split(',') if s.strip()] if user_skills_str else []
+    all_provided = list(set(provided_skills + user_entered))
+
+    requirements = await run_in_threadpool(ai_assistant.get_job_requirements, job_title, company=company, resume_data=resume_data,
+                                           provided_skills=all_provided, resume_text=resume.get('resume_text'),
+                                           text_skills=resume.get('text_skills'))
+
+    return json_response(requirements, 200)
+
+
+@jwt_required
+async def get_resume(request: Request, email: str):
+    async def build():
+        resume = await run_in_threadpool(db.get_resume, email)
+
+        if not resume:
+            return {'message': 'No resume uploaded yet'}, 404
+
+        for field in RESUME_INTERNAL_FIELDS:
+            resume.pop(field, None)
+
+        return resume, 200
+
+    return await user_resource_response(request, email, 'resume', build)
+
+
+@jwt_required
+async def get_resume_suggestions(request: Request, email: str):
+    resume = await run_in_threadpool(db.get_resume, email)
+
+    if not resume:
+        return json_response({'error': 'No resume uploaded yet'}, 404)
+
+    try:
+        suggestions = await run_in_threadpool(resume_suggestions, email, resume)
+    except Exception as e:
+        return json_response({'error': f'Error generating suggestions: {str(e)}'}, 500)
+
+    return json_response(suggestions, 200)
+
+
+# ==================== Career Guidance Routes ====================
+
+def static_endpoint(name: str):
+    """Handler serving one of the prerendered static career bodies"""
+    async def endpoint(request: Request):
+        return to_asgi(static_response(name, wsgi_environ(request)))
+    endpoint.__name__ = f'get_{name}'
+    return endpoint
+
+
+@jwt_required
+async def generate_career_path(request: Request, email: str):
+    data = await json_body(request) or {}
+
+    skills = data.get('skills', [])
+    interests = data.get('interests', '')
+
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(',') if s.strip()]
+
+    max_skills, max_length = flask_app.config['CAREER_MAX_SKILLS'], flask_app.config['CAREER_MAX_SKILL_LENGTH']
+    if (not isinstance(skills, list) or len(skills) > max_skills
+            or any(not isinstance(s, str) or len(s) > max_length for s in skills)):
+        return json_response({'error': f'Provide at most {max_skills} skills of up to {max_length} characters each'}, 400)
+
+    result = await run_in_threadpool(ai_assistant.generate_career_path, skills=skills, interests=interests)
+    return json_response(result, 200)
+
+
+# ==================== Health Check ====================
+
+async def health_check(request: Request):
+    return json_response({
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat()
+    }, 200)
+
+
+async def get_metrics(request: Request):
+    if not flask_app.config['METRICS_ENABLED']:
+        return json_response({'error': 'Endpoint not found'}, 404)
+    body = await run_in_threadpool(metrics.render)
+    return Response(body, headers={'Content-Type': metrics.CONTENT_TYPE, 'Cache-Control': 'no-store'})
+
+
+@jwt_required
+async def get_profiles(request: Request, email: str):
+    if not profile_listing_allowed(request.headers.get('x-profile-token')):
+        return json_response({'error': 'Endpoint not found'}, 404)
+    limit = query_number(request, 'limit', 20)
+    records = await run_in_threadpool(list_captures, profiler.directory, max(1, min(limit, 200)))
+    return json_response({'profiles': records}, 200)
+
+
+class MetricsMiddleware:
+    """Record request counts and latency per route, timed to the last byte of streamed bodies"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Label routes the way Flask spells them, so both serving modes share series
+            route = scope.get('route')
+            path = route.path.replace('{', '<').replace('}', '>') if route is not None else 'unmatched'
+            labels = (scope['method'], path, str(status))
+            metrics.HTTP_REQUESTS.inc(*labels)
+            metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, *labels)
+
+
+# ==================== Error Handlers ====================
+
+async def not_found(request: Request, exc):
+    return json_response({'error': 'Endpoint not found'}, 404)
+
+
+async def internal_error(request: Request, exc):
+    return json_response({'error': 'Internal server error'}, 500)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Every blocking storage call shares one bounded thread pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = flask_app.config['ASYNC_IO_THREADS']
+    yield
+    if extraction_executor is not None:
+        extraction_executor.shutdown(wait=False, cancel_futures=True)
+
+
+routes = [
+    Route('/api/auth/signup', signup, methods=['POST']),
+    Route('/api/auth/login', login, methods=['POST']),
+    Route('/api/auth/profile', get_profile, methods=['GET']),
+    Route('/api/chat/message', chat_message, methods=['POST']),
+    Route('/api/chat/history', get_chat_history, methods=['GET']),
+    Route('/api/chat/clear', clear_chat, methods=['POST']),
+    Route('/api/resume/upload', upload_resume, methods=['POST']),
+    Route('/api/resume/jobs/{job_id}', get_resume_job, methods=['GET']),
+    Route('/api/career/job-requirements', job_requirements, methods=['POST']),
+    Route('/api/resume/get', get_resume, methods=['GET']),
+    Route('/api/resume/suggestions', get_resume_suggestions, methods=['GET']),
+    Route('/api/career/paths', static_endpoint('career_paths'), methods=['GET']),
+    Route('/api/career/resume-tips', static_endpoint('resume_tips'), methods=['GET']),
+    Route('/api/career/interview-tips', static_endpoint('interview_tips'), methods=['GET']),
+    Route('/api/career/skill-paths', static_endpoint('skill_paths'), methods=['GET']),
+    Route('/api/career/generate-path', generate_career_path, methods=['POST']),
+    Route('/api/health', health_check, methods=['GET']),
+    Route('/api/metrics', get_metrics, methods=['GET']),
+    Route('/api/profiles', get_profiles, methods=['GET']),
+]
+
+middleware = [Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])]
+if flask_app.config['METRICS_ENABLED']:
+    middleware.insert(0, Middleware(MetricsMiddleware))
+
+application = Starlette(
+    routes=routes,
+    middleware=middleware,
+    exception_handlers={404: not_found, 500: internal_error},
+    lifespan=lifespan
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run('asgi_app:application', host='0.0.0.0', port=5000)
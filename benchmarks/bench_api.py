@@ -0,0 +1,197 @@
+"""Concurrent load test for the HTTP API.
+
+Seeds synthetic users with PDF/DOCX resumes and chat histories, then sends a
+weighted mix of requests to the API routes from concurrent clients and
+reports request rate and p50/p95/p99 latency per route. By default the Flask
+app runs in-process on a throwaway data directory, so no server or network is
+needed; --url points it at a running server instead, such as
+`uvicorn asgi_app:application` or `python app.py`.
+
+Usage: python benchmarks/bench_api.py [--users N] [--history N] [--requests N] [--clients N]
+                                      [--engine json|sqlite] [--url URL] [--save-baseline [PATH]] [--compare [PATH]]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import COMPANIES, ROLES, SKILLS, TOPICS, resume_files, synthetic_messages, synthetic_users
+from harness import add_baseline_arguments, check_settings, finish, latency_summary
+
+# Relative share of each route in the measured request mix
+ROUTE_WEIGHTS = {
+    'POST /api/auth/login': 10,
+    'POST /api/chat/message': 30,
+    'GET /api/chat/history': 25,
+    'POST /api/resume/upload': 5,
+    'GET /api/resume/suggestions': 10,
+    'POST /api/career/job-requirements': 10,
+    'POST /api/career/generate-path': 10
+}
+
+
+class InProcessClient:
+    """Calls the Flask app through its test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, token: str = None, json=None, upload=None) -> tuple:
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        if upload is not None:
+            filename, content = upload
+            response = self.client.open(path, method=method, headers=headers, content_type='multipart/form-data',
+                                        data={'file': (io.BytesIO(content), filename), 'provided_skills': 'Go, Rust'})
+        else:
+            response = self.client.open(path, method=method, headers=headers, json=json)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPClient:
+    """Calls a running server over keep-alive HTTP connections"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method: str, path: str, token: str = None, json=None, upload=None) -> tuple:
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        if upload is not None:
+            response = self.session.request(method, self.base_url + path, headers=headers,
+                                            files={'file': upload}, data={'provided_skills': 'Go, Rust'})
+        else:
+            response = self.session.request(method, self.base_url + path, headers=headers, json=json)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body
+
+
+def route_call(route: str, user: dict, rng: random.Random) -> tuple:
+    """(method, path, kwargs) of one request to `route` for a user"""
+    method, path = route.split(' ', 1)
+    if route == 'POST /api/auth/login':
+        return method, path, {'json': {'email': user['email'], 'name': user['name']}}
+    if route == 'POST /api/chat/message':
+        return method, path, {'token': user['token'], 'json': {'message': synthetic_messages(1, rng)[0]}}
+    if route == 'GET /api/chat/history':
+        return method, path + '?limit=50', {'token': user['token']}
+    if route == 'POST /api/resume/upload':
+        return method, path, {'token': user['token'], 'upload': user['resume']}
+    if route == 'GET /api/resume/suggestions':
+        return method, path, {'token': user['token']}
+    if route == 'POST /api/career/job-requirements':
+        return method, path, {'token': user['token'], 'json': {
+            'job_title': rng.choice(ROLES), 'company': rng.choice(COMPANIES),
+            'user_skills': ', '.join(rng.sample(SKILLS, 3))}}
+    return method, path, {'token': user['token'], 'json': {
+        'skills': rng.sample(SKILLS, rng.randint(2, 6)), 'interests': rng.choice(TOPICS)}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--history', type=int, default=20, help='chat messages seeded per user')
+    parser.add_argument('--requests', type=int, default=2000, help='measured requests')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--engine', choices=('json', 'sqlite'), default='json', help='database engine (in-process only)')
+    parser.add_argument('--url', help='base URL of a running server, e.g. http://127.0.0.1:5000')
+    parser.add_argument('--seed', type=int, default=42)
+    add_baseline_arguments(parser, 'api')
+    args = parser.parse_args(argv)
+
+    settings = {'users': args.users, 'history': args.history, 'requests': args.requests, 'clients': args.clients,
+                'target': args.url or f'in-process/{args.engine}'}
+    check_settings(args.compare, settings)
+
+    if args.url:
+        def new_client():
+            return HTTPClient(args.url)
+    else:
+        # Keep the run's users, chats and uploads out of the real data directories
+        scratch = tempfile.mkdtemp(prefix='bench_api_')
+        os.environ['DATABASE_PATH'] = os.path.join(scratch, 'data')
+        os.environ['UPLOAD_FOLDER'] = os.path.join(scratch, 'uploads')
+        os.environ['DATABASE_ENGINE'] = args.engine
+        from app import app
+
+        def new_client():
+            return InProcessClient(app)
+
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = new_client()
+        return local.client
+
+    rng = random.Random(args.seed)
+    users = [{'email': email, 'name': name, 'resume': resume}
+             for (email, name), resume in zip(synthetic_users(args.users, rng), resume_files(args.users, rng))]
+
+    def seed(user):
+        user_rng = random.Random(user['email'])
+        status, body = client().request('POST', '/api/auth/login', json={'email': user['email'], 'name': user['name']})
+        if status != 200:
+            raise RuntimeError(f'Login failed with HTTP {status}: {body}')
+        user['token'] = body['access_token']
+        client().request('POST', '/api/resume/upload', token=user['token'], upload=user['resume'])
+        for message in synthetic_messages(args.history, user_rng):
+            client().request('POST', '/api/chat/message', token=user['token'], json={'message': message})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(seed, users))
+    print(f"Seeded {len(users)} users with resumes and {args.history} chat messages each "
+          f"in {time.perf_counter() - start:.1f}s ({settings['target']})")
+
+    routes = list(ROUTE_WEIGHTS)
+    plan = [(route, rng.choice(users), random.Random(rng.random()))
+            for route in rng.choices(routes, weights=[ROUTE_WEIGHTS[r] for r in routes], k=args.requests)]
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+
+    def run(item):
+        route, user, call_rng = item
+        method, path, kwargs = route_call(route, user, call_rng)
+        started = time.perf_counter()
+        status, _ = client().request(method, path, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1e3
+        with lock:
+            latencies[route].append(elapsed)
+            if status >= 400:
+                errors[route] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(run, plan))
+    wall = time.perf_counter() - start
+
+    results = {route: dict(latency_summary(latencies[route], wall), errors=errors[route])
+               for route in routes if latencies[route]}
+    results['all'] = dict(latency_summary([v for values in latencies.values() for v in values], wall),
+                          errors=sum(errors.values()))
+
+    print(f"{args.requests} requests from {args.clients} clients in {wall:.2f}s")
+    print(f"{'route':<36}  {'count':>6}  {'errors':>6}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for route, r in results.items():
+        print(f"{route:<36}  {r['count']:>6}  {r['errors']:>6}  {r['rps']:>8.1f}  {r['p50']:>8.2f}  {r['p95']:>8.2f}  {r['p99']:>8.2f}")
+
+    return finish(args, results, settings)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
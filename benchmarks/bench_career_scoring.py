@@ -0,0 +1,105 @@
+"""Benchmark for CareerAIAssistant.generate_career_path against catalog size.
+
+Times one call with the precomputed career index for synthetic career catalogs
+of increasing size, alongside the previous nested-loop scorer.
+
+Usage: python benchmarks/bench_career_scoring.py [--sizes 5,50,500,5000] [--queries N]
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_assistant import CareerAIAssistant
+
+SKILL_WORDS = ['Python', 'Java', 'SQL', 'Statistics', 'Machine Learning', 'Design', 'Communication', 'Leadership',
+               'Analytics', 'Strategy', 'Problem Solving', 'Data Structures', 'System Design', 'Empathy', 'Creativity',
+               'Cloud', 'Security', 'Networking', 'Finance', 'Accounting', 'Sales', 'Negotiation', 'Research', 'Writing']
+TITLE_WORDS = ['Senior', 'Junior', 'Lead', 'Staff', 'Associate', 'Principal', 'Cloud', 'Data', 'Security', 'Product',
+               'Software', 'Marketing', 'Sales', 'Finance', 'Research', 'Platform', 'Mobile', 'Web']
+ROLE_WORDS = ['Engineer', 'Analyst', 'Scientist', 'Designer', 'Manager', 'Consultant', 'Architect', 'Specialist']
+DESC_WORDS = ['build', 'analyze', 'design', 'lead', 'teams', 'products', 'data', 'customers', 'systems', 'strategy',
+              'growth', 'reliable', 'secure', 'insights', 'decisions', 'experiences']
+USER_SKILLS = ['python', 'ml', 'sql', 'js', 'react', 'design', 'leadership', 'comunication', 'statistic', 'node',
+               'excel', 'negotiation', 'writing', 'cloud']
+INTERESTS = ['', 'data and decisions', 'building secure systems', 'design of products', 'growth marketing']
+
+
+def synthetic_catalog(size: int, rng: random.Random) -> dict:
+    """Career catalog with `size` roles made from random title, skill and description words"""
+    catalog = {}
+    while len(catalog) < size:
+        title = f"{' '.join(rng.sample(TITLE_WORDS, 2))} {rng.choice(ROLE_WORDS)} {len(catalog)}"
+        catalog[title] = {
+            'skills': rng.sample(SKILL_WORDS, rng.randint(3, 6)),
+            'education': ['Computer Science'],
+            'description': ' '.join(rng.sample(DESC_WORDS, 6))
+        }
+    return catalog
+
+
+def legacy_scores(career_paths: dict, skills: list, interest_text: str) -> list:
+    """The previous scorer: careers x required skills x user skills with difflib in the inner loop"""
+    matches = []
+    for career, details in career_paths.items():
+        score = 0
+        for req in details.get('skills', []):
+            req_low = req.lower()
+            for user_skill in skills:
+                user_low = user_skill.lower()
+                if user_low and (user_low in req_low or req_low in user_low):
+                    score += 2
+                    break
+                if difflib.get_close_matches(user_low, req_low.split(), n=1, cutoff=0.8):
+                    score += 1
+                    break
+        if any(word in interest_text for word in career.lower().split()):
+            score += 1
+        if any(word in interest_text for word in details.get('description', '').lower().split()):
+            score += 1
+        matches.append((career, score))
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return matches[:4]
+
+
+def time_per_query(func, queries, repeat: int) -> float:
+    """Best-of-`repeat` mean time per query, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for skills, interests in queries:
+            func(skills, interests)
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries) * 1e3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='5,50,500,5000')
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    queries = [(rng.sample(USER_SKILLS, rng.randint(2, 8)), rng.choice(INTERESTS)) for _ in range(args.queries)]
+
+    print(f"{'careers':>8}  {'build ms':>9}  {'indexed ms/call':>15}  {'legacy ms/call':>14}  speedup")
+    for size in (int(s) for s in args.sizes.split(',')):
+        catalog = synthetic_catalog(size, rng)
+        start = time.perf_counter()
+        assistant = CareerAIAssistant(career_paths=catalog)
+        build = (time.perf_counter() - start) * 1e3
+
+        indexed = time_per_query(assistant.generate_career_path, queries, args.repeat)
+        legacy = time_per_query(lambda skills, interests: legacy_scores(catalog, skills, interests.lower()),
+                                queries, args.repeat)
+        print(f"{size:>8}  {build:>9.1f}  {indexed:>15.3f}  {legacy:>14.3f}  {legacy / indexed:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
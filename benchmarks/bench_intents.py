@@ -0,0 +1,93 @@
+"""Throughput benchmark for chat intent detection.
+
+Classifies a synthetic corpus of chat messages with the compiled intent
+matcher and with the previous sequential keyword scans, and times full
+`CareerAIAssistant.get_response` calls.
+
+Usage: python benchmarks/bench_intents.py [--messages N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_assistant import CareerAIAssistant
+
+TEMPLATES = [
+    'What career path fits someone who likes {topic}?',
+    'Can you review my resume for a {role} application?',
+    'How should I prepare for a {role} interview at {company}?',
+    'What skills do I need for {role} at {company}?',
+    'I want to learn {topic}, where do I start?',
+    'Is a masters degree worth it for {topic}?',
+    'How do I negotiate salary after an offer from {company}?',
+    'Thanks, that was helpful!',
+    'Which jobs can I get with a background in {topic}?',
+    'Tell me about education options in {topic} and which skill matters most',
+]
+ROLES = ['full stack developer', 'data scientist', 'product manager', 'UX designer', 'marketing manager', 'SDE intern']
+COMPANIES = ['Amazon', 'Google', 'JP Morgan', 'Infosys', 'a startup']
+TOPICS = ['machine learning', 'design', 'finance', 'cloud computing', 'statistics', 'web development']
+
+ENTITY_RE = r"(?P<role>[\w\s\-+]+?)\s+(?:in|at|for)\s+(?P<company>[A-Za-z0-9 &.\-]+)"
+
+
+def synthetic_messages(count: int, rng: random.Random) -> list:
+    return [rng.choice(TEMPLATES).format(role=rng.choice(ROLES), company=rng.choice(COMPANIES), topic=rng.choice(TOPICS))
+            for _ in range(count)]
+
+
+def legacy_classify(message: str):
+    """The previous detection: four sequential keyword scans, entity regex compiled per message"""
+    lower = message.lower()
+    if any(keyword in lower for keyword in ['career path', 'career', 'job', 'profession']):
+        return 'career_guidance', {}
+    if any(keyword in lower for keyword in ['resume', 'cv', 'application']):
+        return 'resume_advice', {}
+    if any(keyword in lower for keyword in ['interview', 'preparation', 'prepare']):
+        return 'interview_prep', {}
+    if any(keyword in lower for keyword in ['skill', 'learn', 'education']):
+        # The handler compiled its role/company regex on every message
+        m = re.compile(ENTITY_RE, re.IGNORECASE).search(message.strip())
+        return 'skill_development', ({'role': m.group('role').strip(), 'company': m.group('company').strip()} if m else {})
+    return 'general', {}
+
+
+def messages_per_sec(func, messages, repeat: int) -> float:
+    """Best-of-`repeat` throughput in messages per second"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    return len(messages) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    messages = synthetic_messages(args.messages, rng)
+    assistant = CareerAIAssistant()
+
+    compiled = messages_per_sec(assistant.intent_matcher.classify, messages, args.repeat)
+    legacy = messages_per_sec(legacy_classify, messages, args.repeat)
+    responses = messages_per_sec(lambda m: assistant.get_response(m, 'bench@example.com'), messages, max(1, args.repeat // 2))
+
+    print(f"{len(messages)} synthetic chat messages")
+    print(f"  compiled intents : {compiled:12,.0f} messages/sec")
+    print(f"  legacy scans     : {legacy:12,.0f} messages/sec  ({compiled / legacy:.1f}x)")
+    print(f"  get_response     : {responses:12,.0f} messages/sec")
+
+
+if __name__ == '__main__':
+    main()
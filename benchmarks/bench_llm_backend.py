@@ -0,0 +1,88 @@
+"""Latency benchmark for chat replies through the HTTP model backend.
+
+Starts the local stub model server, then sends chat messages from concurrent
+clients through `CareerAIAssistant.get_response` with an `HTTPBackend`, with
+and without the reply cache. Messages repeat with a skewed distribution, as
+common questions do. Replies that miss the deadline or find every slot busy
+fall back to the rule-based answers and are counted as fallbacks.
+
+Usage: python benchmarks/bench_llm_backend.py [--requests N] [--clients N] [--latency-ms MS]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_assistant import CareerAIAssistant
+from llm_backend import HTTPBackend
+from llm_stub_server import start_in_thread, stub_reply
+
+from bench_intents import synthetic_messages
+
+
+def percentile(sorted_values, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run(base_url: str, messages, args, cache_size: int) -> dict:
+    backend = HTTPBackend(base_url, 'stub', timeout=args.timeout_ms / 1e3, max_concurrency=args.concurrency,
+                          queue_timeout=args.timeout_ms / 1e3, cache_size=cache_size)
+    assistant = CareerAIAssistant(llm_backend=backend)
+
+    def one(message):
+        start = time.perf_counter()
+        reply = assistant.get_response(message, 'bench@example.com')
+        generated = reply['content'] == stub_reply([{'role': 'user', 'content': message}])
+        return time.perf_counter() - start, generated
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(one, messages))
+    elapsed = time.perf_counter() - start
+    backend.close()
+
+    latencies = sorted(r[0] * 1e3 for r in results)
+    return {
+        'rps': len(messages) / elapsed,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'fallbacks': sum(1 for r in results if not r[1]),
+        'stats': backend.stats()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, default=8, help='backend connection/concurrency limit')
+    parser.add_argument('--distinct', type=int, default=60, help='distinct messages in the workload')
+    parser.add_argument('--latency-ms', type=float, default=50, help='stub model latency per reply')
+    parser.add_argument('--timeout-ms', type=float, default=1000, help='backend deadline per reply')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    distinct = synthetic_messages(args.distinct, rng)
+    # Skewed popularity: a few questions make up most of the traffic
+    weights = [1 / (i + 1) for i in range(len(distinct))]
+    messages = rng.choices(distinct, weights=weights, k=args.requests)
+
+    server = start_in_thread(latency=args.latency_ms / 1e3, token_latency=0)
+    print(f"{args.requests} messages ({args.distinct} distinct), {args.clients} clients, "
+          f"stub latency {args.latency_ms:.0f} ms, limit {args.concurrency}")
+    print(f"{'cache':>8}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'upstream':>8}  fallbacks")
+    for label, cache_size in (('off', 0), ('on', 1024)):
+        result = run(server.base_url, messages, args, cache_size)
+        print(f"{label:>8}  {result['rps']:>8.1f}  {result['p50']:>8.1f}  {result['p95']:>8.1f}  "
+              f"{result['p99']:>8.1f}  {result['stats']['requests']:>8}  {result['fallbacks']}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Micro-benchmarks for the storage, extraction and assistant hot paths.
+
+Times single calls of Database/SQLiteDatabase, ResumeProcessor and
+CareerAIAssistant on synthetic data in a throwaway directory. Each operation
+is run in batches sized to take about 0.2s, and the best of --repeat batches
+is reported, which keeps the numbers stable enough to compare with a saved
+baseline.
+
+Usage: python benchmarks/bench_micro.py [--repeat N] [--only SUBSTRING] [--save-baseline [PATH]] [--compare [PATH]]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_assistant import CareerAIAssistant
+from database import Database
+from fixtures import COMPANIES, ROLES, SKILLS, TOPICS, resume_docx, resume_pdf, synthetic_messages, synthetic_resume
+from harness import add_baseline_arguments, check_settings, finish
+from resume_processor import ResumeProcessor
+from sqlite_database import SQLiteDatabase
+
+USERS = 50
+HISTORY = 200
+
+
+def time_op(func: Callable[[], object], repeat: int) -> float:
+    """Best time per call in seconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def database_ops(name: str, db, rng: random.Random) -> List[Tuple[str, Callable[[], object]]]:
+    """Seed `db` with users, resumes and chat histories and return its timed operations"""
+    emails = [f'micro-{i}@example.com' for i in range(USERS)]
+    for email in emails:
+        db.create_user(email, 'Micro User', '')
+        db.save_resume(email, 'resume.pdf', ResumeProcessor.extract_resume_data(synthetic_resume(rng)))
+        for message in synthetic_messages(HISTORY // 2, rng):
+            db.save_chat_message(email, 'user', message)
+            db.save_chat_message(email, 'assistant', 'Noted.')
+    users = itertools.cycle(emails)
+    writer = emails[0]
+    return [
+        (f'{name}.save_chat_message', lambda: db.save_chat_message(writer, 'user', 'How do I prepare for interviews?')),
+        (f'{name}.get_chat_page', lambda: db.get_chat_page(next(users), limit=50)),
+        (f'{name}.get_user', lambda: db.get_user(next(users))),
+        (f'{name}.get_resume', lambda: db.get_resume(next(users))),
+        (f'{name}.get_version', lambda: db.get_version(next(users), 'chat'))
+    ]
+
+
+def extraction_ops(scratch: str, rng: random.Random) -> List[Tuple[str, Callable[[], object]]]:
+    texts = [synthetic_resume(rng) for _ in range(20)]
+    pdf_path = os.path.join(scratch, 'resume.pdf')
+    docx_path = os.path.join(scratch, 'resume.docx')
+    with open(pdf_path, 'wb') as f:
+        f.write(resume_pdf(texts[0]))
+    with open(docx_path, 'wb') as f:
+        f.write(resume_docx(texts[0]))
+    resumes = itertools.cycle(texts)
+    return [
+        ('ResumeProcessor.extract_resume_data', lambda: ResumeProcessor.extract_resume_data(next(resumes))),
+        ('ResumeProcessor.extract_file[pdf]', lambda: ResumeProcessor.extract_file(pdf_path)),
+        ('ResumeProcessor.extract_file[docx]', lambda: ResumeProcessor.extract_file(docx_path))
+    ]
+
+
+def assistant_ops(rng: random.Random) -> List[Tuple[str, Callable[[], object]]]:
+    assistant = CareerAIAssistant()
+    messages = itertools.cycle(synthetic_messages(500, rng))
+    resume = {'extracted_data': ResumeProcessor.extract_resume_data(synthetic_resume(rng)),
+              'provided_skills': ['Go'], 'resume_text': synthetic_resume(rng)}
+    jobs = itertools.cycle([(rng.choice(ROLES), rng.choice(COMPANIES), rng.sample(SKILLS, 3)) for _ in range(100)])
+    profiles = itertools.cycle([(rng.sample(SKILLS, rng.randint(2, 6)), rng.choice(TOPICS)) for _ in range(100)])
+
+    def job_requirements():
+        title, company, skills = next(jobs)
+        return assistant.get_job_requirements(title, company, provided_skills=skills)
+
+    def career_path():
+        skills, interests = next(profiles)
+        return assistant.generate_career_path(skills, interests)
+
+    return [
+        ('IntentMatcher.classify', lambda: assistant.intent_matcher.classify(next(messages))),
+        ('CareerAIAssistant.get_response', lambda: assistant.get_response(next(messages), 'micro@example.com', resume)),
+        ('CareerAIAssistant.get_job_requirements', job_requirements),
+        ('CareerAIAssistant.generate_career_path', career_path)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='timed batches per operation; the best is kept')
+    parser.add_argument('--only', help='run only operations whose name contains this substring')
+    parser.add_argument('--seed', type=int, default=42)
+    add_baseline_arguments(parser, 'micro')
+    args = parser.parse_args(argv)
+
+    settings = {'users': USERS, 'history': HISTORY}
+    check_settings(args.compare, settings)
+
+    rng = random.Random(args.seed)
+    scratch = tempfile.mkdtemp(prefix='bench_micro_')
+    json_db = Database(os.path.join(scratch, 'json'))
+    sqlite_db = SQLiteDatabase(os.path.join(scratch, 'sqlite'))
+    ops = (database_ops('Database', json_db, rng) + database_ops('SQLiteDatabase', sqlite_db, rng)
+           + extraction_ops(scratch, rng) + assistant_ops(rng))
+    if args.only:
+        ops = [(name, func) for name, func in ops if args.only.lower() in name.lower()]
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'operation':<40}  {'us/op':>10}  {'ops/s':>10}")
+    for name, func in ops:
+        seconds = time_op(func, args.repeat)
+        results[name] = {'us': seconds * 1e6, 'ops': 1 / seconds}
+        print(f"{name:<40}  {seconds * 1e6:>10.1f}  {1 / seconds:>10.0f}")
+
+    sqlite_db.close()
+    return finish(args, results, settings)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Startup-time report: import time per module and app construction.
+
+Starts fresh interpreters with `python -X importtime`, each importing app.py,
+building the app with create_app() and serving one request, and reports the
+median time of each phase together with the slowest imports: the repo's own
+modules (cumulative, dependencies included) and third-party packages (summed
+self time).
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--top N] [--config NAME] [--save-baseline [PATH]] [--compare [PATH]]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import add_baseline_arguments, check_settings, finish
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+flask_app.test_client().get('/api/health')
+served = time.perf_counter()
+print(json.dumps({'import app': imported - start, 'create_app': created - imported, 'first request': served - created}))
+"""
+
+
+def local_modules() -> set:
+    return {name[:-3] for name in os.listdir(ROOT) if name.endswith('.py')}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for each line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(config: str, scratch: str) -> Tuple[Dict[str, float], List[Tuple[str, int, int]]]:
+    env = dict(os.environ, APP_CONFIG=config, DATABASE_PATH=os.path.join(scratch, 'data'),
+               UPLOAD_FOLDER=os.path.join(scratch, 'uploads'), PYTHONDONTWRITEBYTECODE='')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', PHASES_SCRIPT], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters; medians are reported')
+    parser.add_argument('--top', type=int, default=15, help='modules listed per table')
+    parser.add_argument('--config', default='development', help='APP_CONFIG for the measured app')
+    add_baseline_arguments(parser, 'startup')
+    args = parser.parse_args(argv)
+
+    settings = {'config': args.config}
+    check_settings(args.compare, settings)
+
+    phases = defaultdict(list)
+    own = defaultdict(list)
+    packages = defaultdict(list)
+    ours = local_modules()
+    scratch = tempfile.mkdtemp(prefix='bench_startup_')
+    # One unmeasured run writes the bytecode caches, as a deployed server would have them
+    run_once(args.config, scratch)
+    for _ in range(args.runs):
+        timings, imports = run_once(args.config, scratch)
+        for phase, seconds in timings.items():
+            phases[phase].append(seconds * 1000)
+        package_totals = defaultdict(int)
+        for name, self_us, cumulative_us in imports:
+            top_level = name.split('.')[0]
+            if top_level in ours:
+                if name == top_level:
+                    own[name].append(cumulative_us / 1000)
+            else:
+                package_totals[top_level] += self_us
+        for name, total_us in package_totals.items():
+            packages[name].append(total_us / 1000)
+
+    results = {phase: {'ms': statistics.median(values)} for phase, values in phases.items()}
+    print(f"Startup phases, median of {args.runs} runs (APP_CONFIG={args.config})")
+    for phase, r in results.items():
+        print(f"  {phase:<14} {r['ms']:>8.1f} ms")
+
+    for title, table in (('Repo modules (cumulative)', own), ('Third-party and stdlib packages (self)', packages)):
+        print(f"\n{title:<40} {'ms':>8}")
+        medians = sorted(((statistics.median(values), name) for name, values in table.items()), reverse=True)
+        for ms, name in medians[:args.top]:
+            print(f"  {name:<38} {ms:>8.1f}")
+
+    return finish(args, results, settings)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
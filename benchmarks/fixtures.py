@@ -0,0 +1,86 @@
+"""Synthetic users, resume files and chat messages for the benchmarks.
+
+Resumes are built as PDF and DOCX files in memory, so the benchmarks exercise
+the same upload and extraction paths as real files without shipping any.
+"""
+import io
+import os
+import random
+import sys
+import textwrap
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from bench_intents import COMPANIES, ROLES, TOPICS, synthetic_messages
+from bench_resume_extraction import SKILLS, synthetic_resume
+
+__all__ = ['COMPANIES', 'ROLES', 'SKILLS', 'TOPICS', 'synthetic_messages', 'synthetic_resume', 'synthetic_users',
+           'resume_pdf', 'resume_docx', 'resume_files']
+
+PDF_LINES_PER_PAGE = 50
+
+
+def synthetic_users(count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    """(email, name) pairs"""
+    return [(f'bench-user-{i}@example.com', f'Bench User {rng.randint(1, 10 ** 6)}') for i in range(count)]
+
+
+def _pdf_string(line: str) -> str:
+    escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return f'({escaped})'
+
+
+def resume_pdf(text: str) -> bytes:
+    """Minimal PDF with the text set in Helvetica, one line per text row"""
+    lines = []
+    for line in text.split('\n'):
+        lines.extend(textwrap.wrap(line, 95) or [''])
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>"
+    ]
+    for i, page in enumerate(pages):
+        stream = 'BT /F1 10 Tf 50 760 Td 14 TL ' + ' '.join(f'{_pdf_string(line)} Tj T*' for line in page) + ' ET'
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R '
+                       f'/Resources << /Font << /F1 {font_id} 0 R >> >> >>')
+        objects.append(f'<< /Length {len(stream.encode("latin-1"))} >>\nstream\n{stream}\nendstream')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    return bytes(out)
+
+
+def resume_docx(text: str) -> bytes:
+    """DOCX with one paragraph per line"""
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def resume_files(count: int, rng: random.Random) -> List[Tuple[str, bytes]]:
+    """(filename, content) resumes alternating between PDF and DOCX"""
+    files = []
+    for i in range(count):
+        text = synthetic_resume(rng)
+        if i % 2 == 0:
+            files.append((f'resume_{i}.pdf', resume_pdf(text)))
+        else:
+            files.append((f'resume_{i}.docx', resume_docx(text)))
+    return files
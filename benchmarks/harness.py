@@ -0,0 +1,120 @@
+"""Shared helpers for the benchmark scripts: latency summaries and saved baselines.
+
+A baseline is a JSON file with the metrics of an earlier run. Comparing a new
+run against it flags every metric that got worse by more than a tolerance, so
+a change can be checked offline against numbers from the same machine.
+
+The baselines in benchmarks/baselines/ are the default --compare targets.
+Each records the machine, Python version and settings it was taken with.
+When running on different hardware, re-record them first with
+--save-baseline before comparing.
+"""
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Metric direction; metrics in neither set (counts, errors) are reported but not compared
+LOWER_IS_BETTER = {'p50', 'p95', 'p99', 'us', 'ms'}
+HIGHER_IS_BETTER = {'rps', 'ops'}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def latency_summary(latencies_ms: List[float], elapsed: float) -> Dict[str, float]:
+    """Count, throughput over `elapsed` seconds and p50/p95/p99 latency in milliseconds"""
+    values = sorted(latencies_ms)
+    return {
+        'count': len(values),
+        'rps': len(values) / elapsed if elapsed else 0.0,
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99)
+    }
+
+
+def add_baseline_arguments(parser, name: str):
+    default = os.path.join(BASELINE_DIR, f'{name}.json')
+    parser.add_argument('--save-baseline', nargs='?', const=default, metavar='PATH',
+                        help=f'save this run as a baseline (default {os.path.relpath(default)})')
+    parser.add_argument('--compare', nargs='?', const=default, metavar='PATH',
+                        help='compare against a saved baseline; exits with status 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative change counted as a regression (default 0.2 = 20%%)')
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], settings: Dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'machine': platform.platform(),
+            'settings': settings,
+            'results': results
+        }, f, indent=2, sort_keys=True)
+    print(f"Saved baseline to {path}")
+
+
+def compare_baseline(path: str, results: Dict[str, Dict[str, float]], tolerance: float = 0.2) -> List[str]:
+    """Print relative changes against a baseline and return the regressions"""
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nCompared with baseline {path} ({baseline.get('created_at')}, settings {baseline.get('settings')})")
+    regressions = []
+    for name, metrics in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"  {name}: not in baseline")
+            continue
+        changes = []
+        for metric, value in metrics.items():
+            old = before.get(metric)
+            if not old or (metric not in LOWER_IS_BETTER and metric not in HIGHER_IS_BETTER):
+                continue
+            change = (value - old) / old
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            changes.append(f"{metric} {change:+.0%}{' !' if worse else ''}")
+            if worse:
+                regressions.append(f"{name} {metric}: {old:.4g} -> {value:.4g} ({change:+.0%})")
+        print(f"  {name}: {', '.join(changes)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+    else:
+        print(f"No regressions beyond {tolerance:.0%}")
+    return regressions
+
+
+def finish(args, results: Dict[str, Dict[str, float]], settings: Dict) -> int:
+    """Handle --save-baseline/--compare; returns the process exit status"""
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(f"No baseline at {args.compare}; run with --save-baseline first")
+            status = 2
+        elif compare_baseline(args.compare, results, args.tolerance):
+            status = 1
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, settings)
+    return status
+
+
+def check_settings(path: Optional[str], settings: Dict):
+    """Warn when a baseline was recorded with different benchmark settings"""
+    if not path or not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        recorded = json.load(f).get('settings')
+    if recorded != settings:
+        print(f"Warning: baseline settings {recorded} differ from this run's {settings}")
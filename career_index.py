@@ -0,0 +1,177 @@
+"""Precomputed career catalog for vectorized career-path scoring.
+
+The catalog is flattened once into NumPy arrays: a sparse career x skill
+matrix (one entry per required skill of each career) and career x word
+incidences for the interest keywords. Scoring a user is then a handful of
+array operations whose cost grows with the number of matrix entries, not with
+careers x skills x user skills Python loops.
+"""
+import difflib
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# Same cutoff the scorer used with difflib.get_close_matches
+FUZZY_CUTOFF = 0.8
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _padded_bigrams(text: str) -> Set[str]:
+    # Two strings with a SequenceMatcher ratio >= 0.8 always share at least
+    # one padded bigram, so the index never drops a fuzzy match
+    return _bigrams(f'\0{text}\0')
+
+
+class CareerIndex:
+    """Career x skill matrix and n-gram indexes built once from CAREER_PATHS.
+
+    `score(skills, interest_text)` returns exactly the scores of the original
+    nested-loop scorer: for every required skill, the first user skill that
+    matches it by inclusion scores 2 or by a close word scores 1, and each of
+    the career name and description scores 1 when one of its words appears in
+    the interests.
+    """
+
+    def __init__(self, career_paths: Dict[str, Dict]):
+        self.careers = list(career_paths)
+        self.details = [career_paths[c] for c in self.careers]
+
+        # Unique required skills (lowercased) and the sparse career x skill matrix
+        self.skills: List[str] = []
+        skill_ids: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, details in enumerate(self.details):
+            for req in details.get('skills', []):
+                req_low = req.lower()
+                if req_low not in skill_ids:
+                    skill_ids[req_low] = len(self.skills)
+                    self.skills.append(req_low)
+                rows.append(row)
+                cols.append(skill_ids[req_low])
+        self.skill_rows = np.array(rows, dtype=np.int64)
+        self.skill_cols = np.array(cols, dtype=np.int64)
+        self._skill_ids = skill_ids
+        self._max_skill_len = max(map(len, self.skills), default=0)
+
+        # Inclusion lookups: bigram -> skills containing it (for "user in req"),
+        # single characters for one-letter user skills
+        self._skill_bigrams = defaultdict(set)
+        self._skill_chars = defaultdict(set)
+        for sid, req_low in enumerate(self.skills):
+            for gram in _bigrams(req_low):
+                self._skill_bigrams[gram].add(sid)
+            for ch in req_low:
+                self._skill_chars[ch].add(sid)
+
+        # Fuzzy lookups: the words of each required skill, indexed by padded bigram
+        self._words: List[str] = []
+        word_ids: Dict[str, int] = {}
+        self._word_skills = defaultdict(list)
+        for sid, req_low in enumerate(self.skills):
+            for word in req_low.split():
+                if word not in word_ids:
+                    word_ids[word] = len(self._words)
+                    self._words.append(word)
+                self._word_skills[word_ids[word]].append(sid)
+        self._word_grams = defaultdict(set)
+        for wid, word in enumerate(self._words):
+            for gram in _padded_bigrams(word):
+                self._word_grams[gram].add(wid)
+
+        # Interest keywords: career x word incidences for names and descriptions
+        self.keywords: List[str] = []
+        keyword_ids: Dict[str, int] = {}
+
+        def incidences(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+            rows, cols = [], []
+            for row, text in enumerate(texts):
+                for word in set(text.lower().split()):
+                    if word not in keyword_ids:
+                        keyword_ids[word] = len(self.keywords)
+                        self.keywords.append(word)
+                    rows.append(row)
+                    cols.append(keyword_ids[word])
+            return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+
+        self.name_rows, self.name_cols = incidences(self.careers)
+        self.desc_rows, self.desc_cols = incidences([d.get('description', '') for d in self.details])
+
+    def _including(self, user_low: str) -> Set[int]:
+        """Skill ids where the user skill contains the required skill or vice versa"""
+        # req in user: every substring of the user skill, up to the longest known skill, that is a known skill
+        found = set()
+        n = len(user_low)
+        for i in range(n):
+            for j in range(i + 1, min(n, i + self._max_skill_len) + 1):
+                sid = self._skill_ids.get(user_low[i:j])
+                if sid is not None:
+                    found.add(sid)
+        # user in req: candidates share all of the user skill's bigrams
+        grams = _bigrams(user_low)
+        if grams:
+            candidates = set.intersection(*(self._skill_bigrams.get(g, set()) for g in grams))
+        else:
+            candidates = self._skill_chars.get(user_low, set())
+        found.update(sid for sid in candidates if user_low in self.skills[sid])
+        return found
+
+    def _close(self, user_low: str) -> Set[int]:
+        """Skill ids having a word within the fuzzy cutoff of the user skill"""
+        candidates = set()
+        for gram in _padded_bigrams(user_low):
+            candidates.update(self._word_grams.get(gram, ()))
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(user_low)
+        found = set()
+        for wid in candidates:
+            # Same checks, in the same order, as difflib.get_close_matches
+            matcher.set_seq1(self._words[wid])
+            if (matcher.real_quick_ratio() >= FUZZY_CUTOFF and matcher.quick_ratio() >= FUZZY_CUTOFF
+                    and matcher.ratio() >= FUZZY_CUTOFF):
+                found.update(self._word_skills[wid])
+        return found
+
+    def score(self, skills: List[str], interest_text: str) -> np.ndarray:
+        """Score every career for the (normalized) user skills and lowercased interests"""
+        scores = np.zeros(len(self.careers), dtype=np.int64)
+
+        user_skills = [s.lower() for s in skills]
+        if user_skills and self.skills:
+            # match[u, r]: 2 for inclusion, 1 for a close word, 0 otherwise
+            match = np.zeros((len(user_skills), len(self.skills)), dtype=np.int8)
+            for u, user_low in enumerate(user_skills):
+                if not user_low:
+                    continue
+                close = self._close(user_low)
+                if close:
+                    match[u, list(close)] = 1
+                including = self._including(user_low)
+                if including:
+                    match[u, list(including)] = 2
+            # Each required skill is scored by the first user skill matching it
+            first = np.argmax(match > 0, axis=0)
+            skill_score = match[first, np.arange(len(self.skills))].astype(np.int64)
+            scores += np.bincount(self.skill_rows, weights=skill_score[self.skill_cols],
+                                  minlength=len(self.careers)).astype(np.int64)
+
+        if interest_text and self.keywords:
+            hit = np.fromiter((word in interest_text for word in self.keywords), dtype=bool, count=len(self.keywords))
+            for rows, cols in ((self.name_rows, self.name_cols), (self.desc_rows, self.desc_cols)):
+                matched = np.zeros(len(self.careers), dtype=bool)
+                matched[rows[hit[cols]]] = True
+                scores += matched
+        return scores
+
+    def top(self, scores: np.ndarray, k: int) -> List[int]:
+        """Indices of the k best careers, highest score first, ties in catalog order"""
+        # One key orders by score descending, then catalog position
+        key = -scores * len(scores) + np.arange(len(scores))
+        if k < len(scores):
+            candidates = np.argpartition(key, k)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(key[candidates])].tolist()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -8,15 +9,60 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=30)
     
     # Database
-    DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'data')
+    DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(os.path.dirname(__file__), 'data')
+    DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE') or 'json'  # 'json' or 'sqlite'
+    DATABASE_GROUP_COMMIT_MS = float(os.environ.get('DATABASE_GROUP_COMMIT_MS') or 0)  # 0 disables group commit
     
     # File upload
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.path.dirname(__file__), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+    RESUME_MAX_PDF_PAGES = int(os.environ.get('RESUME_MAX_PDF_PAGES') or 20)
+    RESUME_MAX_TEXT_CHARS = int(os.environ.get('RESUME_MAX_TEXT_CHARS') or 100000)
+    
+    # Background resume processing (clients opt in per upload with ?async=1)
+    RESUME_ASYNC_UPLOADS = os.environ.get('RESUME_ASYNC_UPLOADS', '').lower() in ('1', 'true', 'yes')
+    RESUME_JOB_WORKERS = int(os.environ.get('RESUME_JOB_WORKERS') or 2)
+    RESUME_JOB_QUEUE_SIZE = int(os.environ.get('RESUME_JOB_QUEUE_SIZE') or 32)
+    
+    # ASGI serving mode (asgi_app.py): threads for blocking storage calls, processes for resume extraction
+    ASYNC_IO_THREADS = int(os.environ.get('ASYNC_IO_THREADS') or 64)
+    ASYNC_EXTRACTION_WORKERS = int(os.environ.get('ASYNC_EXTRACTION_WORKERS') or 2)
+    
+    # Per-user chat context: 'memory' (per process) or 'sqlite' (shared by every worker process)
+    SESSION_STORE = os.environ.get('SESSION_STORE') or 'memory'
+    SESSION_MAX_USERS = int(os.environ.get('SESSION_MAX_USERS') or 10000)
+    SESSION_TTL_SECONDS = int(os.environ.get('SESSION_TTL_SECONDS') or 3600)
+    
+    # Model server for generated chat replies (OpenAI-compatible); unset keeps the rule-based replies
+    LLM_BASE_URL = os.environ.get('LLM_BASE_URL') or ''
+    LLM_MODEL = os.environ.get('LLM_MODEL') or 'gpt-3.5-turbo'
+    LLM_API_KEY = os.environ.get('LLM_API_KEY') or os.environ.get('OPENAI_API_KEY') or ''
+    LLM_TIMEOUT_SECONDS = float(os.environ.get('LLM_TIMEOUT_SECONDS') or 10)  # whole reply, then fall back
+    LLM_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('LLM_CONNECT_TIMEOUT_SECONDS') or 2)
+    LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY') or 8)
+    LLM_CACHE_SIZE = int(os.environ.get('LLM_CACHE_SIZE') or 1024)
+    LLM_CACHE_TTL_SECONDS = int(os.environ.get('LLM_CACHE_TTL_SECONDS') or 3600)
+    
+    # Prometheus-style metrics at /api/metrics (per process)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Request profiling (profiler.py), off unless a sample rate or slow threshold is set
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE') or 0)  # fraction of requests run under cProfile
+    PROFILE_SLOW_MS = float(os.environ.get('PROFILE_SLOW_MS') or 0)  # stack-sample requests running longer than this
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(os.path.dirname(__file__), 'profiles')
+    PROFILE_MAX_CAPTURES = int(os.environ.get('PROFILE_MAX_CAPTURES') or 200)
+    PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS') or 10)
+    # Sent as X-Profile-Token, along with a JWT, to list captures at /api/profiles; unset keeps them CLI-only
+    PROFILE_ACCESS_TOKEN = os.environ.get('PROFILE_ACCESS_TOKEN') or ''
     
     # API Settings
     CORS_HEADERS = 'Content-Type'
+    # Browser cache lifetime for the static career endpoints; clients revalidate with ETags afterwards
+    STATIC_CONTENT_MAX_AGE = int(os.environ.get('STATIC_CONTENT_MAX_AGE') or 300)
+    # Largest skill list accepted by /api/career/generate-path
+    CAREER_MAX_SKILLS = int(os.environ.get('CAREER_MAX_SKILLS') or 100)
+    CAREER_MAX_SKILL_LENGTH = int(os.environ.get('CAREER_MAX_SKILL_LENGTH') or 100)
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -30,3 +76,19 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     DATABASE_PATH = ':memory:'
+    DATABASE_ENGINE = 'sqlite'  # the JSON engine has no in-memory mode
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(tempfile.gettempdir(), 'vidyaguide-test-uploads')
+
+# Config classes by name, selected with the APP_CONFIG environment variable
+CONFIGS = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig
+}
+
+def get_config(name=None):
+    """The config class called `name`, by default the one named by APP_CONFIG"""
+    name = (name or os.environ.get('APP_CONFIG') or 'development').lower()
+    if name not in CONFIGS:
+        raise ValueError(f"Unknown config '{name}'; expected one of: {', '.join(CONFIGS)}")
+    return CONFIGS[name]
@@ -1,116 +1,663 @@
+import copy
+import hashlib
 import json
 import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Chat index layout: an 8-byte base sequence number followed by one 8-byte
+# log offset per message. The base moves forward when a history is cleared.
+_INDEX_ENTRY = struct.Struct('<Q')
+
+# Version file layout: the [counter, modified timestamp] of one user's profile
+# or resume, mirroring the version stored in the record
+_VERSION_ENTRY = struct.Struct('<Qd')
+
+
+@contextmanager
+def exclusive_lock(f):
+    """Hold an exclusive cross-process lock on an open file"""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return
+    # msvcrt locks a byte range starting at the current position
+    position = f.tell()
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            break
+        except OSError:
+            continue
+    f.seek(position)
+    try:
+        yield f
+    finally:
+        position = f.tell()
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.seek(position)
+
+
+def try_exclusive_lock(f) -> bool:
+    """Take an exclusive cross-process lock on an open file without waiting.
+    
+    Returns False when another open file holds it. The lock lasts until the
+    file is closed, which the OS also does when the holding process dies.
+    """
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def atomic_write_json(filepath: str, data: Any, indent: Optional[int] = 2):
+    """Write JSON to a temp file, fsync it and rename it over the target.
+    
+    Readers see either the old or the new document, never a truncated one.
+    """
+    directory = os.path.dirname(filepath) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(filepath) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def resume_record(filename: str, extracted_data: Dict, provided_qualifications: Optional[list] = None,
+                  provided_skills: Optional[list] = None, analysis: Optional[Dict] = None) -> Dict:
+    """Build the stored form of a resume"""
+    record = {
+        'filename': filename,
+        'uploaded_at': datetime.now().isoformat(),
+        'extracted_data': extracted_data,
+        'provided_qualifications': provided_qualifications or [],
+        'provided_skills': provided_skills or []
+    }
+    record.update(analysis or {})
+    return record
+
+
+class _PendingUpdate:
+    """A mutation queued for the next group commit"""
+    
+    __slots__ = ('mutate', 'result', 'error', 'done')
+    
+    def __init__(self, mutate: Callable[[Dict], Any]):
+        self.mutate = mutate
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class _CommitQueue:
+    """Per-file group-commit state"""
+    
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.pending = []
+        self.leader_active = False
 
 class Database:
     """Simple JSON-based database for user data and chat history"""
     
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, cache_max_bytes: int = 64 * 1024 * 1024, group_commit_ms: float = 0,
+                 read_only: bool = False):
         self.database_path = database_path
         self.users_file = os.path.join(database_path, 'users.json')
         self.chats_file = os.path.join(database_path, 'chats.json')
         self.resumes_file = os.path.join(database_path, 'resumes.json')
+        self.chats_dir = os.path.join(database_path, 'chats')
+        self.extractions_dir = os.path.join(database_path, 'extractions')
+        self.versions_dir = os.path.join(database_path, 'versions')
+        
+        # Versions bumped by the update being applied on this thread, written
+        # to their version files once the document itself is written
+        self._version_bumps = threading.local()
         
+        # Group commit: when > 0, updates to the same file arriving within
+        # this window are applied together and written with a single fsync
+        self.group_commit_ms = group_commit_ms
+        self._commit_queues = {}
+        self._commit_queues_lock = threading.Lock()
+        
+        # Parsed-document cache: path -> (file signature, size, document)
+        self.cache_max_bytes = cache_max_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # A read-only reader (such as the SQLite migration) opens an existing
+        # directory as it is, without creating files or importing chats.json
+        if read_only:
+            return
         os.makedirs(database_path, exist_ok=True)
+        os.makedirs(self.extractions_dir, exist_ok=True)
+        os.makedirs(self.versions_dir, exist_ok=True)
         self._initialize_files()
+        self._initialize_chat_logs()
     
     def _initialize_files(self):
         """Initialize JSON files if they don't exist"""
-        if not os.path.exists(self.users_file):
-            self._write_json(self.users_file, {})
-        if not os.path.exists(self.chats_file):
-            self._write_json(self.chats_file, {})
-        if not os.path.exists(self.resumes_file):
-            self._write_json(self.resumes_file, {})
-    
-    def _read_json(self, filepath: str) -> Dict:
-        """Read JSON file"""
+        for filepath in (self.users_file, self.chats_file, self.resumes_file):
+            if not os.path.exists(filepath):
+                with self._file_lock(filepath):
+                    if not os.path.exists(filepath):
+                        self._write_json(filepath, {})
+    
+    def _initialize_chat_logs(self):
+        """Create the chat log directory, importing the legacy chats.json once"""
+        if os.path.isdir(self.chats_dir):
+            return
+        # Workers starting together take turns; the first one imports, and
+        # the others find the directory in place once they get the lock
+        with self._file_lock(self.chats_file):
+            if os.path.isdir(self.chats_dir):
+                return
+            tmp_dir = tempfile.mkdtemp(prefix='chats.importing.', dir=self.database_path)
+            try:
+                for user_email, messages in self._read_json(self.chats_file, cached=False).items():
+                    log_path, index_path = self._chat_log_paths(user_email, tmp_dir)
+                    with open(log_path, 'wb') as log, open(index_path, 'wb') as index:
+                        index.write(_INDEX_ENTRY.pack(0))
+                        for message in messages:
+                            index.write(_INDEX_ENTRY.pack(log.tell()))
+                            log.write(self._encode_chat_record(message))
+                os.chmod(tmp_dir, 0o755)
+                os.replace(tmp_dir, self.chats_dir)
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+    
+    @staticmethod
+    def _file_signature(filepath: str) -> Optional[tuple]:
+        """Return a signature that changes whenever the file is rewritten"""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+    
+    def _cache_put(self, filepath: str, signature: Optional[tuple], data: Dict):
+        """Store a parsed document, evicting least recently used entries"""
+        with self._cache_lock:
+            old = self._cache.pop(filepath, None)
+            if old:
+                self._cache_bytes -= old[1]
+            if signature is not None and signature[1] <= self.cache_max_bytes:
+                self._cache[filepath] = (signature, signature[1], data)
+                self._cache_bytes += signature[1]
+            while self._cache_bytes > self.cache_max_bytes:
+                _, (_, evicted_size, _) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted_size
+    
+    def cache_stats(self) -> Dict:
+        """Return read-cache counters"""
+        with self._cache_lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'entries': len(self._cache),
+                'bytes': self._cache_bytes
+            }
+    
+    def _read_json(self, filepath: str, cached: bool = True) -> Dict:
+        """Read JSON file.
+        
+        Cached documents are shared between callers and must not be mutated;
+        read-modify-write paths pass cached=False to get a private copy.
+        """
+        start = time.perf_counter()
+        name = os.path.basename(filepath)
+        signature = self._file_signature(filepath)
+        if cached and signature is not None:
+            with self._cache_lock:
+                entry = self._cache.get(filepath)
+                if entry and entry[0] == signature:
+                    self._cache.move_to_end(filepath)
+                    self.cache_hits += 1
+                    metrics.DB_READ_SECONDS.observe(time.perf_counter() - start, name, 'cache')
+                    return entry[2]
+                self.cache_misses += 1
         try:
             with open(filepath, 'r') as f:
-                return json.load(f)
-        except:
+                data = json.load(f)
+        except FileNotFoundError:
             return {}
+        if cached:
+            self._cache_put(filepath, signature, data)
+        metrics.DB_READ_SECONDS.observe(time.perf_counter() - start, name, 'disk')
+        if signature is not None:
+            metrics.DB_READ_BYTES.inc(name, amount=signature[1])
+        return data
     
     def _write_json(self, filepath: str, data: Dict):
-        """Write JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Atomically replace a JSON file; callers must hold its file lock"""
+        start = time.perf_counter()
+        try:
+            atomic_write_json(filepath, data)
+        except BaseException:
+            self._cache_put(filepath, None, {})
+            raise
+        # The written document becomes the cached copy, so the caller must not
+        # mutate it any further
+        signature = self._file_signature(filepath)
+        self._cache_put(filepath, signature, data)
+        name = os.path.basename(filepath)
+        metrics.DB_WRITE_SECONDS.observe(time.perf_counter() - start, name)
+        if signature is not None:
+            metrics.DB_WRITE_BYTES.inc(name, amount=signature[1])
+    
+    @contextmanager
+    def _file_lock(self, filepath: str):
+        """Serialise writers to a JSON document across threads and processes"""
+        with open(filepath + '.lock', 'a') as lock_file:
+            with exclusive_lock(lock_file):
+                yield
+    
+    def _update_json(self, filepath: str, mutate: Callable[[Dict], Any]) -> Any:
+        """Apply `mutate` to the latest version of a document and persist it.
+        
+        The read-modify-write happens under the file lock, so concurrent
+        writers in other processes cannot lose each other's updates.
+        """
+        if self.group_commit_ms > 0:
+            return self._group_commit(filepath, mutate)
+        with self._file_lock(filepath):
+            data = self._read_json(filepath, cached=False)
+            self._version_bumps.pending = []
+            result = mutate(data)
+            self._write_json(filepath, data)
+            self._write_versions()
+        return result
+    
+    def _group_commit(self, filepath: str, mutate: Callable[[Dict], Any]) -> Any:
+        """Queue an update; one leader thread writes a batch of them at once"""
+        with self._commit_queues_lock:
+            queue = self._commit_queues.setdefault(filepath, _CommitQueue())
+        
+        update = _PendingUpdate(mutate)
+        with queue.cond:
+            queue.pending.append(update)
+            # Wait until a leader commits this update, or until there is no
+            # leader and this thread takes over
+            while queue.leader_active and not update.done:
+                queue.cond.wait()
+            leading = not update.done
+            if leading:
+                queue.leader_active = True
+        
+        if leading:
+            # Lead one batch, which includes this thread's own update, then
+            # hand over to a waiting thread so this request can return
+            try:
+                time.sleep(self.group_commit_ms / 1000.0)
+                with queue.cond:
+                    batch, queue.pending = queue.pending, []
+                self._commit_batch(filepath, batch)
+            finally:
+                with queue.cond:
+                    queue.leader_active = False
+                    queue.cond.notify_all()
+        
+        if update.error is not None:
+            raise update.error
+        return update.result
+    
+    def _commit_batch(self, filepath: str, batch: List[_PendingUpdate]):
+        """Apply a batch of updates and write the document once.
+        
+        An update that raises may have changed the document part-way, so the
+        batch is replayed on a fresh copy without it until every remaining
+        update applies cleanly; only that document is written.
+        """
+        try:
+            with self._file_lock(filepath):
+                applied = batch
+                while True:
+                    data = self._read_json(filepath, cached=False)
+                    self._version_bumps.pending = []
+                    for update in applied:
+                        try:
+                            update.result = update.mutate(data)
+                        except Exception as e:
+                            update.error = e
+                    succeeded = [update for update in applied if update.error is None]
+                    if len(succeeded) == len(applied):
+                        break
+                    applied = succeeded
+                self._write_json(filepath, data)
+                self._write_versions()
+        except Exception as e:
+            for update in batch:
+                update.error = update.error or e
+        finally:
+            for update in batch:
+                update.done = True
     
     # User operations
     def create_user(self, email: str, name: str, password_hash: str) -> bool:
         """Create a new user"""
-        users = self._read_json(self.users_file)
-        if email in users:
-            return False
-        
-        users[email] = {
-            'email': email,
-            'name': name,
-            'password_hash': password_hash,
-            'created_at': datetime.now().isoformat(),
-            'resume': None
-        }
-        self._write_json(self.users_file, users)
-        return True
+        def create(users: Dict) -> bool:
+            if email in users:
+                return False
+            users[email] = {
+                'email': email,
+                'name': name,
+                'password_hash': password_hash,
+                'created_at': datetime.now().isoformat(),
+                'resume': None
+            }
+            self._bump_version(users[email], email, 'profile')
+            return True
+        
+        return self._update_json(self.users_file, create)
     
     def get_user(self, email: str) -> Optional[Dict]:
         """Get user by email"""
         users = self._read_json(self.users_file)
-        return users.get(email)
+        return copy.deepcopy(users.get(email))
     
     def update_user(self, email: str, data: Dict) -> bool:
         """Update user data"""
-        users = self._read_json(self.users_file)
-        if email not in users:
-            return False
-        users[email].update(data)
-        self._write_json(self.users_file, users)
-        return True
+        if data.get('email', email) != email:
+            raise ValueError("A user's email cannot be changed")
+        
+        def update(users: Dict) -> bool:
+            if email not in users:
+                return False
+            users[email].update(data)
+            self._bump_version(users[email], email, 'profile')
+            return True
+        
+        return self._update_json(self.users_file, update)
     
     # Chat operations
+    #
+    # Each user has an append-only JSON-lines log plus a fixed-width offset
+    # index, so saving a message writes one record and reading a page seeks
+    # straight to its records without parsing anything else. A message's id
+    # is the index base plus its 1-based position, so ids only ever grow,
+    # also across clears.
+    def _chat_log_paths(self, user_email: str, chats_dir: Optional[str] = None):
+        """Return the (log, index) paths for a user's chat history"""
+        key = hashlib.sha1(user_email.encode('utf-8')).hexdigest()
+        base = os.path.join(chats_dir or self.chats_dir, key)
+        return base + '.jsonl', base + '.idx'
+    
+    @staticmethod
+    def _encode_chat_record(message: Dict) -> bytes:
+        return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+    
     def save_chat_message(self, user_email: str, role: str, content: str, resume_context: Optional[str] = None) -> Dict:
         """Save a chat message"""
-        chats = self._read_json(self.chats_file)
-        
-        if user_email not in chats:
-            chats[user_email] = []
-        
         message = {
             'role': role,
             'content': content,
             'timestamp': datetime.now().isoformat(),
             'resume_context': resume_context
         }
-        chats[user_email].append(message)
-        self._write_json(self.chats_file, chats)
-        return message
+        record = self._encode_chat_record(message)
+        log_path, index_path = self._chat_log_paths(user_email)
+        
+        with open(index_path, 'a+b') as index, exclusive_lock(index):
+            with open(log_path, 'ab') as log:
+                index.seek(0)
+                base_entry = index.read(_INDEX_ENTRY.size)
+                if not base_entry:
+                    base_entry = _INDEX_ENTRY.pack(0)
+                    index.write(base_entry)
+                    index.flush()
+                (base,) = _INDEX_ENTRY.unpack(base_entry)
+                count = os.fstat(index.fileno()).st_size // _INDEX_ENTRY.size - 1
+                # The index is only extended once the record is on disk, so a
+                # torn append leaves an unindexed tail that readers never see
+                offset = log.tell()
+                log.write(record)
+                log.flush()
+                index.write(_INDEX_ENTRY.pack(offset))
+        return dict(message, id=base + count + 1)
     
     def get_chat_history(self, user_email: str, limit: int = 50) -> List[Dict]:
         """Get chat history for a user"""
-        chats = self._read_json(self.chats_file)
-        messages = chats.get(user_email, [])
-        return messages[-limit:]
+        return self.get_chat_page(user_email, limit)['messages']
+    
+    def get_chat_page(self, user_email: str, limit: int = 50, since: Optional[int] = None, before: Optional[int] = None) -> Dict:
+        """Get a page of chat messages, oldest first, and whether more exist.
+        
+        `since` returns the first `limit` messages after that id (incremental
+        sync), `before` the last `limit` messages before it (scrolling back),
+        and neither the latest `limit` messages. A zero limit means no limit.
+        """
+        log_path, index_path = self._chat_log_paths(user_email)
+        try:
+            with open(index_path, 'rb') as index:
+                base_entry = index.read(_INDEX_ENTRY.size)
+                if len(base_entry) < _INDEX_ENTRY.size:
+                    return {'messages': [], 'has_more': False}
+                (base,) = _INDEX_ENTRY.unpack(base_entry)
+                count = os.fstat(index.fileno()).st_size // _INDEX_ENTRY.size - 1
+                
+                # Positions [start, end) of the page within the current log
+                if since is not None:
+                    start = min(count, max(0, since - base))
+                    end = count if limit <= 0 else min(count, start + limit)
+                    has_more = end < count
+                else:
+                    end = count if before is None else min(count, max(0, before - base - 1))
+                    start = 0 if limit <= 0 else max(0, end - limit)
+                    has_more = start > 0
+                if start >= end:
+                    return {'messages': [], 'has_more': has_more}
+                
+                # One extra offset bounds the last record, so only the page is read
+                wanted = end - start + (1 if end < count else 0)
+                index.seek((1 + start) * _INDEX_ENTRY.size)
+                offsets = struct.unpack(f'<{wanted}Q', index.read(wanted * _INDEX_ENTRY.size))
+            with open(log_path, 'rb') as log:
+                log.seek(offsets[0])
+                block = log.read(offsets[-1] - offsets[0]) if end < count else log.read()
+            # Slice by offset rather than by line so an unindexed torn record
+            # between two appends is skipped
+            messages = []
+            for position, offset in zip(range(start, end), offsets):
+                record = offset - offsets[0]
+                message = json.loads(block[record:block.index(b'\n', record)])
+                message['id'] = base + position + 1
+                messages.append(message)
+            return {'messages': messages, 'has_more': has_more}
+        except FileNotFoundError:
+            return {'messages': [], 'has_more': False}
+    
+    def clear_chat_history(self, user_email: str) -> bool:
+        """Delete all chat messages for a user"""
+        log_path, index_path = self._chat_log_paths(user_email)
+        try:
+            with open(index_path, 'r+b') as index, exclusive_lock(index):
+                base_entry = index.read(_INDEX_ENTRY.size)
+                if not base_entry:
+                    return True
+                (base,) = _INDEX_ENTRY.unpack(base_entry)
+                count = os.fstat(index.fileno()).st_size // _INDEX_ENTRY.size - 1
+                # Drop the entries before moving the base, so a concurrent
+                # get_version never sees the new base with the old count
+                index.truncate(_INDEX_ENTRY.size)
+                index.seek(0)
+                index.write(_INDEX_ENTRY.pack(base + count))
+                with open(log_path, 'wb'):
+                    pass
+        except FileNotFoundError:
+            pass
+        return True
     
     # Resume operations
-    def save_resume(self, user_email: str, filename: str, extracted_data: Dict, provided_qualifications: Optional[list] = None, provided_skills: Optional[list] = None) -> bool:
-        """Save resume information and any provided qualifications/skills"""
-        resumes = self._read_json(self.resumes_file)
+    def save_resume(self, user_email: str, filename: str, extracted_data: Dict, provided_qualifications: Optional[list] = None, provided_skills: Optional[list] = None, analysis: Optional[Dict] = None) -> bool:
+        """Save resume information and any provided qualifications/skills.
         
-        resumes[user_email] = {
+        `analysis` holds derived fields (extracted text, suggestions and the
+        versions that produced them) stored alongside the record.
+        """
+        self.save_resumes([{
+            'user_email': user_email,
             'filename': filename,
-            'uploaded_at': datetime.now().isoformat(),
             'extracted_data': extracted_data,
-            'provided_qualifications': provided_qualifications or [],
-            'provided_skills': provided_skills or []
+            'provided_qualifications': provided_qualifications,
+            'provided_skills': provided_skills,
+            'analysis': analysis
+        }])
+        return True
+    
+    def save_resumes(self, items: List[Dict]) -> int:
+        """Save a batch of resumes with one write per document.
+        
+        Each item holds `user_email` plus the keyword arguments of save_resume.
+        """
+        records = {
+            item['user_email']: resume_record(item['filename'], item['extracted_data'], item.get('provided_qualifications'),
+                                              item.get('provided_skills'), item.get('analysis'))
+            for item in items
         }
-        self._write_json(self.resumes_file, resumes)
+        if not records:
+            return 0
         
-        # Update user record
-        self.update_user(user_email, {'resume': filename})
-        return True
+        def store_resumes(resumes: Dict):
+            for user_email, record in records.items():
+                # A new upload continues the replaced record's version
+                record['version'] = (resumes.get(user_email) or {}).get('version')
+                self._bump_version(record, user_email, 'resume')
+                resumes[user_email] = record
+        
+        def link_resumes(users: Dict):
+            for user_email, record in records.items():
+                if user_email in users:
+                    users[user_email]['resume'] = record['filename']
+                    self._bump_version(users[user_email], user_email, 'profile')
+        
+        self._update_json(self.resumes_file, store_resumes)
+        self._update_json(self.users_file, link_resumes)
+        return len(records)
+    
+    def update_resume(self, user_email: str, data: Dict) -> bool:
+        """Update fields of an existing resume record"""
+        def update(resumes: Dict) -> bool:
+            if user_email not in resumes:
+                return False
+            resumes[user_email].update(data)
+            self._bump_version(resumes[user_email], user_email, 'resume')
+            return True
+        
+        return self._update_json(self.resumes_file, update)
     
     def get_resume(self, user_email: str) -> Optional[Dict]:
         """Get resume information for a user"""
         resumes = self._read_json(self.resumes_file)
-        return resumes.get(user_email)
+        return copy.deepcopy(resumes.get(user_email))
+    
+    # Version operations
+    #
+    # User and resume records carry a [counter, modified timestamp] version
+    # that every write to them advances, in the same document write. A copy
+    # goes to a small per-user version file once the document is written, so
+    # conditional requests read 16 bytes instead of users.json or
+    # resumes.json; records without one fall back to the document. Chat
+    # versions come from the chat index itself: its base sequence and length
+    # change on every append or clear.
+    def _version_path(self, user_email: str, resource: str) -> str:
+        key = hashlib.sha1(user_email.encode('utf-8')).hexdigest()
+        return os.path.join(self.versions_dir, f'{key}.{resource}')
+    
+    def _bump_version(self, record: Dict, user_email: str, resource: str):
+        """Advance the version stored in a user or resume record"""
+        counter = (record.get('version') or [0])[0]
+        record['version'] = [counter + 1, time.time()]
+        self._version_bumps.pending.append((user_email, resource, record['version']))
+    
+    def _write_versions(self):
+        """Copy the versions bumped by a written update to their version files"""
+        # Still under the document's file lock, so writers of one file never race
+        for user_email, resource, (counter, modified) in self._version_bumps.pending:
+            with open(self._version_path(user_email, resource), 'wb') as f:
+                f.write(_VERSION_ENTRY.pack(counter, modified))
+        self._version_bumps.pending = []
+    
+    def get_version(self, user_email: str, resource: str) -> Optional[Tuple[str, float]]:
+        """Return (version tag, modified timestamp) of a user's resource, or None if unknown"""
+        if resource == 'chat':
+            _, index_path = self._chat_log_paths(user_email)
+            try:
+                with open(index_path, 'rb') as index:
+                    base_entry = index.read(_INDEX_ENTRY.size)
+                    stat = os.fstat(index.fileno())
+            except FileNotFoundError:
+                return None
+            if len(base_entry) < _INDEX_ENTRY.size:
+                return None
+            (base,) = _INDEX_ENTRY.unpack(base_entry)
+            return f'{base}.{stat.st_size // _INDEX_ENTRY.size - 1}', stat.st_mtime
+        
+        filepath = {'profile': self.users_file, 'resume': self.resumes_file}.get(resource)
+        if filepath is None:
+            return None
+        try:
+            with open(self._version_path(user_email, resource), 'rb') as f:
+                entry = f.read(_VERSION_ENTRY.size)
+            if len(entry) == _VERSION_ENTRY.size:
+                counter, modified = _VERSION_ENTRY.unpack(entry)
+                return str(counter), modified
+        except FileNotFoundError:
+            pass
+        entry = (self._read_json(filepath).get(user_email) or {}).get('version')
+        return (str(entry[0]), entry[1]) if entry else None
+    
+    # Extraction cache operations, keyed by the content hash of an uploaded file
+    def _extraction_path(self, content_hash: str) -> str:
+        if not content_hash.isalnum():
+            raise ValueError(f"Invalid content hash: {content_hash}")
+        return os.path.join(self.extractions_dir, f'{content_hash}.json')
+    
+    def get_extraction(self, content_hash: str) -> Optional[Dict]:
+        """Get the cached extraction result for a file's contents"""
+        try:
+            with open(self._extraction_path(content_hash), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def save_extraction(self, content_hash: str, extraction: Dict) -> bool:
+        """Cache the extraction result for a file's contents"""
+        atomic_write_json(self._extraction_path(content_hash), extraction, indent=None)
+        return True
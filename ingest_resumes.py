@@ -0,0 +1,223 @@
+"""Bulk resume ingestion.
+
+Walks a directory of resumes, runs text and data extraction across all cores
+and saves the results in batches, seeding the content-hash extraction cache
+used by web uploads. Every ingested file is recorded by content hash in a
+manifest, so an interrupted run can simply be started again.
+
+Each resume's owner comes from an owners file: a CSV with `path` (relative to
+the directory) and `email` columns. Files without an owner are skipped, and
+accounts that already have a resume keep it unless --overwrite is given, so
+an import never replaces a real user's resume by accident.
+
+Usage: python ingest_resumes.py <directory> --owners FILE [--overwrite] [--workers N] [--batch-size N]
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Set
+
+from werkzeug.utils import secure_filename
+
+from config import Config
+from database import Database
+from resume_processor import ResumeProcessor
+from sqlite_database import SQLiteDatabase
+
+MANIFEST_NAME = 'ingested.jsonl'
+
+# Hashes already ingested, shipped to each pool worker once at start-up
+_known_hashes: Set[str] = set()
+
+
+def _init_worker(known_hashes: Set[str]):
+    global _known_hashes
+    _known_hashes = known_hashes
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def process_one(path: str) -> Dict:
+    """Hash and extract a single resume; runs in a pool worker"""
+    try:
+        content_hash = file_hash(path)
+        if content_hash in _known_hashes:
+            return {'path': path, 'status': 'skipped', 'content_hash': content_hash}
+        extraction = ResumeProcessor.extract_file(path, Config.RESUME_MAX_PDF_PAGES, Config.RESUME_MAX_TEXT_CHARS)
+        return {'path': path, 'status': 'ok', 'content_hash': content_hash, 'extraction': extraction}
+    except Exception as e:
+        return {'path': path, 'status': 'failed', 'error': str(e)}
+
+
+def iter_resume_files(directory: str, extensions) -> Iterator[str]:
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if '.' in name and name.rsplit('.', 1)[1].lower() in extensions:
+                yield os.path.join(root, name)
+
+
+def load_owners(path: str, directory: str) -> Dict[str, str]:
+    """Owner email of each resume file, keyed by normalised path, from a CSV with `path` and `email` columns"""
+    owners = {}
+    with open(path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            owners[os.path.normpath(os.path.join(directory, row['path']))] = row['email'].strip().lower()
+    return owners
+
+
+def load_manifest(path: str) -> Set[str]:
+    hashes = set()
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    hashes.add(json.loads(line)['content_hash'])
+    return hashes
+
+
+class Ingester:
+    """Collects extraction results and saves them through the database in batches"""
+
+    def __init__(self, db, upload_folder: str, manifest_path: str, owners: Dict[str, str], overwrite: bool = False,
+                 batch_size: int = 50):
+        self.db = db
+        self.upload_folder = upload_folder
+        self.manifest_path = manifest_path
+        self.owners = owners
+        self.overwrite = overwrite
+        self.batch_size = batch_size
+        self.batch = []
+        self.claimed = set()
+        self.counts = {'ok': 0, 'skipped': 0, 'failed': 0, 'unowned': 0, 'existing': 0}
+
+    def add(self, result: Dict):
+        if result['status'] == 'failed':
+            self.counts['failed'] += 1
+            print(f"FAILED {result['path']}: {result['error']}", file=sys.stderr)
+        elif result['status'] == 'skipped':
+            self.counts['skipped'] += 1
+        else:
+            self.batch.append(result)
+            if len(self.batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        items = []
+        saved = []
+        for result in self.batch:
+            extraction, content_hash = result['extraction'], result['content_hash']
+            self.db.save_extraction(content_hash, extraction)
+            email = self.owners[os.path.normpath(result['path'])]
+            # One resume per account: keep what is stored, and the first file listed for an owner in this run
+            if not self.overwrite and (email in self.claimed or self.db.get_resume(email) is not None):
+                self.counts['existing'] += 1
+                print(f"KEPT {result['path']}: {email} already has a resume (use --overwrite to replace it)",
+                      file=sys.stderr)
+                continue
+            self.claimed.add(email)
+            saved.append(result)
+            filename = f"{email}_{datetime.now().timestamp()}_{secure_filename(os.path.basename(result['path']))}"
+            # Store the file content-addressed, like a web upload
+            stored_file = f"{content_hash}.{result['path'].rsplit('.', 1)[1].lower()}"
+            stored_path = os.path.join(self.upload_folder, stored_file)
+            if not os.path.exists(stored_path):
+                shutil.copyfile(result['path'], stored_path)
+
+            analyzed = ResumeProcessor.analyze(extraction)
+            items.append({
+                'user_email': email,
+                'filename': filename,
+                'extracted_data': analyzed['extracted_data'],
+                'analysis': dict(analyzed['analysis'], content_hash=content_hash, stored_file=stored_file)
+            })
+        self.db.save_resumes(items)
+        self.counts['ok'] += len(items)
+
+        # Only record hashes once the batch is saved, so a crash re-ingests it;
+        # kept files stay unrecorded so a later --overwrite run picks them up
+        with open(self.manifest_path, 'a') as manifest:
+            for result in saved:
+                manifest.write(json.dumps({
+                    'content_hash': result['content_hash'],
+                    'path': result['path'],
+                    'ingested_at': datetime.now().isoformat()
+                }) + '\n')
+        self.batch = []
+
+
+def ingest(directory: str, db, upload_folder: str, owners: Dict[str, str], overwrite: bool = False,
+           workers: Optional[int] = None, batch_size: int = 50, extensions=Config.ALLOWED_EXTENSIONS) -> Dict:
+    """Ingest every resume under `directory` that has an owner in `owners`; returns counts and timing"""
+    os.makedirs(upload_folder, exist_ok=True)
+    manifest_path = os.path.join(db.database_path, MANIFEST_NAME)
+    known_hashes = load_manifest(manifest_path)
+    ingester = Ingester(db, upload_folder, manifest_path, owners, overwrite=overwrite, batch_size=batch_size)
+    all_paths = list(iter_resume_files(directory, extensions))
+    paths = []
+    for path in all_paths:
+        if os.path.normpath(path) in owners:
+            paths.append(path)
+        else:
+            ingester.counts['unowned'] += 1
+            print(f"SKIPPED {path}: no owner in the owners file", file=sys.stderr)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(known_hashes,)) as executor:
+        for result in executor.map(process_one, paths, chunksize=4):
+            ingester.add(result)
+    ingester.flush()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'files': len(all_paths),
+        **ingester.counts,
+        'seconds': elapsed,
+        'files_per_sec': len(paths) / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-ingest a directory of resumes')
+    parser.add_argument('directory', help='Directory to scan recursively for PDF/DOC/DOCX files')
+    parser.add_argument('--owners', required=True, help='CSV with `path` (relative to the directory) and `email` columns')
+    parser.add_argument('--overwrite', action='store_true', help="replace the resume of accounts that already have one")
+    parser.add_argument('--database-path', default=Config.DATABASE_PATH)
+    parser.add_argument('--engine', choices=('json', 'sqlite'), default=Config.DATABASE_ENGINE)
+    parser.add_argument('--upload-folder', default=Config.UPLOAD_FOLDER)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.engine == 'sqlite':
+        db = SQLiteDatabase(args.database_path)
+    else:
+        db = Database(args.database_path)
+
+    owners = load_owners(args.owners, args.directory)
+    report = ingest(args.directory, db, args.upload_folder, owners, overwrite=args.overwrite, workers=args.workers,
+                    batch_size=args.batch_size)
+    print(f"{report['files']} files in {report['seconds']:.2f}s ({report['files_per_sec']:.1f} files/sec): "
+          f"{report['ok']} ingested, {report['skipped']} already ingested, {report['existing']} kept existing resumes, "
+          f"{report['unowned']} without an owner, {report['failed']} failed")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Model server backends for CareerAIAssistant.
+
+`HTTPBackend` talks to an OpenAI-compatible chat completions endpoint over a
+pooled `requests` session. Concurrent calls are capped, every call has an
+overall deadline, and replies are cached by normalised prompt, so a slow or
+overloaded model server costs a bounded wait before the assistant falls back
+to its rule-based replies.
+"""
+from abc import ABC, abstractmethod
+import json
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from cache import LRUCache
+
+if TYPE_CHECKING:
+    import requests
+
+# Words in any script; the cache key keeps these and drops case, spacing and punctuation
+_WORD_RE = re.compile(r'\w+')
+
+
+class LLMError(Exception):
+    """Raised when the model backend cannot produce a reply in time"""
+
+
+class LLMBackend(ABC):
+    """Interface for model servers answering chat messages.
+
+    `messages` are OpenAI-style dicts with `role` and `content`.
+    """
+
+    @abstractmethod
+    def complete(self, messages: List[Dict[str, str]]) -> str:
+        """Return the whole reply"""
+
+    def stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Yield the reply in fragments; backends without streaming yield it whole"""
+        yield self.complete(messages)
+
+    def stats(self) -> Dict:
+        return {}
+
+    def close(self):
+        pass
+
+
+class HTTPBackend(LLMBackend):
+    """OpenAI-compatible `/chat/completions` client with pooling, limits and a reply cache"""
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None, timeout: float = 20.0,
+                 connect_timeout: float = 2.0, max_concurrency: int = 8, queue_timeout: float = 1.0,
+                 cache_size: int = 1024, cache_ttl: Optional[float] = 3600, max_tokens: int = 512,
+                 temperature: float = 0.2):
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.model = model
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.queue_timeout = queue_timeout
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+
+        # requests is imported here, not with the module, so apps without a model server never load it
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # One keep-alive connection per concurrent call; no retries, the caller falls back instead
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Content-Type'] = 'application/json'
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._counts = {'requests': 0, 'errors': 0, 'timeouts': 0, 'rejected': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def cache_key(self, messages: List[Dict[str, str]]) -> tuple:
+        """Prompts differing only in case, spacing or punctuation share a cached reply"""
+        return (self.model,) + tuple((m['role'], ' '.join(_WORD_RE.findall(m['content'].casefold()))) for m in messages)
+
+    def _post(self, messages: List[Dict[str, str]], stream: bool, deadline: float) -> 'requests.Response':
+        import requests
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': self.max_tokens,
+            'temperature': self.temperature,
+            'stream': stream
+        }
+        self._count('requests')
+        try:
+            response = self.session.post(self.url, data=json.dumps(payload), stream=True,
+                                         timeout=(self.connect_timeout, max(deadline - time.monotonic(), 0.001)))
+        except requests.Timeout as e:
+            self._count('timeouts')
+            raise LLMError(f'Model server timed out: {e}') from e
+        except requests.RequestException as e:
+            self._count('errors')
+            raise LLMError(f'Model server unreachable: {e}') from e
+        if response.status_code != 200:
+            response.close()
+            self._count('errors')
+            raise LLMError(f'Model server returned HTTP {response.status_code}')
+        return response
+
+    def _acquire(self):
+        """Wait briefly for a free slot; callers fall back rather than queue behind slow calls"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count('rejected')
+            raise LLMError('Model server is at its concurrency limit')
+
+    def _check_deadline(self, deadline: float):
+        if time.monotonic() > deadline:
+            self._count('timeouts')
+            raise LLMError(f'Model reply exceeded the {self.timeout}s deadline')
+
+    def complete(self, messages: List[Dict[str, str]]) -> str:
+        import requests
+
+        key = self.cache_key(messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        self._acquire()
+        try:
+            deadline = time.monotonic() + self.timeout
+            with self._post(messages, stream=False, deadline=deadline) as response:
+                body = bytearray()
+                try:
+                    for chunk in response.iter_content(chunk_size=16384):
+                        body += chunk
+                        self._check_deadline(deadline)
+                except requests.RequestException as e:
+                    self._count('timeouts')
+                    raise LLMError(f'Model server timed out: {e}') from e
+        finally:
+            self._slots.release()
+
+        try:
+            content = json.loads(body)['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._count('errors')
+            raise LLMError('Malformed model server response') from e
+        if not content:
+            self._count('errors')
+            raise LLMError('Model server returned an empty reply')
+        self.cache.set(key, content)
+        return content
+
+    def stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        import requests
+
+        key = self.cache_key(messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        self._acquire()
+        try:
+            deadline = time.monotonic() + self.timeout
+            fragments = []
+            with self._post(messages, stream=True, deadline=deadline) as response:
+                try:
+                    # Server-Sent Events: `data: {json}` lines ending with `data: [DONE]`
+                    for line in response.iter_lines():
+                        self._check_deadline(deadline)
+                        if not line.startswith(b'data:'):
+                            continue
+                        data = line[5:].strip()
+                        if data == b'[DONE]':
+                            break
+                        try:
+                            fragment = json.loads(data)['choices'][0]['delta'].get('content')
+                        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                            self._count('errors')
+                            raise LLMError('Malformed model server stream') from e
+                        if fragment:
+                            fragments.append(fragment)
+                            yield fragment
+                except requests.RequestException as e:
+                    self._count('timeouts')
+                    raise LLMError(f'Model server timed out: {e}') from e
+        finally:
+            self._slots.release()
+
+        if not fragments:
+            self._count('errors')
+            raise LLMError('Model server returned an empty reply')
+        self.cache.set(key, ''.join(fragments))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._counts)
+        counts['cache'] = self.cache.stats()
+        return counts
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,131 @@
+"""Local stand-in for an OpenAI-compatible model server.
+
+Answers POST /v1/chat/completions with a deterministic reply built from the
+last user message, either as one JSON body or as a Server-Sent Events stream.
+A configurable delay before the first token and between tokens emulates model
+latency for tests and benchmarks.
+
+Usage: python llm_stub_server.py [--port 8001] [--latency-ms 200] [--token-ms 5]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_reply(messages) -> str:
+    """Deterministic reply for a conversation"""
+    question = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+    return (f"Here is some career advice about: {question.strip()}. "
+            "Focus on the fundamentals, build projects that show your skills, "
+            "and practise explaining your experience clearly.")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/v1/chat/completions':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            messages = request['messages']
+        except (ValueError, KeyError):
+            self._send_json(400, {'error': 'Invalid request'})
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        time.sleep(server.latency)
+        reply = stub_reply(messages)
+        model = request.get('model', 'stub')
+
+        if not request.get('stream'):
+            self._send_json(200, {
+                'object': 'chat.completion',
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}]
+            })
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for token in reply.split(' '):
+            chunk = {'object': 'chat.completion.chunk', 'model': model,
+                     'choices': [{'index': 0, 'delta': {'content': token + ' '}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(server.token_latency)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.2, token_latency: float = 0.005):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.token_latency = token_latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Clients that hit their deadline hang up mid-reply; that is expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_server(host: str = '127.0.0.1', port: int = 0, latency: float = 0.2,
+                token_latency: float = 0.005) -> StubServer:
+    """Bound stub server (port 0 picks a free port); run it with `serve_forever`"""
+    return StubServer((host, port), latency, token_latency)
+
+
+def start_in_thread(**kwargs) -> StubServer:
+    """Start a stub server on a background thread; the base URL is `server.base_url`"""
+    server = make_server(**kwargs)
+    host, port = server.server_address[:2]
+    server.base_url = f'http://{host}:{port}/v1'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--token-ms', type=float, default=5)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency_ms / 1e3, args.token_ms / 1e3)
+    print(f"Stub model server on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
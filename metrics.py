@@ -0,0 +1,279 @@
+"""In-process counters and latency histograms in the Prometheus text format.
+
+Every metric keeps one dict of values per thread. A thread only ever writes
+its own shard, so recording a value takes no lock; a scrape sums the shards.
+Shards of threads that have exited are folded into a running total on the
+next scrape, or as soon as enough shards pile up between scrapes, which keeps
+per-request threads from piling up.
+
+Values are per process. Work done in a pool worker process is carried back
+with `run_collecting` and `merge`.
+"""
+from abc import ABC, abstractmethod
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds, from a cache hit to a slow extraction or model reply
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Shards a metric may hold before a new thread's first write folds in those of exited threads
+SHARD_PRUNE_THRESHOLD = 64
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class _Metric(ABC):
+    """Per-thread sharded values keyed by a tuple of label values"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional['Registry'] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict[tuple, Any] = {}
+        self._prune_at = SHARD_PRUNE_THRESHOLD
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _shard(self) -> Dict:
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = self._local.values = {}
+            with self._lock:
+                if len(self._shards) >= self._prune_at:
+                    self._retire_exited()
+                    # With many live threads, wait for as many new ones before scanning again
+                    self._prune_at = max(SHARD_PRUNE_THRESHOLD, 2 * len(self._shards))
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_exited(self):
+        """Fold the shards of exited threads into the running total; callers hold the lock"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for labels, value in shard.items():
+                    self._add(self._retired, labels, value)
+        self._shards = live
+
+    @abstractmethod
+    def _add(self, totals: Dict[tuple, Any], labels: tuple, value):
+        """Add one label tuple's value into `totals`"""
+
+    def collect(self) -> Dict[tuple, Any]:
+        """Current totals per label tuple"""
+        totals = {}
+        with self._lock:
+            self._retire_exited()
+            for labels, value in self._retired.items():
+                self._add(totals, labels, value)
+            for _, shard in self._shards:
+                # dict.copy() is atomic, so the owning thread can keep writing meanwhile
+                for labels, value in shard.copy().items():
+                    self._add(totals, labels, value)
+        return totals
+
+    def merge(self, values: Dict[tuple, Any]):
+        """Add totals recorded elsewhere, such as in a worker process"""
+        with self._lock:
+            for labels, value in values.items():
+                self._add(self._retired, labels, value)
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def render(self) -> Iterator[str]:
+        """Sample lines in the Prometheus text format"""
+
+
+class Counter(_Metric):
+    """Monotonically increasing total"""
+
+    kind = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _add(self, totals: Dict[tuple, Any], labels: tuple, value):
+        totals[labels] = totals.get(labels, 0) + value
+
+    @staticmethod
+    def subtract(after, before):
+        return after - (before or 0)
+
+    def render(self) -> Iterator[str]:
+        for labels, value in sorted(self.collect().items()):
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative `le` buckets, plus their sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Optional['Registry'] = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        # Per-bucket (not yet cumulative) counts, the +Inf bucket, then the sum
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [0] * (len(self.buckets) + 2)
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    @contextmanager
+    def timer(self, *labels: str):
+        """Observe the seconds spent in the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _add(self, totals: Dict[tuple, Any], labels: tuple, value):
+        entry = totals.get(labels)
+        if entry is None:
+            totals[labels] = list(value)
+        else:
+            for i, v in enumerate(value):
+                entry[i] += v
+
+    @staticmethod
+    def subtract(after, before):
+        return [a - b for a, b in zip(after, before or [0] * len(after))]
+
+    def render(self) -> Iterator[str]:
+        names = self.labelnames + ('le',)
+        for labels, entry in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}'
+            label_text = _format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {_format_value(entry[-1])}'
+            yield f'{self.name}_count{label_text} {cumulative}'
+
+
+class Registry:
+    """The metrics exposed by one process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        if hasattr(os, 'register_at_fork'):
+            # A lock held by another thread at fork time would never be released in the child
+            os.register_at_fork(after_in_child=self._reset_locks)
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Duplicate metric {metric.name}')
+        self._metrics[metric.name] = metric
+
+    def _reset_locks(self):
+        for metric in self._metrics.values():
+            metric._reset_lock()
+
+    def snapshot(self) -> Dict[str, Dict[tuple, Any]]:
+        return {name: metric.collect() for name, metric in self._metrics.items()}
+
+    def since(self, before: Dict[str, Dict[tuple, Any]]) -> Dict[str, Dict[tuple, Any]]:
+        """What was recorded after `before` was taken"""
+        recorded = {}
+        for name, values in self.snapshot().items():
+            metric = self._metrics[name]
+            previous = before.get(name, {})
+            changed = {labels: metric.subtract(value, previous.get(labels)) for labels, value in values.items()
+                       if value != previous.get(labels)}
+            if changed:
+                recorded[name] = changed
+        return recorded
+
+    def merge(self, recorded: Dict[str, Dict[tuple, Any]]):
+        for name, values in recorded.items():
+            if name in self._metrics:
+                self._metrics[name].merge(values)
+
+    def render(self) -> str:
+        """All metrics in the text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def run_collecting(func: Callable, *args, **kwargs) -> Tuple[Any, Dict[str, Dict[tuple, Any]]]:
+    """Call `func` and return its result with the metrics it recorded.
+
+    Meant to run in a pool worker process; the parent passes the recorded
+    values to `merge` so they show up in its own scrape.
+    """
+    before = REGISTRY.snapshot()
+    result = func(*args, **kwargs)
+    return result, REGISTRY.since(before)
+
+
+def merge(recorded: Dict[str, Dict[tuple, Any]]):
+    REGISTRY.merge(recorded)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ==================== Metrics ====================
+
+HTTP_REQUESTS = Counter('vidyaguide_http_requests_total', 'HTTP requests by route and status code',
+                        ('method', 'route', 'status'))
+HTTP_REQUEST_SECONDS = Histogram('vidyaguide_http_request_duration_seconds',
+                                 'Time to the last byte of the response, streamed bodies included',
+                                 ('method', 'route', 'status'))
+
+DB_READ_SECONDS = Histogram('vidyaguide_db_json_read_seconds', 'Database._read_json time by file and source (cache or disk)',
+                            ('file', 'source'))
+DB_READ_BYTES = Counter('vidyaguide_db_json_read_bytes_total', 'Bytes parsed from disk by Database._read_json', ('file',))
+DB_WRITE_SECONDS = Histogram('vidyaguide_db_json_write_seconds', 'Database._write_json time, fsync included', ('file',))
+DB_WRITE_BYTES = Counter('vidyaguide_db_json_write_bytes_total', 'Bytes written by Database._write_json', ('file',))
+
+EXTRACTION_SECONDS = Histogram('vidyaguide_resume_extraction_seconds',
+                               'ResumeProcessor.extract_file time (text and resume data) by file type', ('format',))
+EXTRACTION_PAGES = Histogram('vidyaguide_resume_extraction_pages', 'PDF pages read per extraction',
+                             buckets=(1, 2, 3, 5, 10, 20, 50))
+
+INTENT_SECONDS = Histogram('vidyaguide_assistant_response_seconds',
+                           'CareerAIAssistant reply time by intent and source (rules or llm)', ('intent', 'source'))
@@ -0,0 +1,105 @@
+"""Inverted token index for resolving free-text titles and company names.
+
+Rules are ordered (earlier rules win) and each maps one or more keyword
+phrases to a value. A lookup tokenizes the text once and only visits the
+phrases indexed under its tokens, so it stays cheap with thousands of rules.
+"""
+import re
+from collections import defaultdict
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; punctuation such as '-' or '/' separates words"""
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+def normalize(text: str) -> str:
+    return ' '.join(tokenize(text))
+
+
+class PhraseIndex:
+    """Ordered keyword rules behind an inverted index of phrase tokens.
+
+    With `prefix=True` a keyword token also matches longer words starting with
+    it, so "engineer" matches "engineering" and "intern" matches "internship".
+    """
+
+    def __init__(self, rules: Iterable[Tuple] = (), prefix: bool = False):
+        """`rules` holds (keywords, value) or (keywords, value, requires) tuples"""
+        self.prefix = prefix
+        self._phrases: List[Tuple[str, ...]] = []
+        self._phrase_ids = {}
+        self._rules = []
+        self._by_first_token = defaultdict(list)
+        self._by_token = defaultdict(set)
+        self._rules_by_phrase = defaultdict(list)
+        for rule in rules:
+            self.add(*rule)
+
+    def _phrase_id(self, phrase: str) -> int:
+        tokens = tuple(tokenize(phrase))
+        if not tokens:
+            raise ValueError(f'Empty keyword phrase: {phrase!r}')
+        if tokens not in self._phrase_ids:
+            pid = len(self._phrases)
+            self._phrase_ids[tokens] = pid
+            self._phrases.append(tokens)
+            self._by_first_token[tokens[0]].append(pid)
+            for token in tokens:
+                self._by_token[token].add(pid)
+        return self._phrase_ids[tokens]
+
+    def add(self, keywords: Sequence[str], value: Any, requires: Sequence[str] = ()):
+        """Append a rule: `value` when any keyword and every `requires` phrase occur"""
+        keyword_ids = {self._phrase_id(k) for k in keywords}
+        for pid in keyword_ids:
+            self._rules_by_phrase[pid].append(len(self._rules))
+        self._rules.append((value, keyword_ids, {self._phrase_id(r) for r in requires}))
+
+    def _token_matches(self, keyword: str, token: str) -> bool:
+        return token.startswith(keyword) if self.prefix else token == keyword
+
+    def matched_phrases(self, tokens: List[str]) -> set:
+        """Ids of the phrases occurring in a token sequence"""
+        found = set()
+        for i, token in enumerate(tokens):
+            if self.prefix:
+                firsts = (token[:n] for n in range(1, len(token) + 1))
+            else:
+                firsts = (token,)
+            for first in firsts:
+                for pid in self._by_first_token.get(first, ()):
+                    phrase = self._phrases[pid]
+                    if i + len(phrase) <= len(tokens) and all(
+                            self._token_matches(k, t) for k, t in zip(phrase[1:], tokens[i + 1:])):
+                        found.add(pid)
+        return found
+
+    def resolve(self, text: str) -> Optional[Any]:
+        """Value of the first rule matching `text`, or None"""
+        matched = self.matched_phrases(tokenize(text))
+        for rule_id in self._candidate_rules(matched):
+            value, _, requires = self._rules[rule_id]
+            if requires <= matched:
+                return value
+        return None
+
+    def _candidate_rules(self, phrase_ids: set) -> List[int]:
+        """Rules having one of the phrases as a keyword, in priority order"""
+        return sorted({rule_id for pid in phrase_ids for rule_id in self._rules_by_phrase[pid]})
+
+    def resolve_containing(self, text: str) -> Optional[Any]:
+        """Value of the first rule with a keyword phrase containing all of `text`"""
+        tokens = tuple(tokenize(text))
+        if not tokens:
+            return None
+        candidates = set.intersection(*(self._by_token.get(t, set()) for t in tokens))
+        if not candidates:
+            return None
+        containing = {pid for pid in candidates
+                      if any(self._phrases[pid][i:i + len(tokens)] == tokens for i in range(len(self._phrases[pid])))}
+        rule_ids = self._candidate_rules(containing)
+        return self._rules[rule_ids[0]][0] if rule_ids else None
@@ -0,0 +1,266 @@
+"""Opt-in profiling of slow or sampled API requests.
+
+Two modes, both off by default:
+
+- sampling: a random fraction of requests runs under cProfile and is saved
+  as a pstats file;
+- slow requests: a watchdog thread takes stack samples of every request that
+  has been running longer than a threshold, at a fixed interval, and saves
+  them as folded stacks (one "frame;frame;frame count" line per stack, the
+  input format of flamegraph tools).
+
+The hooks are installed in the Flask app (app.py). The ASGI mode serves the
+listing only, since its requests interleave on one event loop thread. The
+listing at /api/profiles needs a JWT plus the PROFILE_ACCESS_TOKEN setting in
+an X-Profile-Token header, and is off while that setting is empty.
+
+Each capture is a profile file plus a JSON record with the route, status,
+a salted hash of the user's email and the timing, in a directory that keeps
+only the newest captures. List them slowest first with
+
+    python profiler.py list [--dir DIR] [--limit N]
+    python profiler.py show CAPTURE_ID [--dir DIR] [--top N]
+"""
+import argparse
+import cProfile
+import hashlib
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+
+
+class Capture:
+    """Profiling state of one in-flight request"""
+
+    __slots__ = ('route', 'method', 'thread_id', 'started', 'started_at', 'profile', 'stacks')
+
+    def __init__(self, route: str, method: str, profile: Optional[cProfile.Profile] = None):
+        self.route = route
+        self.method = method
+        self.thread_id = threading.get_ident()
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.profile = profile
+        self.stacks = Counter()
+
+
+def folded_stack(frame) -> str:
+    """Root-first `file:function` frames joined by semicolons"""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return ';'.join(reversed(frames))
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their captures to `directory`.
+
+    `start` and `finish` run in the request's thread. With both modes off the
+    profiler is disabled and the app does not install its hooks at all.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, sample_rate: float = 0.0, slow_ms: float = 0,
+                 max_captures: int = 200, interval_ms: float = 10, salt: str = ''):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_captures = max_captures
+        self.interval = interval_ms / 1000
+        self.salt = salt
+        self._active: Dict[int, Capture] = {}
+        self._cond = threading.Condition()
+        self._watchdog = None
+        self._rotate_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.slow_ms > 0
+
+    def start(self, route: str, method: str) -> Optional[Capture]:
+        """Begin profiling the current request if it is sampled or may turn out slow"""
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is already running in this thread or process
+                profile = None
+            if profile is not None:
+                return Capture(route, method, profile)
+        if self.slow_ms <= 0:
+            return None
+        capture = Capture(route, method)
+        with self._cond:
+            self._active[capture.thread_id] = capture
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._sample_slow_requests, name='request-profiler', daemon=True)
+                self._watchdog.start()
+            self._cond.notify()
+        return capture
+
+    def finish(self, capture: Capture, status: int, user: Optional[str] = None) -> Optional[Dict]:
+        """Stop profiling and save the capture; returns its record, or None when nothing was kept"""
+        duration_ms = (time.perf_counter() - capture.started) * 1000
+        if capture.profile is not None:
+            capture.profile.disable()
+        else:
+            with self._cond:
+                self._active.pop(capture.thread_id, None)
+            if duration_ms < self.slow_ms or not capture.stacks:
+                return None
+        return self._save(capture, status, user, duration_ms)
+
+    def _sample_slow_requests(self):
+        """Watchdog loop: sample the stacks of requests running longer than `slow_ms`"""
+        while True:
+            with self._cond:
+                while not self._active:
+                    self._cond.wait()
+                threshold = time.perf_counter() - self.slow_ms / 1000
+                slow = [capture for capture in self._active.values() if capture.started <= threshold]
+                # Sample under the lock, so a finished request's stacks are no longer being written
+                if slow:
+                    frames = sys._current_frames()
+                    for capture in slow:
+                        frame = frames.get(capture.thread_id)
+                        if frame is not None:
+                            capture.stacks[folded_stack(frame)] += 1
+                    del frames
+            time.sleep(self.interval)
+
+    def user_hash(self, user: Optional[str]) -> Optional[str]:
+        if not user:
+            return None
+        return hashlib.sha256(f'{self.salt}:{user}'.encode('utf-8')).hexdigest()[:16]
+
+    def _save(self, capture: Capture, status: int, user: Optional[str], duration_ms: float) -> Dict:
+        os.makedirs(self.directory, exist_ok=True)
+        # Ids sort by creation time, which rotation relies on
+        capture_id = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:6]}"
+        if capture.profile is not None:
+            profile_file = f'{capture_id}.prof'
+            capture.profile.dump_stats(os.path.join(self.directory, profile_file))
+            samples = None
+        else:
+            profile_file = f'{capture_id}.folded'
+            with open(os.path.join(self.directory, profile_file), 'w', encoding='utf-8') as f:
+                for stack, count in capture.stacks.most_common():
+                    f.write(f'{stack} {count}\n')
+            samples = sum(capture.stacks.values())
+        record = {
+            'id': capture_id,
+            'mode': 'sampled' if capture.profile is not None else 'slow',
+            'method': capture.method,
+            'route': capture.route,
+            'status': status,
+            'user': self.user_hash(user),
+            'started_at': capture.started_at,
+            'duration_ms': round(duration_ms, 3),
+            'samples': samples,
+            'sample_interval_ms': self.interval * 1000 if samples is not None else None,
+            'profile': profile_file
+        }
+        # The record goes last, so a listed capture always has its profile
+        with open(os.path.join(self.directory, f'{capture_id}.json'), 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2)
+        self._rotate()
+        return record
+
+    def _rotate(self):
+        """Delete the oldest captures beyond `max_captures`"""
+        with self._rotate_lock:
+            records = sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
+            for name in records[:max(0, len(records) - self.max_captures)]:
+                capture_id = name[:-len('.json')]
+                for suffix in ('.json', '.prof', '.folded'):
+                    try:
+                        os.unlink(os.path.join(self.directory, capture_id + suffix))
+                    except FileNotFoundError:
+                        pass
+
+
+def list_captures(directory: str = DEFAULT_DIR, limit: Optional[int] = 20) -> List[Dict]:
+    """Saved capture records, slowest first"""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith('.json')]
+    except FileNotFoundError:
+        return []
+    records = []
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                records.append(json.load(f))
+        except (OSError, ValueError):
+            # Rotated away or still being written
+            continue
+    records.sort(key=lambda r: r.get('duration_ms', 0), reverse=True)
+    return records[:limit] if limit else records
+
+
+def print_capture(directory: str, capture_id: str, top: int = 25):
+    with open(os.path.join(directory, f'{capture_id}.json'), encoding='utf-8') as f:
+        record = json.load(f)
+    print(f"{record['method']} {record['route']} -> {record['status']} in {record['duration_ms']:.1f} ms "
+          f"({record['mode']}, started {record['started_at']}, user {record['user']})")
+    path = os.path.join(directory, record['profile'])
+    if record['mode'] == 'sampled':
+        pstats.Stats(path).sort_stats('cumulative').print_stats(top)
+        return
+
+    # Folded stacks: time per function, inclusive (anywhere on the stack) and self (at the top)
+    inclusive, own, total = Counter(), Counter(), 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            stack, count = line.rsplit(' ', 1)
+            frames = stack.split(';')
+            total += int(count)
+            own[frames[-1]] += int(count)
+            for frame in set(frames):
+                inclusive[frame] += int(count)
+    interval = record.get('sample_interval_ms') or 0
+    print(f"{total} samples every {interval:g} ms after the slow threshold")
+    for title, counts in (('self', own), ('inclusive', inclusive)):
+        print(f"\n{title:>9}  function")
+        for frame, count in counts.most_common(top):
+            print(f"{count / total:>9.1%}  {frame}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List and inspect captured request profiles')
+    parser.add_argument('--dir', default=os.environ.get('PROFILE_DIR') or DEFAULT_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    list_parser = commands.add_parser('list', help='slowest captured requests')
+    list_parser.add_argument('--limit', type=int, default=20)
+    show_parser = commands.add_parser('show', help='top functions of one capture')
+    show_parser.add_argument('capture_id')
+    show_parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args(argv)
+
+    if args.command == 'show':
+        print_capture(args.dir, args.capture_id, args.top)
+        return 0
+    records = list_captures(args.dir, args.limit)
+    if not records:
+        print(f"No captures in {args.dir}")
+        return 0
+    print(f"{'duration ms':>11}  {'status':>6}  {'mode':<7}  {'started':<23}  {'id':<29}  route")
+    for r in records:
+        print(f"{r['duration_ms']:>11.1f}  {r['status']:>6}  {r['mode']:<7}  {r['started_at']:<23}  {r['id']:<29}  "
+              f"{r['method']} {r['route']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import metrics
+from database import atomic_write_json, exclusive_lock, try_exclusive_lock
+from resume_processor import ResumeProcessor
+
+TERMINAL_STATUSES = ('done', 'failed')
+
+# Finished jobs kept in memory for long-polling; older ones are read from disk
+MAX_FINISHED_IN_MEMORY = 1024
+
+
+class QueueFullError(Exception):
+    """Raised when the resume job queue has no free slots"""
+
+
+class ResumeJobQueue:
+    """Run resume extraction for uploads in a bounded process pool.
+
+    Pool workers run `extract(filepath)`, ResumeProcessor.extract_file by
+    default; `on_complete(job, extraction)` then runs in the server process,
+    stores the outcome and returns the upload result. Jobs are persisted as one
+    JSON file each, so jobs that were in flight when a server process died are
+    picked up again by `recover()`.
+
+    Each queue owns its jobs under a random owner token and keeps the token's
+    lock file in owners/ locked for as long as its process lives. A job is
+    orphaned unless its exact owner still holds that lock, so neither a reused
+    pid nor a restarted container's pid 1 can pass for the old owner.
+    """
+
+    def __init__(self, jobs_dir: str, on_complete: Callable[[Dict, Dict], Dict], max_workers: int = 2,
+                 max_pending: int = 32, retention_seconds: int = 24 * 3600,
+                 extract: Callable[[str], Dict] = ResumeProcessor.extract_file):
+        self.jobs_dir = jobs_dir
+        self.on_complete = on_complete
+        self.extract = extract
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+
+        self._executor = None
+        self._pending = 0
+        self._jobs = {}
+        self._finished = deque()
+        self._cond = threading.Condition()
+
+        os.makedirs(os.path.join(jobs_dir, 'owners'), exist_ok=True)
+        self.owner = f'{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex}'
+        self._owner_lock = open(self._owner_lock_path(self.owner), 'a')
+        if not try_exclusive_lock(self._owner_lock):
+            raise RuntimeError(f'Could not lock job owner file for {self.owner}')
+
+    def _owner_lock_path(self, owner: str) -> str:
+        return os.path.join(self.jobs_dir, 'owners', f'{owner}.lock')
+
+    def _owner_alive(self, owner: Optional[str]) -> bool:
+        """Whether the queue that owns a job still holds its owner lock"""
+        if owner == self.owner:
+            return True
+        # Jobs from before owner tokens (and malformed ones) have no lock to hold
+        if not owner or not owner.replace('-', '').isalnum():
+            return False
+        path = self._owner_lock_path(owner)
+        try:
+            with open(path, 'r+') as lock_file:
+                if not try_exclusive_lock(lock_file):
+                    return True
+        except FileNotFoundError:
+            return False
+        # The owner is gone for good, since tokens are never reused
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return False
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def _persist(self, job: Dict):
+        atomic_write_json(self._job_path(job['job_id']), job, indent=None)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def submit(self, user_email: str, filepath: str, filename: str, provided_qualifications: Optional[List[str]] = None,
+               provided_skills: Optional[List[str]] = None, content_hash: Optional[str] = None) -> Dict:
+        """Queue an uploaded file for processing; raises QueueFullError when saturated"""
+        with self._cond:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f'Resume queue is full ({self.max_pending} jobs pending)')
+            self._pending += 1
+
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'user_email': user_email,
+            'filepath': filepath,
+            'filename': filename,
+            'provided_qualifications': provided_qualifications or [],
+            'provided_skills': provided_skills or [],
+            'content_hash': content_hash,
+            'status': 'queued',
+            'owner': self.owner,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        try:
+            self._persist(job)
+            self._dispatch(job)
+        except Exception:
+            with self._cond:
+                self._pending -= 1
+            raise
+        return dict(job)
+
+    def _dispatch(self, job: Dict):
+        with self._cond:
+            self._jobs[job['job_id']] = job
+        future = self._ensure_executor().submit(metrics.run_collecting, self.extract, job['filepath'])
+        future.add_done_callback(lambda f, job_id=job['job_id']: self._finish(job_id, f))
+
+    def _finish(self, job_id: str, future: Future):
+        with self._cond:
+            job = self._jobs[job_id]
+        try:
+            extraction, recorded = future.result()
+            metrics.merge(recorded)
+            result = self.on_complete(job, extraction)
+            job['result'] = {
+                'filename': job['filename'],
+                'extracted_data': result['extracted_data'],
+                'suggestions': result['suggestions']
+            }
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = f'Error processing resume: {str(e)}'
+            job['status'] = 'failed'
+        job['finished_at'] = datetime.now().isoformat()
+
+        try:
+            self._persist(job)
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._finished.append(job_id)
+                while len(self._finished) > MAX_FINISHED_IN_MEMORY:
+                    self._jobs.pop(self._finished.popleft(), None)
+                self._cond.notify_all()
+
+    def get(self, job_id: str, wait: float = 0) -> Optional[Dict]:
+        """Return a job, waiting up to `wait` seconds for it to finish"""
+        deadline = time.monotonic() + wait
+        with self._cond:
+            job = self._jobs.get(job_id)
+            while job is not None and job['status'] not in TERMINAL_STATUSES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if job is not None:
+                return dict(job)
+
+        # Jobs finished by another worker process are only on disk
+        if not all(c.isalnum() for c in job_id):
+            return None
+        try:
+            with open(self._job_path(job_id), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def recover(self) -> int:
+        """Re-dispatch unfinished jobs whose owning process has died"""
+        # Serialise recovery so two workers starting together cannot both
+        # claim the same orphaned job
+        with open(os.path.join(self.jobs_dir, 'recover.lock'), 'a') as lock_file, exclusive_lock(lock_file):
+            return self._recover_orphans()
+
+    def _recover_orphans(self) -> int:
+        recovered = 0
+        now = time.time()
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.jobs_dir, name)
+            try:
+                with open(path, 'r') as f:
+                    job = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if job.get('status') in TERMINAL_STATUSES:
+                if now - os.path.getmtime(path) > self.retention_seconds:
+                    os.remove(path)
+                continue
+            if self._owner_alive(job.get('owner')):
+                continue
+
+            job['owner'] = self.owner
+            if not os.path.exists(job['filepath']):
+                job['status'] = 'failed'
+                job['error'] = 'Uploaded file is missing'
+                self._persist(job)
+                continue
+            self._persist(job)
+            with self._cond:
+                self._pending += 1
+            self._dispatch(job)
+            recovered += 1
+        return recovered
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -1,126 +1,245 @@
-import PyPDF2
-from docx import Document
-from typing import Dict, Optional
+# PyPDF2 and python-docx are imported when the first file is parsed, which
+# keeps them out of app and worker startup
+from typing import Dict, Iterator, List, Optional
 import re
+import time
+
+import metrics
+from skill_taxonomy import SKILL_TAXONOMY
+
+# Section headings recognised by the segmenter, keyed by canonical section name
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'career summary', 'objective', 'career objective', 'profile', 'about me'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'competencies'),
+    'education': ('education', 'academic', 'academics', 'academic background', 'educational qualifications'),
+    'experience': ('experience', 'work experience', 'professional experience', 'work history', 'employment', 'employment history', 'internships'),
+    'projects': ('projects', 'academic projects', 'personal projects'),
+    'certifications': ('certifications', 'certificates', 'awards', 'achievements'),
+}
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# A heading is a known section name at the start of a line, either alone on
+# the line or followed by a colon and inline content ("Skills: Python, SQL").
+# Longer headings come first so "technical skills" wins over "skills".
+_HEADING_RE = re.compile(
+    r'^[ \t•*\-]*(?P<heading>' + '|'.join(
+        re.escape(h).replace(r'\ ', r'\s+') for h in sorted(_HEADING_TO_SECTION, key=len, reverse=True)
+    ) + r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_PHONE_RE = re.compile(r'(?:\+1)?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}')
+_SKILL_SPLIT_RE = re.compile(r'[,•\n|;]')
+_DEGREE_RE = re.compile(
+    r'\b((?:B\.?\s?Tech|M\.?\s?Tech|B\.?\s?Sc|M\.?\s?Sc|B\.?\s?Com|M\.?\s?B\.?\s?A|B\.?\s?C\.?\s?A|M\.?\s?C\.?\s?A'
+    r'|Ph\.?\s?D|B\.?\s?E|B\.?\s?A|B\.?\s?S|M\.?\s?A|M\.?\s?S|Bachelor|Master|Diploma)\b\.?[^,\n]*)',
+    re.IGNORECASE
+)
+_BLANK_LINE_RE = re.compile(r'\n\s*\n')
+
+
+def segment_sections(text: str) -> Dict[str, str]:
+    """Split resume text into sections in one pass over its headings.
+    
+    Returns the text under each recognised heading, keyed by canonical section
+    name; repeated sections are concatenated.
+    """
+    sections = {}
+    matches = list(_HEADING_RE.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        section = _HEADING_TO_SECTION[' '.join(match.group('heading').lower().split())]
+        body = text[match.end():end].strip()
+        sections[section] = sections[section] + '\n\n' + body if section in sections else body
+    return sections
 
 class ResumeProcessor:
     """Process and extract information from resume files"""
     
+    # Bump EXTRACTOR_VERSION when text extraction changes and RULES_VERSION when
+    # extract_resume_data or the suggestion rules change; stored analyses with
+    # an older version are recomputed on the next read
+    EXTRACTOR_VERSION = 1
+    RULES_VERSION = 3
+    
+    # Default extraction budgets; a resume never needs more than this, and the
+    # caps keep a worker from being pinned by a huge upload. Callers pass their
+    # own limits rather than changing these
+    MAX_PDF_PAGES = 20
+    MAX_TEXT_CHARS = 100000
+    
     @staticmethod
-    def extract_text_from_pdf(pdf_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
+    def extract_text(filepath: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+        """Extract text from a resume file based on its extension"""
+        file_ext = filepath.rsplit('.', 1)[-1].lower()
+        if file_ext == 'pdf':
+            return ResumeProcessor.extract_text_from_pdf(filepath, max_pages, max_chars)
+        elif file_ext == 'docx':
+            return ResumeProcessor.extract_text_from_docx(filepath, max_chars)
+        elif file_ext == 'doc':
+            return ResumeProcessor.extract_text_from_doc(filepath, max_chars)
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    
+    @staticmethod
+    def iter_pdf_pages(pdf_path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Iterator[str]:
+        """Yield the text of each PDF page, stopping once the page or character budget is spent"""
+        max_pages = ResumeProcessor.MAX_PDF_PAGES if max_pages is None else max_pages
+        remaining = ResumeProcessor.MAX_TEXT_CHARS if max_chars is None else max_chars
+        import PyPDF2
         try:
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
+                # Pages are parsed one at a time, so stopping early skips the rest
+                for page_number, page in enumerate(pdf_reader.pages):
+                    if page_number >= max_pages or remaining <= 0:
+                        break
+                    page_text = page.extract_text()[:remaining]
+                    remaining -= len(page_text)
+                    yield page_text
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
-        return text
     
     @staticmethod
-    def extract_text_from_docx(docx_path: str) -> str:
+    def iter_docx_paragraphs(docx_path: str, max_chars: Optional[int] = None) -> Iterator[str]:
+        """Yield each paragraph of a Word document followed by a newline, within the character budget"""
+        from docx import Document
+        remaining = ResumeProcessor.MAX_TEXT_CHARS if max_chars is None else max_chars
+        doc = Document(docx_path)
+        for para in doc.paragraphs:
+            if remaining <= 0:
+                break
+            para_text = (para.text + "\n")[:remaining]
+            remaining -= len(para_text)
+            yield para_text
+    
+    @staticmethod
+    def extract_text_from_pdf(pdf_path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+        """Extract text from PDF file"""
+        pages = list(ResumeProcessor.iter_pdf_pages(pdf_path, max_pages, max_chars))
+        metrics.EXTRACTION_PAGES.observe(len(pages))
+        return "".join(pages)
+    
+    @staticmethod
+    def extract_text_from_docx(docx_path: str, max_chars: Optional[int] = None) -> str:
         """Extract text from DOCX file"""
-        text = ""
         try:
-            doc = Document(docx_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+            return "".join(ResumeProcessor.iter_docx_paragraphs(docx_path, max_chars))
         except Exception as e:
             raise Exception(f"Error reading DOCX: {str(e)}")
-        return text
     
     @staticmethod
-    def extract_text_from_doc(doc_path: str) -> str:
+    def extract_text_from_doc(doc_path: str, max_chars: Optional[int] = None) -> str:
         """Extract text from DOC file (legacy Word format)"""
         # For .doc files, we'll try to use python-docx which may have limited support
         # or we can use a library like python-docx or convert to text
         try:
             # python-docx handles both .doc and .docx, though .doc support is limited
-            doc = Document(doc_path)
-            text = ""
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-            return text
+            return "".join(ResumeProcessor.iter_docx_paragraphs(doc_path, max_chars))
         except Exception as e:
             raise Exception(f"Error reading DOC: {str(e)}")
     
     @staticmethod
     def extract_resume_data(resume_text: str) -> Dict:
         """Extract key information from resume text"""
+        sections = segment_sections(resume_text)
         data = {
             'email': ResumeProcessor._extract_email(resume_text),
             'phone': ResumeProcessor._extract_phone(resume_text),
-            'skills': ResumeProcessor._extract_skills(resume_text),
-            'education': ResumeProcessor._extract_education(resume_text),
-            'experience': ResumeProcessor._extract_experience(resume_text),
+            'skills': ResumeProcessor._extract_skills(sections.get('skills', '')),
+            'education': ResumeProcessor._extract_education(sections.get('education', '')),
+            'experience': ResumeProcessor._extract_experience(sections.get('experience', '')),
         }
         return data
     
+    @staticmethod
+    def extract_file(filepath: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Dict:
+        """Run the expensive, user-independent part of the pipeline on a file.
+        
+        The result depends only on the file contents and the extractor/rules
+        versions, so it can be cached by content hash and shared between users.
+        """
+        start = time.perf_counter()
+        resume_text = ResumeProcessor.extract_text(filepath, max_pages, max_chars)
+        extraction = {
+            'resume_text': resume_text,
+            'extracted_data': ResumeProcessor.extract_resume_data(resume_text),
+            'extractor_version': ResumeProcessor.EXTRACTOR_VERSION,
+            'rules_version': ResumeProcessor.RULES_VERSION
+        }
+        metrics.EXTRACTION_SECONDS.observe(time.perf_counter() - start, filepath.rsplit('.', 1)[-1].lower())
+        return extraction
+    
+    @staticmethod
+    def is_current(extraction: Optional[Dict]) -> bool:
+        """Check whether a cached extraction was produced by the current extractor and rules"""
+        return bool(extraction) and extraction.get('extractor_version') == ResumeProcessor.EXTRACTOR_VERSION \
+            and extraction.get('rules_version') == ResumeProcessor.RULES_VERSION
+    
+    @staticmethod
+    def analyze(extraction: Dict, provided_skills: Optional[List[str]] = None) -> Dict:
+        """Merge a user's provided skills into an extraction and compute suggestions"""
+        extracted_data = ResumeProcessor.merge_skills(dict(extraction['extracted_data']), provided_skills)
+        suggestions = ResumeProcessor.get_improvement_suggestions(extracted_data, extraction['resume_text'])
+        return {
+            'extracted_data': extracted_data,
+            'suggestions': suggestions,
+            'analysis': ResumeProcessor.analysis_record(extraction['resume_text'], suggestions)
+        }
+    
+    @staticmethod
+    def process_file(filepath: str, provided_skills: Optional[List[str]] = None) -> Dict:
+        """Run the full pipeline on an uploaded file: text, extracted data and suggestions"""
+        return ResumeProcessor.analyze(ResumeProcessor.extract_file(filepath), provided_skills)
+    
+    @staticmethod
+    def merge_skills(extracted_data: Dict, provided_skills: Optional[List[str]] = None) -> Dict:
+        """Merge user-provided skills into extracted resume data"""
+        extracted_data['skills'] = list({*(extracted_data.get('skills', [])), *(provided_skills or [])})
+        return extracted_data
+    
+    @staticmethod
+    def analysis_record(resume_text: str, suggestions: Dict) -> Dict:
+        """Derived fields stored next to a resume record so reads never re-parse the file"""
+        return {
+            'resume_text': resume_text,
+            'suggestions': suggestions,
+            # Known skills mentioned anywhere in the text, for job-requirement gaps
+            'text_skills': SKILL_TAXONOMY.find(resume_text),
+            'extractor_version': ResumeProcessor.EXTRACTOR_VERSION,
+            'rules_version': ResumeProcessor.RULES_VERSION
+        }
+    
     @staticmethod
     def _extract_email(text: str) -> Optional[str]:
         """Extract email address from text"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        match = re.search(email_pattern, text)
+        match = _EMAIL_RE.search(text)
         return match.group(0) if match else None
     
     @staticmethod
     def _extract_phone(text: str) -> Optional[str]:
         """Extract phone number from text"""
-        phone_pattern = r'(?:\+1)?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'
-        match = re.search(phone_pattern, text)
+        match = _PHONE_RE.search(text)
         return match.group(0) if match else None
     
     @staticmethod
-    def _extract_skills(text: str) -> list:
-        """Extract skills section from resume"""
-        skills = []
-        # Look for skills section
-        skills_patterns = [
-            r'(?:skills|competencies|technical skills)[\s\n:]*([^a-z\n]*?)(?:\n\n|education|experience)',
-        ]
-        
-        for pattern in skills_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                skills_text = match.group(1)
-                # Split by common delimiters
-                skills = [s.strip() for s in re.split(r'[,•\n]', skills_text) if s.strip()]
-                break
-        
+    def _extract_skills(section: str) -> list:
+        """Extract skills from the skills section"""
+        # Split by common delimiters
+        skills = [s.strip() for s in _SKILL_SPLIT_RE.split(section) if s.strip()]
         return skills[:10]  # Return top 10 skills
     
     @staticmethod
-    def _extract_education(text: str) -> list:
-        """Extract education section from resume"""
-        education = []
-        # Look for education section
-        education_pattern = r'(?:education|academic)[\s\n:]*([^a-z\n]*?)(?:\n\n|experience|skills|$)'
-        match = re.search(education_pattern, text, re.IGNORECASE | re.DOTALL)
-        
-        if match:
-            edu_text = match.group(1)
-            # Extract degrees
-            degree_pattern = r'((?:B\.?A\.?|B\.?S\.?|M\.?A\.?|M\.?S\.?|M\.?B\.?A\.?|Ph\.?D\.?)[^,\n]*)'
-            education = re.findall(degree_pattern, edu_text, re.IGNORECASE)
-        
+    def _extract_education(section: str) -> list:
+        """Extract degrees from the education section"""
+        education = [degree.strip() for degree in _DEGREE_RE.findall(section)]
         return education[:5]  # Return top 5 educational qualifications
     
     @staticmethod
-    def _extract_experience(text: str) -> list:
-        """Extract experience/work history from resume"""
-        experience = []
-        # Look for experience section
-        exp_pattern = r'(?:experience|work history|employment)[\s\n:]*([^a-z\n]*?)(?:\n\n|education|skills|$)'
-        match = re.search(exp_pattern, text, re.IGNORECASE | re.DOTALL)
-        
-        if match:
-            exp_text = match.group(1)
-            # Split job descriptions
-            jobs = re.split(r'\n\n+', exp_text)
-            experience = [job.strip() for job in jobs if job.strip()]
-        
+    def _extract_experience(section: str) -> list:
+        """Extract experience/work history entries from the experience section"""
+        # Split job descriptions
+        jobs = _BLANK_LINE_RE.split(section)
+        experience = [job.strip() for job in jobs if job.strip()]
         return experience[:5]  # Return top 5 experiences
     
     @staticmethod
@@ -171,13 +290,13 @@ class ResumeProcessor:
                 f"You have {len(resume_data.get('education', []))} educational qualification(s) listed. Well done!"
             )
         
-        # Keyword suggestions based on skills
+        # Keyword suggestions based on skills mentioned anywhere in the resume
         it_skills = ['Python', 'Java', 'JavaScript', 'SQL', 'AWS', 'Git', 'React', 'Node.js', 
                      'Machine Learning', 'Data Analysis', 'Leadership', 'Communication', 
                      'Project Management', 'Teamwork']
-        resume_skills_str = ' '.join(resume_data.get('skills', []))
+        resume_skills = set(SKILL_TAXONOMY.find_all([resume_text, *resume_data.get('skills', [])]))
         
-        suggested_keywords = [skill for skill in it_skills if skill.lower() not in resume_skills_str.lower()]
+        suggested_keywords = [skill for skill in it_skills if skill not in resume_skills]
         if suggested_keywords:
             suggestions['keywords'] = [
                 f"'{skill}' - Consider adding if you have experience with it (in-demand skill)"
@@ -0,0 +1,189 @@
+"""Per-user conversation context for CareerAIAssistant.
+
+A session is a small JSON-serialisable dict kept per user email, such as the
+resume the user's last message was answered with. `MemorySessionStore` keeps
+sessions in-process behind an LRU size cap and an idle time-to-live;
+`SQLiteSessionStore` keeps them in a SQLite file so every server process
+sees the same context.
+"""
+from abc import ABC, abstractmethod
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from cache import LRUCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_email TEXT PRIMARY KEY,
+    context TEXT NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_accessed ON sessions (accessed);
+"""
+
+
+class SessionStore(ABC):
+    """Interface for per-user context dicts"""
+
+    @abstractmethod
+    def get(self, user: str) -> Dict:
+        """The user's session, or an empty dict when there is none or it expired"""
+
+    @abstractmethod
+    def update(self, user: str, values: Dict) -> Dict:
+        """Merge `values` into the user's session and return the result"""
+
+    @abstractmethod
+    def clear(self, user: str):
+        """Drop the user's session"""
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions in process memory: O(1) lookups, at most `max_users` kept, dropped after `ttl` idle seconds"""
+
+    def __init__(self, max_users: int = 10000, ttl: Optional[float] = 3600):
+        self._sessions = LRUCache(maxsize=max_users, ttl=ttl, sliding=True)
+        self._lock = threading.Lock()
+
+    def get(self, user: str) -> Dict:
+        return dict(self._sessions.get(user) or {})
+
+    def update(self, user: str, values: Dict) -> Dict:
+        with self._lock:
+            session = dict(self._sessions.get(user) or {})
+            session.update(values)
+            self._sessions.set(user, session)
+        return dict(session)
+
+    def clear(self, user: str):
+        self._sessions.pop(user)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict:
+        return self._sessions.stats()
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite file shared by several server processes.
+
+    Lookups go through the primary key. Expired sessions and those beyond
+    `max_users` (least recently used first) are pruned every `PRUNE_EVERY`
+    writes, so the table can briefly exceed the cap between prunes.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, db_file: str, max_users: int = 10000, ttl: Optional[float] = 3600):
+        self.db_file = db_file
+        self.max_users = max_users
+        self.ttl = ttl
+        self._writes = 0
+        self._local = threading.local()
+        self._shared_conn = None
+        self._shared_lock = threading.RLock()
+        if db_file == ':memory:':
+            # A private in-memory database has to be shared by every thread
+            self._shared_conn = self._connect()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        with self._shared_lock:
+            self._connection().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode; transactions are explicit"""
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        if self.db_file != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection for the current thread"""
+        if self._shared_conn is not None:
+            return self._shared_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in one write transaction"""
+        conn = self._connection()
+        lock = self._shared_lock if self._shared_conn is not None else None
+        if lock:
+            lock.acquire()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            if lock:
+                lock.release()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read-only statement without taking the write lock"""
+        conn = self._connection()
+        if self._shared_conn is None:
+            return conn.execute(sql, params).fetchall()
+        with self._shared_lock:
+            return conn.execute(sql, params).fetchall()
+
+    def _expired(self, accessed: float, now: float) -> bool:
+        return bool(self.ttl) and accessed <= now - self.ttl
+
+    def get(self, user: str) -> Dict:
+        now = time.time()
+        rows = self._query('SELECT context, accessed FROM sessions WHERE user_email = ?', (user,))
+        if not rows:
+            return {}
+        context, accessed = rows[0]
+        if self._expired(accessed, now):
+            with self.transaction() as conn:
+                conn.execute('DELETE FROM sessions WHERE user_email = ? AND accessed = ?', (user, accessed))
+            return {}
+        # Refresh the idle timer, at most every tenth of the TTL to spare writes on reads
+        if self.ttl and now - accessed > self.ttl / 10:
+            with self.transaction() as conn:
+                conn.execute('UPDATE sessions SET accessed = MAX(accessed, ?) WHERE user_email = ?', (now, user))
+        return json.loads(context)
+
+    def update(self, user: str, values: Dict) -> Dict:
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute('SELECT context, accessed FROM sessions WHERE user_email = ?', (user,)).fetchone()
+            session = json.loads(row[0]) if row and not self._expired(row[1], now) else {}
+            session.update(values)
+            conn.execute('INSERT INTO sessions (user_email, context, accessed) VALUES (?, ?, ?) '
+                         'ON CONFLICT(user_email) DO UPDATE SET context = excluded.context, accessed = excluded.accessed',
+                         (user, json.dumps(session), now))
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune(conn, now)
+        return session
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Drop expired sessions and the least recently used ones beyond `max_users`"""
+        if self.ttl:
+            conn.execute('DELETE FROM sessions WHERE accessed <= ?', (now - self.ttl,))
+        conn.execute('DELETE FROM sessions WHERE user_email IN '
+                     '(SELECT user_email FROM sessions ORDER BY accessed DESC LIMIT -1 OFFSET ?)', (self.max_users,))
+
+    def clear(self, user: str):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM sessions WHERE user_email = ?', (user,))
+
+    def __len__(self) -> int:
+        return self._query('SELECT COUNT(*) FROM sessions')[0][0]
@@ -0,0 +1,164 @@
+"""Skill taxonomy and multi-pattern skill matching.
+
+Every known skill has a canonical name and a list of aliases. The aliases are
+compiled once into an Aho-Corasick automaton, so finding all skills in a piece
+of text is a single pass over the text regardless of how many skills are known.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Canonical skill name -> aliases (matched case-insensitively, on word boundaries)
+SKILLS = {
+    # Programming languages and web
+    'Python': ['python', 'python3'],
+    'Java': ['java', 'core java', 'j2ee'],
+    'JavaScript': ['javascript', 'java script', 'js', 'es6', 'ecmascript'],
+    'TypeScript': ['typescript'],
+    'C++': ['c++', 'cpp'],
+    'C#': ['c#', 'csharp'],
+    'SQL': ['sql', 'mysql', 'postgresql', 'postgres', 'sqlite', 'pl/sql', 't-sql'],
+    'HTML/CSS': ['html/css', 'html', 'css', 'html5', 'css3'],
+    'React': ['react', 'react.js', 'reactjs'],
+    'Node.js': ['node.js', 'nodejs', 'node js'],
+    'Django': ['django'],
+    'Flask': ['flask'],
+    'Git': ['git', 'github', 'gitlab'],
+    'Programming': ['programming', 'coding', 'software development'],
+    # Engineering
+    'Problem Solving': ['problem solving', 'problem-solving'],
+    'Data Structures': ['data structures', 'data structure'],
+    'Algorithms': ['algorithms', 'algorithm design'],
+    'System Design': ['system design', 'systems design'],
+    'Microservices': ['microservices', 'micro-services', 'microservice architecture'],
+    'Distributed Systems': ['distributed systems', 'distributed computing'],
+    'Large-scale Systems': ['large-scale systems', 'large scale systems'],
+    'Low-latency Systems': ['low-latency systems', 'low latency systems', 'low-latency', 'low latency'],
+    'Scalability': ['scalability', 'scalable systems'],
+    'AWS': ['aws', 'amazon web services', 'ec2'],
+    'Cloud Architecture': ['cloud architecture', 'cloud computing', 'azure', 'gcp', 'google cloud'],
+    'Docker': ['docker'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    # Data
+    'Data Science': ['data science'],
+    'Data Analysis': ['data analysis', 'data analytics', 'data analyst'],
+    'Analytics': ['analytics', 'analytical skills'],
+    'Statistics': ['statistics', 'statistical analysis', 'statistical modeling'],
+    'Machine Learning': ['machine learning', 'ml', 'scikit-learn', 'sklearn'],
+    'Deep Learning': ['deep learning', 'neural networks', 'pytorch', 'keras'],
+    'TensorFlow': ['tensorflow'],
+    'NLP': ['nlp', 'natural language processing'],
+    'Reinforcement Learning': ['reinforcement learning'],
+    'Pandas': ['pandas'],
+    'NumPy': ['numpy'],
+    'Data Visualization': ['data visualization', 'data visualisation', 'tableau', 'power bi', 'matplotlib'],
+    # Design
+    'Design': ['design'],
+    'UI Principles': ['ui principles', 'ui design', 'user interface design'],
+    'Color Theory': ['color theory', 'colour theory'],
+    'Typography': ['typography'],
+    'Figma': ['figma'],
+    'Prototyping': ['prototyping', 'wireframing', 'wireframes'],
+    'User Research': ['user research', 'usability testing', 'ux research'],
+    'Design Systems': ['design systems', 'design system'],
+    'Interaction Design': ['interaction design'],
+    'A/B Testing': ['a/b testing', 'ab testing', 'split testing'],
+    # Business and soft skills
+    'Communication': ['communication', 'communication skills', 'public speaking', 'presentation skills'],
+    'Leadership': ['leadership', 'team lead', 'team leadership'],
+    'Teamwork': ['teamwork', 'team player', 'collaboration'],
+    'Project Management': ['project management', 'agile', 'scrum', 'jira'],
+    'Strategy': ['strategy', 'strategic planning', 'business strategy'],
+    'Creativity': ['creativity', 'creative thinking'],
+    'Empathy': ['empathy'],
+    'Marketing': ['marketing', 'digital marketing', 'seo', 'content marketing'],
+    'Finance Domain Knowledge': ['finance domain knowledge', 'financial markets', 'investment banking', 'fintech'],
+}
+
+
+class SkillTaxonomy:
+    """Canonical skills with aliases, compiled into an Aho-Corasick automaton"""
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        self.skills = list(skills)
+        self._aliases = {}
+        for canonical, aliases in skills.items():
+            for alias in [canonical, *aliases]:
+                self._aliases.setdefault(self._normalize(alias), canonical)
+        self._build(self._aliases)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Lowercase and collapse whitespace so matching is case and spacing insensitive"""
+        return ' '.join(text.lower().split())
+
+    def _build(self, patterns: Dict[str, str]):
+        """Compile the alias trie and its failure links"""
+        # State 0 is the root; each state has a transition table, a failure
+        # link and the (length, canonical) matches ending at it
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, canonical in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), canonical))
+
+        # Breadth-first, so a state's failure target is finished before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Return the canonical skills mentioned in `text`, in order of first mention"""
+        text = self._normalize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, canonical in out[state]:
+                if canonical in found:
+                    continue
+                # Only whole words count: "Java" must not match inside "JavaScript"
+                start, end = i - length + 1, i + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    found[canonical] = start
+        return sorted(found, key=found.get)
+
+    def find_all(self, texts: Iterable[str]) -> List[str]:
+        """Canonical skills across several texts, e.g. a list of skill entries"""
+        # No alias contains '|', so a match can never span two entries
+        return self.find(' | '.join(t for t in texts if t))
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical name for a skill or alias, or None when it is not known"""
+        return self._aliases.get(self._normalize(name))
+
+    def index(self, groups: Dict[str, Iterable[str]]) -> Dict[str, str]:
+        """Map each canonical skill mentioned in a group's entries to the first group naming it"""
+        result = {}
+        for group, entries in groups.items():
+            for skill in self.find_all(entries):
+                result.setdefault(skill, group)
+        return result
+
+
+# Compiled once at import; shared by the resume processor and the assistant
+SKILL_TAXONOMY = SkillTaxonomy(SKILLS)
@@ -0,0 +1,425 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database import Database, resume_record
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    password_hash TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    resume TEXT,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS chats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    resume_context TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chats_user ON chats (user_email, id);
+
+CREATE TABLE IF NOT EXISTS resumes (
+    user_email TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS extractions (
+    content_hash TEXT PRIMARY KEY,
+    record TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS versions (
+    user_email TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    PRIMARY KEY (user_email, resource)
+);
+"""
+
+
+# User fields with a column of their own; any other field is kept in `extra`
+USER_COLUMNS = ('name', 'password_hash', 'created_at', 'resume')
+
+
+class SQLiteDatabase:
+    """SQLite-backed database with the same interface as the JSON `Database`"""
+
+    DB_FILENAME = 'vidyaguide.db'
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        if database_path == ':memory:':
+            # A private in-memory database has to be shared by every thread
+            self.db_file = ':memory:'
+        else:
+            os.makedirs(database_path, exist_ok=True)
+            self.db_file = os.path.join(database_path, self.DB_FILENAME)
+
+        self._local = threading.local()
+        self._shared_conn = None
+        self._shared_lock = threading.RLock()
+        if self.db_file == ':memory:':
+            self._shared_conn = self._connect()
+
+        with self._shared_lock:
+            conn = self._connection()
+            conn.executescript(SCHEMA)
+            self._add_missing_columns(conn)
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection):
+        """Bring databases created by an older schema up to date"""
+        if 'extra' in {row['name'] for row in conn.execute('PRAGMA table_info(users)')}:
+            return
+        try:
+            conn.execute("ALTER TABLE users ADD COLUMN extra TEXT NOT NULL DEFAULT '{}'")
+        except sqlite3.OperationalError:
+            # Another process added it first
+            if 'extra' not in {row['name'] for row in conn.execute('PRAGMA table_info(users)')}:
+                raise
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode; transactions are explicit"""
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.db_file != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection for the current thread"""
+        if self._shared_conn is not None:
+            return self._shared_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in one transaction; nested blocks join the outer one"""
+        conn = self._connection()
+        lock = self._shared_lock if self._shared_conn is not None else None
+        if lock:
+            lock.acquire()
+        try:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            if lock:
+                lock.release()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a read-only statement without taking the write lock"""
+        conn = self._connection()
+        if self._shared_conn is None:
+            return conn.execute(sql, params).fetchall()
+        with self._shared_lock:
+            return conn.execute(sql, params).fetchall()
+
+    def close(self):
+        """Close the connection owned by the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _user_from_row(row: sqlite3.Row) -> Dict:
+        user = json.loads(row['extra'] or '{}')
+        user.update({
+            'email': row['email'],
+            'name': row['name'],
+            'password_hash': row['password_hash'],
+            'created_at': row['created_at'],
+            'resume': row['resume']
+        })
+        return user
+
+    @staticmethod
+    def _message_from_row(row: sqlite3.Row) -> Dict:
+        return {
+            'id': row['id'],
+            'role': row['role'],
+            'content': row['content'],
+            'timestamp': row['timestamp'],
+            'resume_context': row['resume_context']
+        }
+
+    @staticmethod
+    def _bump_versions(conn: sqlite3.Connection, user_emails: Iterable[str], resources: Tuple[str, ...]):
+        """Advance resource versions inside the caller's transaction"""
+        now = time.time()
+        conn.executemany(
+            'INSERT INTO versions (user_email, resource, version, modified) VALUES (?, ?, 1, ?) '
+            'ON CONFLICT (user_email, resource) DO UPDATE SET version = version + 1, modified = excluded.modified',
+            [(user_email, resource, now) for user_email in user_emails for resource in resources]
+        )
+
+    def get_version(self, user_email: str, resource: str) -> Optional[Tuple[str, float]]:
+        """Return (version tag, modified timestamp) of a user's resource, or None if unknown"""
+        rows = self._query('SELECT version, modified FROM versions WHERE user_email = ? AND resource = ?',
+                           (user_email, resource))
+        return (str(rows[0]['version']), rows[0]['modified']) if rows else None
+
+    # User operations
+    def create_user(self, email: str, name: str, password_hash: str) -> bool:
+        """Create a new user"""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO users (email, name, password_hash, created_at, resume) VALUES (?, ?, ?, ?, NULL)',
+                (email, name, password_hash, datetime.now().isoformat())
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._bump_versions(conn, [email], ('profile',))
+            return True
+
+    def get_user(self, email: str) -> Optional[Dict]:
+        """Get user by email"""
+        rows = self._query('SELECT * FROM users WHERE email = ?', (email,))
+        return self._user_from_row(rows[0]) if rows else None
+
+    def update_user(self, email: str, data: Dict) -> bool:
+        """Update user data; fields without a column are merged into `extra`"""
+        if data.get('email', email) != email:
+            raise ValueError("A user's email cannot be changed")
+        columns = [key for key in data if key in USER_COLUMNS]
+        with self.transaction() as conn:
+            row = conn.execute('SELECT extra FROM users WHERE email = ?', (email,)).fetchone()
+            if row is None:
+                return False
+            extra = json.loads(row['extra'] or '{}')
+            extra.update((key, value) for key, value in data.items() if key not in USER_COLUMNS and key != 'email')
+            assignments = ''.join(f'{column} = ?, ' for column in columns)
+            conn.execute(
+                f'UPDATE users SET {assignments}extra = ? WHERE email = ?',
+                [data[column] for column in columns] + [json.dumps(extra), email]
+            )
+            self._bump_versions(conn, [email], ('profile',))
+            return True
+
+    # Chat operations
+    def save_chat_message(self, user_email: str, role: str, content: str, resume_context: Optional[str] = None) -> Dict:
+        """Save a chat message"""
+        message = {
+            'role': role,
+            'content': content,
+            'timestamp': datetime.now().isoformat(),
+            'resume_context': resume_context
+        }
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO chats (user_email, role, content, timestamp, resume_context) VALUES (?, ?, ?, ?, ?)',
+                (user_email, role, content, message['timestamp'], resume_context)
+            )
+            self._bump_versions(conn, [user_email], ('chat',))
+        # AUTOINCREMENT ids are never reused, so they work as stable cursors
+        return dict(message, id=cursor.lastrowid)
+
+    def get_chat_history(self, user_email: str, limit: int = 50) -> List[Dict]:
+        """Get chat history for a user"""
+        return self.get_chat_page(user_email, limit)['messages']
+
+    def get_chat_page(self, user_email: str, limit: int = 50, since: Optional[int] = None, before: Optional[int] = None) -> Dict:
+        """Get a page of chat messages, oldest first, and whether more exist.
+
+        `since` returns the first `limit` messages after that id (incremental
+        sync), `before` the last `limit` messages before it (scrolling back),
+        and neither the latest `limit` messages. A zero limit means no limit.
+        """
+        # Fetch one extra row to learn whether the page is the last one
+        fetch = limit + 1 if limit > 0 else -1
+        if since is not None:
+            rows = self._query('SELECT * FROM chats WHERE user_email = ? AND id > ? ORDER BY id LIMIT ?',
+                               (user_email, since, fetch))
+        else:
+            rows = self._query('SELECT * FROM chats WHERE user_email = ? AND id < ? ORDER BY id DESC LIMIT ?',
+                               (user_email, before if before is not None else 2 ** 63 - 1, fetch))
+        has_more = limit > 0 and len(rows) > limit
+        rows = rows[:limit] if has_more else rows
+        if since is None:
+            rows.reverse()
+        return {'messages': [self._message_from_row(row) for row in rows], 'has_more': has_more}
+
+    def clear_chat_history(self, user_email: str) -> bool:
+        """Delete all chat messages for a user"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM chats WHERE user_email = ?', (user_email,))
+            self._bump_versions(conn, [user_email], ('chat',))
+        return True
+
+    # Resume operations
+    def save_resume(self, user_email: str, filename: str, extracted_data: Dict, provided_qualifications: Optional[list] = None, provided_skills: Optional[list] = None, analysis: Optional[Dict] = None) -> bool:
+        """Save resume information and any provided qualifications/skills.
+
+        `analysis` holds derived fields (extracted text, suggestions and the
+        versions that produced them) stored alongside the record.
+        """
+        return self.save_resumes([{
+            'user_email': user_email,
+            'filename': filename,
+            'extracted_data': extracted_data,
+            'provided_qualifications': provided_qualifications,
+            'provided_skills': provided_skills,
+            'analysis': analysis
+        }]) == 1
+
+    def save_resumes(self, items: List[Dict]) -> int:
+        """Save a batch of resumes in one transaction.
+
+        Each item holds `user_email` plus the keyword arguments of save_resume.
+        """
+        rows = []
+        for item in items:
+            record = resume_record(item['filename'], item['extracted_data'], item.get('provided_qualifications'),
+                                   item.get('provided_skills'), item.get('analysis'))
+            rows.append((item['user_email'], record['filename'], record['uploaded_at'], json.dumps(record)))
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO resumes (user_email, filename, uploaded_at, record) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            # Update user records
+            conn.executemany('UPDATE users SET resume = ? WHERE email = ?', [(row[1], row[0]) for row in rows])
+            self._bump_versions(conn, {row[0] for row in rows}, ('resume', 'profile'))
+        return len(rows)
+
+    def update_resume(self, user_email: str, data: Dict) -> bool:
+        """Update fields of an existing resume record"""
+        with self.transaction() as conn:
+            row = conn.execute('SELECT record FROM resumes WHERE user_email = ?', (user_email,)).fetchone()
+            if row is None:
+                return False
+            record = json.loads(row['record'])
+            record.update(data)
+            conn.execute(
+                'UPDATE resumes SET filename = ?, uploaded_at = ?, record = ? WHERE user_email = ?',
+                (record.get('filename', ''), record.get('uploaded_at', ''), json.dumps(record), user_email)
+            )
+            self._bump_versions(conn, [user_email], ('resume',))
+        return True
+
+    def get_resume(self, user_email: str) -> Optional[Dict]:
+        """Get resume information for a user"""
+        rows = self._query('SELECT record FROM resumes WHERE user_email = ?', (user_email,))
+        return json.loads(rows[0]['record']) if rows else None
+
+    # Extraction cache operations, keyed by the content hash of an uploaded file
+    def get_extraction(self, content_hash: str) -> Optional[Dict]:
+        """Get the cached extraction result for a file's contents"""
+        rows = self._query('SELECT record FROM extractions WHERE content_hash = ?', (content_hash,))
+        return json.loads(rows[0]['record']) if rows else None
+
+    def save_extraction(self, content_hash: str, extraction: Dict) -> bool:
+        """Cache the extraction result for a file's contents"""
+        with self.transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO extractions (content_hash, record) VALUES (?, ?)',
+                         (content_hash, json.dumps(extraction)))
+        return True
+
+
+def migrate_json_to_sqlite(json_path: str, database: SQLiteDatabase) -> Dict:
+    """Import a JSON `Database` directory (users, chat logs, resumes) into SQLite.
+
+    Existing users and resumes are left untouched, and a user's chat history is
+    only imported when the database has no messages for that user yet, so the
+    migration can safely be re-run. The source directory is only read, and the
+    profile, resume and chat versions are carried over so clients' cached
+    copies stay valid.
+    """
+    def load(name: str) -> Dict:
+        path = os.path.join(json_path, name)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    # Chat histories live in per-user logs, or only in chats.json when the JSON
+    # database has never been opened since the logs were introduced
+    source = Database(json_path, read_only=True)
+    users = load('users.json')
+    resumes = load('resumes.json')
+    legacy_chats = load('chats.json')
+    if os.path.isdir(source.chats_dir):
+        chats = {email: source.get_chat_history(email, limit=0) for email in set(users) | set(legacy_chats)}
+    else:
+        chats = legacy_chats
+    counts = {'users': 0, 'messages': 0, 'resumes': 0}
+
+    with database.transaction() as conn:
+        for email, user in users.items():
+            extra = {key: value for key, value in user.items() if key not in USER_COLUMNS + ('email', 'version')}
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO users (email, name, password_hash, created_at, resume, extra) VALUES (?, ?, ?, ?, ?, ?)',
+                (email, user.get('name', ''), user.get('password_hash') or '',
+                 user.get('created_at') or datetime.now().isoformat(), user.get('resume'), json.dumps(extra))
+            )
+            counts['users'] += cursor.rowcount
+
+        for email, messages in chats.items():
+            if not messages or conn.execute('SELECT 1 FROM chats WHERE user_email = ? LIMIT 1', (email,)).fetchone():
+                continue
+            conn.executemany(
+                'INSERT INTO chats (user_email, role, content, timestamp, resume_context) VALUES (?, ?, ?, ?, ?)',
+                [(email, m.get('role', ''), m.get('content', ''), m.get('timestamp') or '', m.get('resume_context'))
+                 for m in messages]
+            )
+            counts['messages'] += len(messages)
+
+        for email, record in resumes.items():
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO resumes (user_email, filename, uploaded_at, record) VALUES (?, ?, ?, ?)',
+                (email, record.get('filename', ''), record.get('uploaded_at') or '', json.dumps(record))
+            )
+            counts['resumes'] += cursor.rowcount
+
+        for email in set(users) | set(resumes) | set(chats):
+            for resource in ('profile', 'resume', 'chat'):
+                version = source.get_version(email, resource)
+                if version is None:
+                    continue
+                tag, modified = version
+                # A JSON chat tag is "base.count"; their sum is the id of the latest message
+                counter = sum(int(part) for part in tag.split('.')) if resource == 'chat' else int(tag)
+                conn.execute('INSERT OR IGNORE INTO versions (user_email, resource, version, modified) VALUES (?, ?, ?, ?)',
+                             (email, resource, counter, modified))
+
+    return counts
+
+
+if __name__ == '__main__':
+    # Usage: python sqlite_database.py <json_dir> [sqlite_dir]
+    if len(sys.argv) < 2:
+        print('Usage: python sqlite_database.py <json_dir> [sqlite_dir]')
+        sys.exit(1)
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else source
+    result = migrate_json_to_sqlite(source, SQLiteDatabase(target))
+    print(f"Imported {result['users']} users, {result['messages']} messages and {result['resumes']} resumes")